@@ -0,0 +1,66 @@
+"""
+Benchmark writing WFS pages to disk in DISK mode.
+
+DISK mode copies each feature's bytes straight from the response body, after
+locating them with _scan_raw_page. This compares that with decoding the page
+and re-encoding each feature with every installed JSON codec, for a page of
+polygons and a page of points.
+
+Usage:
+    python benchmarks/bench_disk_pages.py [--features 10000] [--repeat 10]
+"""
+
+import argparse
+import importlib.util
+import timeit
+
+from kapipy import json_codec
+from kapipy.wfs_utils import _scan_raw_page
+
+from bench_json_codec import make_page
+
+
+def make_point_page(feature_count: int) -> dict:
+    page = make_page(feature_count)
+    for i, feature in enumerate(page["features"]):
+        feature["geometry"] = {"type": "Point", "coordinates": [1570000 + i, 5180000 + i]}
+    return page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--features", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    codecs = [
+        name
+        for name in json_codec.JSON_CODECS
+        if name == "json" or importlib.util.find_spec(name) is not None
+    ]
+    for label, page in (
+        ("polygons", make_page(args.features)),
+        ("points", make_point_page(args.features)),
+    ):
+        body = json_codec._load_codec("json").dumps(page)
+        print(f"Page of {label}: {args.features} features, {len(body) / 1e6:.1f} MB")
+        print(f"{'method':<16}{'ms':>10}{'speedup':>12}")
+
+        def raw_copy():
+            return list(_scan_raw_page(body).iter_feature_bytes())
+
+        raw = min(timeit.repeat(raw_copy, number=1, repeat=args.repeat))
+        print(f"{'raw copy':<16}{raw * 1000:>10.1f}{'':>12}")
+        for name in codecs:
+            codec = json_codec._load_codec(name)
+
+            def reencode():
+                return [codec.dumps(f) for f in codec.loads(body)["features"]]
+
+            elapsed = min(timeit.repeat(reencode, number=1, repeat=args.repeat))
+            print(f"{name + ' re-encode':<16}{elapsed * 1000:>10.1f}{elapsed / raw:>11.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
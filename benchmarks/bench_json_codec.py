@@ -0,0 +1,77 @@
+"""
+Benchmark the JSON codecs on a WFS sized page.
+
+Builds a GeoJSON page of 10,000 polygon features, similar to a default sized
+page from download_wfs_data, and times decoding and encoding it with each
+installed codec.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--features 10000] [--repeat 10]
+"""
+
+import argparse
+import importlib.util
+import timeit
+
+from kapipy import json_codec
+
+
+def make_page(feature_count: int) -> dict:
+    features = []
+    for i in range(feature_count):
+        x, y = 1570000 + i, 5180000 + i
+        ring = [[x, y], [x + 10.5, y], [x + 10.5, y + 10.5], [x, y + 10.5], [x, y]]
+        features.append(
+            {
+                "type": "Feature",
+                "id": f"layer-50772.{i}",
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+                "properties": {
+                    "id": i,
+                    "name": f"Parcel {i}",
+                    "area": 110.25 + i / 7,
+                    "land_district": "Canterbury",
+                    "survey_date": "2019-06-04T00:00:00Z",
+                },
+            }
+        )
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "totalFeatures": feature_count,
+        "numberReturned": feature_count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--features", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    page = make_page(args.features)
+    body = json_codec._load_codec("json").dumps(page)
+    print(f"Page: {args.features} features, {len(body) / 1e6:.1f} MB")
+    print(f"{'codec':<10}{'decode ms':>12}{'encode ms':>12}{'decode speedup':>18}")
+
+    results = {}
+    for name in json_codec.JSON_CODECS:
+        if name != "json" and importlib.util.find_spec(name) is None:
+            continue
+        codec = json_codec._load_codec(name)
+        decode = min(timeit.repeat(lambda: codec.loads(body), number=1, repeat=args.repeat))
+        encode = min(timeit.repeat(lambda: codec.dumps(page), number=1, repeat=args.repeat))
+        results[name] = (decode, encode)
+
+    baseline = results["json"][0]
+    for name in json_codec.JSON_CODECS:
+        if name not in results:
+            print(f"{name:<10}{'not installed':>12}")
+            continue
+        decode, encode = results[name]
+        print(
+            f"{name:<10}{decode * 1000:>12.1f}{encode * 1000:>12.1f}{baseline / decode:>17.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ of a GISK instance.
 from urllib.parse import urljoin
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Optional, Any, Union
 from dacite import from_dict, Config
@@ -16,6 +17,11 @@ from .export import validate_export_params, request_export
 from .vector_item import VectorItem
 from .table_item import TableItem
 from .job_result import JobResult
+from .download_manager import (
+    DownloadManager,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MIN_POLL_INTERVAL,
+)
 from .conversion import (
     get_data_type,
     sdf_to_single_polygon_geojson,
@@ -30,6 +36,8 @@ from .custom_errors import (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_GET_MANY_WORKERS = 8
+
 class ContentManager:
     """
     Manages content for a GISK instance.
@@ -118,7 +126,7 @@ class ContentManager:
 
         else:
             raise UnknownItemTypeError(
-                f"Unsupported item kind: {item_details.get('kind')}"
+                f"Unsupported item kind: {itm_properties_json.get('kind')}"
             )
 
         item.attach_resources(session=self._session, audit=self._audit, content=self)
@@ -126,25 +134,125 @@ class ContentManager:
 
         return item
 
+    def _get_with_services(self, id: str) -> Union[VectorItem, TableItem, None]:
+        """
+        Retrieves an item by ID and fetches its services list, so that the
+        first query against the item does not need another round trip.
+        """
+        item = self.get(id)
+        if item is not None and item.services_list is None:
+            item.services_list = self._session.get(item.services)
+        return item
+
+    def get_many(
+        self,
+        ids: list[str],
+        max_workers: int = DEFAULT_GET_MANY_WORKERS,
+    ) -> tuple[list[Union[VectorItem, TableItem, None]], dict[str, Exception]]:
+        """
+        Retrieves and instantiates many content items by ID, several at a time.
+
+        Each item's search, details and services requests are made in turn,
+        with up to max_workers items being resolved concurrently. An id that
+        fails does not stop the others: its error is collected and its place
+        in the returned list is None.
+
+        Parameters:
+            ids (list[str]): The IDs of the content to retrieve.
+            max_workers (int, optional): The most items to resolve at once. Default is 8.
+
+        Returns:
+            tuple[list, dict]: The items in the same order as ids, with None for
+                any id that was not found or failed, and a dict of the
+                exception raised for each failed id.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        ids = list(ids)
+        items = [None] * len(ids)
+        errors = {}
+        if not ids:
+            return items, errors
+
+        logger.debug(f"ContentManager getting {len(ids)} ids with {max_workers} workers")
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(ids)), thread_name_prefix="kapipy_get"
+        ) as executor:
+            futures = [executor.submit(self._get_with_services, id) for id in ids]
+            for index, (id, future) in enumerate(zip(ids, futures)):
+                try:
+                    items[index] = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not get id {id}: {e}")
+                    errors[id] = e
+
+        return items, errors
+
     def download(
         self,
         jobs: list["JobResults"] = None,
         folder: str = None,
         poll_interval: int = 10,
         force_all: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ) -> list["JobResults"]:
         """
         Downloads all exports from a list of jobs.
-        Polls the jobs until they are finished. As soon as it encounters a finished job,
-        it pauses polling and downloads that file, then resumes polling the remainder.
+        Polls the jobs until they are finished, backing off from every second up to
+        poll_interval for jobs that are still processing. Finished jobs are downloaded
+        in the background, up to max_concurrency at a time, while the rest are polled.
+        A job that fails is left with downloaded set to False, and does not stop the
+        others; the failures are raised together once the rest are done.
 
         Parameters:
             jobs (list[JobResult]): The list of job result objects to download.
             folder (str): The output folder where files will be saved.
-            poll_interval (int, optional): The interval in seconds to poll the jobs. Default is 10.
+            poll_interval (int, optional): The longest interval in seconds between polls of a job. Default is 10.
+            force_all (bool, optional): Download jobs that are already downloaded as well. Default is False.
+            max_concurrency (int, optional): The most downloads to run at once. Default is 4.
 
         Returns:
             list[JobResult]: The list of job result objects after download.
+
+        Raises:
+            DownloadError: If any job could not be polled or downloaded.
+        """
+
+        manager = self.download_manager(
+            jobs=jobs,
+            folder=folder,
+            poll_interval=poll_interval,
+            force_all=force_all,
+            max_concurrency=max_concurrency,
+        )
+        manager.run()
+        return jobs if jobs is not None else self.jobs
+
+    def download_manager(
+        self,
+        jobs: list["JobResults"] = None,
+        folder: str = None,
+        poll_interval: int = 10,
+        force_all: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> DownloadManager:
+        """
+        Returns a DownloadManager for a list of jobs, for example to process each
+        file as soon as it arrives with its as_completed method.
+
+        Parameters:
+            jobs (list[JobResult]): The list of job result objects to download.
+            folder (str): The output folder where files will be saved.
+            poll_interval (int, optional): The longest interval in seconds between polls of a job. Default is 10.
+            force_all (bool, optional): Download jobs that are already downloaded as well. Default is False.
+            max_concurrency (int, optional): The most downloads to run at once. Default is 4.
+
+        Returns:
+            DownloadManager: The manager for the jobs still to download.
         """
 
         if folder is None and self.download_folder is None:
@@ -160,24 +268,14 @@ class ContentManager:
             pending_jobs = list(jobs)
         else:
             pending_jobs = [job for job in jobs if job.downloaded == False]
-        logger.info(f"Number of jobs to download: {len(pending_jobs)}")
 
-        while pending_jobs:
-            logger.info("Polling export jobs...")
-
-            for job in pending_jobs[:]:  # iterate over a copy
-                job_status = job.status
-
-                if job_status.state != "processing":
-                    job.download(folder=folder)
-                    pending_jobs.remove(job)
-                else:
-                    logger.info(job)
-            logger.info(f"{len(pending_jobs)} jobs remaining...")
-            time.sleep(poll_interval)
-
-        logger.info("All jobs completed and downloaded.")
-        return jobs
+        return DownloadManager(
+            pending_jobs,
+            folder,
+            max_concurrency=max_concurrency,
+            min_poll_interval=min(DEFAULT_MIN_POLL_INTERVAL, poll_interval),
+            max_poll_interval=poll_interval,
+        )
 
     @property
     def crop_layers(self) -> "CropLayersManager":
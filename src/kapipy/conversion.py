@@ -1,13 +1,17 @@
 import pandas as pd
+import numpy as np
+import shapely
 import json
 import re
+from itertools import chain
 from dateutil.parser import parse as date_parse
 from dataclasses import asdict
-from shapely.geometry import shape, box, mapping
+from shapely.geometry import box, mapping
 from shapely.ops import unary_union
 from typing import Any, TYPE_CHECKING, Union
 import logging
 from .gis import has_geopandas, has_arcgis, has_arcpy
+from . import json_codec
 
 if TYPE_CHECKING:
     if has_geopandas:
@@ -29,18 +33,28 @@ VALID_SPATIAL_RELATIONSHIPS = (
 )
 
 
+# Esri field types for each kind of value in FIELD_TYPE_KINDS
+_ESRI_FIELD_TYPES = {
+    "integer": "esriFieldTypeInteger",
+    "bigint": "esriFieldTypeDouble",  # Integer is 32 bit
+    "float32": "esriFieldTypeSingle",
+    "float64": "esriFieldTypeDouble",
+    "string": "esriFieldTypeString",
+    "boolean": "esriFieldTypeSmallInteger",
+    "date": "esriFieldTypeDate",
+}
+
+
 def map_field_type(field_type: str) -> str:
-    mapping = {
-        "integer": "esriFieldTypeInteger",
-        "float": "esriFieldTypeDouble",
-        "numeric": "esriFieldTypeDouble",
-        "string": "esriFieldTypeString",
-        "date": "esriFieldTypeDate",
-        "boolean": "esriFieldTypeSmallInteger",  # or esriFieldTypeInteger if needed
+    special = {
         "objectid": "esriFieldTypeOID",
         "guid": "esriFieldTypeGUID",
     }
-    return mapping.get(field_type.lower(), "esriFieldTypeString")  # default fallback
+    field_type = field_type.lower()
+    if field_type in special:
+        return special[field_type]
+    kind = field_type_kind(field_type)
+    return _ESRI_FIELD_TYPES.get(kind, "esriFieldTypeString")  # default fallback
 
 
 def map_geometry_type(geom_type: str) -> str:
@@ -77,6 +91,57 @@ def is_valid_date(val):
         return False
 
 
+def dates_are_valid(values: list) -> bool:
+    """
+    Checks if every value in a column is a valid date, as is_valid_date would.
+
+    The distinct string values are parsed in one vectorized pd.to_datetime pass
+    using the ISO 8601 format returned by the WFS service. Only values that
+    fail that pass are retried, one at a time, with is_valid_date, which stops
+    at the first value that cannot be parsed.
+
+    Parameters:
+        values (list): The column values to check.
+
+    Returns:
+        bool: True if all values are None, epoch numbers or parseable dates.
+    """
+    strings = [
+        v
+        for v in pd.unique(pd.Series(values, dtype=object))
+        if v is not None and not isinstance(v, (int, float))
+    ]
+    if not strings:
+        return True
+    parsed = pd.to_datetime(
+        pd.Series([str(v) for v in strings], dtype=object),
+        errors="coerce",
+        format="ISO8601",
+        utc=True,
+    )
+    unparsed = [v for v, ok in zip(strings, parsed.notna()) if not ok]
+    return all(is_valid_date(v) for v in unparsed)
+
+
+def downgrade_invalid_date_fields(fields: list["FieldDef"], features: list[dict]) -> None:
+    """
+    Sets the type of any date, datetime or timestamp field to string if its values cannot all be parsed.
+
+    Parameters:
+        fields (list[FieldDef]): The field definitions. Their types are changed in place.
+        features (list[dict]): The GeoJSON features holding the values.
+    """
+    for field in fields:
+        if field_type_kind(field.type) == "date":
+            values = [feature.get("properties", {}).get(field.name) for feature in features]
+            if not dates_are_valid(values):
+                # Set this field to string
+                logger.debug(
+                    f"Data for date field '{field.name}' was unable to be parsed. Overriding field type to string."
+                )
+                field.type = "string"
+
+
 def geojson_to_featureset(
     geojson: dict | list, geometry_type: str, fields: list["FieldDef"], out_sr: int = 4326
 ) -> "arcgis.features.FeatureSet":
@@ -107,20 +172,7 @@ def geojson_to_featureset(
     else:
         raise ValueError("geojson must be a FeatureCollection or list of features.")
 
-    # validate that any date fields can be parsed
-    # If any value is not parseable, set the field type to string
-    for field in fields:        
-        if field.type.lower() == "date":
-            for feature in features:
-                val = feature.get("properties", {}).get(field.name)
-                if not is_valid_date(val):
-                    # Set this field to string
-                    logger.debug(
-                        f"Data for date field '{field.name}' was unable to be parsed. Overriding field type to string."
-                    )
-                    field.type = "string"
-
-                    break  # No need to check further for this field
+    downgrade_invalid_date_fields(fields, features)
 
     arcgis_fields = [
         {**asdict(f), "type": map_field_type(f.type)}
@@ -153,10 +205,217 @@ def geojson_to_featureset(
     )
 
 
+# The kind of value held by each Koordinates field type. This is the one
+# mapping from field types to column types: the pandas dtypes below and the
+# column types of the file sinks in wfs_sinks are all derived from it.
+FIELD_TYPE_KINDS = {
+    "int": "integer",
+    "integer": "integer",
+    "int32": "integer",
+    "smallint": "integer",
+    "bigint": "bigint",
+    "int64": "bigint",
+    "real": "float32",
+    "float32": "float32",
+    "float": "float64",
+    "double": "float64",
+    "numeric": "float64",
+    "float64": "float64",
+    "str": "string",
+    "string": "string",
+    "text": "string",
+    "guid": "string",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "date": "date",
+    "datetime": "date",
+    "timestamp": "date",
+}
+FIELD_KINDS = ("integer", "bigint", "float32", "float64", "string", "boolean", "date")
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.1
+CATEGORY_MIN_ROWS = 1000
+
+
+def _field_name_type(field: Any) -> tuple[str, str]:
+    """Return the name and lower case type of a FieldDef or field dict."""
+    if isinstance(field, dict):
+        return field.get("name"), (field.get("type") or "").lower()
+    return field.name, (field.type or "").lower()
+
+
+def field_type_kind(field_type: str | None, values: list | None = None) -> str | None:
+    """
+    Return the kind of value held by a field type, one of FIELD_KINDS.
+
+    If the field type is not given, it is inferred from the first non-null
+    value in values. Returns None for a field type that is not known.
+    """
+    if field_type is None:
+        sample = next((v for v in values or [] if v is not None), None)
+        if isinstance(sample, bool):
+            return "boolean"
+        if isinstance(sample, int):
+            return "bigint"
+        if isinstance(sample, float):
+            return "float64"
+        return "string"
+    return FIELD_TYPE_KINDS.get(field_type.lower())
+
+
+def _string_dtype() -> str:
+    from .gis import has_pyarrow
+
+    return "string[pyarrow]" if has_pyarrow else "string"
+
+
+def _typed_column(
+    series: pd.Series, dtype: str, categories: bool = True
+) -> pd.Series | None:
+    """
+    Return the series converted to the compact pandas dtype for a field type.
+
+    Returns None if the field type is not known, or if a date column holds
+    values that cannot be parsed, so that the column is left as it is. With
+    categories=False, text is never converted to a categorical.
+    """
+    kind = FIELD_TYPE_KINDS.get(dtype)
+    if kind in ("integer", "bigint"):
+        numbers = pd.to_numeric(series, errors="coerce")
+        if kind == "integer":
+            limits = np.iinfo(np.int32)
+            if numbers.min() >= limits.min and numbers.max() <= limits.max:
+                return numbers.astype("Int32")
+        return numbers.astype("Int64")
+    if kind == "float32":
+        return pd.to_numeric(series, errors="coerce").astype("float32")
+    if kind == "float64":
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+    if kind == "boolean":
+        return series.astype("boolean")
+    if kind == "string":
+        non_null = series.count()
+        if (
+            categories
+            and non_null >= CATEGORY_MIN_ROWS
+            and series.nunique() <= non_null * CATEGORY_MAX_UNIQUE_RATIO
+        ):
+            return series.astype("category")
+        return series.astype(_string_dtype())
+    if kind == "date":
+        dates = pd.to_datetime(series, errors="coerce", utc=True, format="ISO8601")
+        if dates.isna().sum() > series.isna().sum():
+            logger.warning(
+                f"Column '{series.name}' has values that are not valid dates; leaving it unconverted."
+            )
+            return None
+        return dates
+    return None
+
+
+def _apply_field_types(df: pd.DataFrame, fields: list) -> None:
+    """
+    Convert the DataFrame columns in place to the types declared in fields.
+
+    Each column is converted in one vectorized pass: integers to nullable
+    Int32 (or Int64 when out of range), floats to float32 or float64,
+    booleans to nullable boolean, dates to timezone aware datetime64, and
+    text to pyarrow backed strings, or to categoricals when most values
+    repeat.
+
+    Raises:
+        ValueError: If a column cannot be converted to its declared type.
+    """
+    for field in fields:
+        col, dtype = _field_name_type(field)
+        if dtype == "geometry" or col not in df.columns:
+            continue
+        try:
+            converted = _typed_column(df[col], dtype)
+        except Exception as e:
+            raise ValueError(f"Failed to convert column '{col}' to {dtype}: {e}")
+        if converted is None:
+            if FIELD_TYPE_KINDS.get(dtype) != "date":
+                logger.warning(
+                    f"Unsupported data type '{dtype}' for column '{col}'. Skipping conversion."
+                )
+            continue
+        df[col] = converted
+
+
+# Nesting depth of the "coordinates" member for each GeoJSON geometry type
+_GEOJSON_COORDINATE_DEPTH = {
+    "Point": (shapely.GeometryType.POINT, 0),
+    "LineString": (shapely.GeometryType.LINESTRING, 1),
+    "MultiPoint": (shapely.GeometryType.MULTIPOINT, 1),
+    "Polygon": (shapely.GeometryType.POLYGON, 2),
+    "MultiLineString": (shapely.GeometryType.MULTILINESTRING, 2),
+    "MultiPolygon": (shapely.GeometryType.MULTIPOLYGON, 3),
+}
+
+
+def _ragged_geometries(geometry_type: str, geometries: list[dict]) -> np.ndarray:
+    """
+    Build geometries of a single GeoJSON type with shapely.from_ragged_array.
+
+    The nested coordinate lists are flattened one level at a time into a
+    single coordinate buffer plus the offset arrays for each level.
+    """
+    shapely_type, depth = _GEOJSON_COORDINATE_DEPTH[geometry_type]
+    parts = [g["coordinates"] for g in geometries]
+    offsets = []
+    for _ in range(depth):
+        lengths = np.fromiter((len(p) for p in parts), dtype=np.int64, count=len(parts))
+        offsets.append(np.concatenate(([0], np.cumsum(lengths))))
+        parts = list(chain.from_iterable(parts))
+    coords = np.array(parts, dtype=float)
+    if coords.ndim != 2:
+        raise ValueError("Coordinates have mixed dimensions.")
+    return shapely.from_ragged_array(
+        shapely_type, coords, tuple(reversed(offsets)) or None
+    )
+
+
+def geojson_geometries_to_array(geometries: list[dict | None]) -> np.ndarray:
+    """
+    Convert GeoJSON geometry dicts to an array of shapely geometries.
+
+    Geometries of a single type, the usual case for a WFS layer, are built
+    from flat coordinate buffers with shapely.from_ragged_array. Anything
+    else, such as mixed types, mixed dimensions or geometry collections, is
+    parsed by GEOS with shapely.from_geojson. Missing geometries become None.
+
+    Parameters:
+        geometries (list[dict | None]): GeoJSON geometry dicts.
+
+    Returns:
+        np.ndarray: An object array of shapely geometries.
+    """
+    result = np.full(len(geometries), None, dtype=object)
+    present = [i for i, g in enumerate(geometries) if g]
+    if not present:
+        return result
+    values = [geometries[i] for i in present]
+
+    geometry_types = {g.get("type") for g in values}
+    if len(geometry_types) == 1 and next(iter(geometry_types)) in _GEOJSON_COORDINATE_DEPTH:
+        try:
+            result[present] = _ragged_geometries(geometry_types.pop(), values)
+            return result
+        except (ValueError, TypeError, IndexError, KeyError):
+            logger.debug("Falling back to shapely.from_geojson for geometry conversion.")
+
+    dumps = json_codec.get_json_codec().dumps
+    result[present] = shapely.from_geojson(
+        np.array([dumps(g) for g in values], dtype=object)
+    )
+    return result
+
+
 def geojson_to_gdf(
     geojson: dict[str, Any] | list[dict[str, Any]],
     out_sr: int,
-    fields: list[dict[str, str]] | None = None,
+    fields: list["FieldDef"] | list[dict[str, str]] | None = None,
 ) -> "gpd.GeoDataFrame":
     """
     Convert GeoJSON features to a GeoDataFrame with enforced data types.
@@ -164,7 +423,7 @@ def geojson_to_gdf(
     Parameters:
         geojson (dict or list): A GeoJSON FeatureCollection (dict) or a list of GeoJSON feature dicts.
         out_sr (int): The EPSG code for the coordinate reference system (e.g., 4326).
-        fields (list[dict], optional): A list of dictionaries specifying field names and their desired data types.
+        fields (list[FieldDef] or list[dict], optional): The field names and their data types, used to set the column dtypes.
 
     Returns:
         gpd.GeoDataFrame: A GeoDataFrame with the specified CRS and column types.
@@ -195,49 +454,17 @@ def geojson_to_gdf(
             "Invalid geojson input. Expected a FeatureCollection or list of features."
         )
 
-    # Flatten properties and extract geometry
-    records = []
-    geometries = []
-    for feature in features:
-        props = feature.get("properties", {})
-        geom = feature.get("geometry")
-        records.append(props)
-        geometries.append(shape(geom) if geom else None)
-
-    # Create GeoDataFrame
+    # Build the attribute columns and the geometry array in bulk
     crs = f"EPSG:{out_sr}"
-    df = pd.DataFrame(records)
+    df = pd.DataFrame([feature.get("properties") or {} for feature in features])
+    geometries = geojson_geometries_to_array(
+        [feature.get("geometry") for feature in features]
+    )
     gdf = gpd.GeoDataFrame(df, geometry=geometries, crs=crs)
 
     # Apply data type mapping
-    if fields and False:
-        for field in fields:
-            col = field.get("name")
-            dtype = field.get("type").lower()
-            if dtype == "geometry":
-                continue  # Skip geometry fields as they are already handled
-            if col in gdf.columns:
-                try:
-                    if dtype in ["int", "bigint", "integer", "int32", "int64"]:
-                        gdf[col] = (
-                            pd.to_numeric(gdf[col], errors="coerce")
-                            .fillna(0)
-                            .astype("int32")
-                        )
-                    elif dtype in ["float", "double"]:
-                        gdf[col] = pd.to_numeric(gdf[col], errors="coerce")
-                    elif dtype in ["str", "string"]:
-                        gdf[col] = gdf[col].astype(str)
-                    elif dtype == "bool":
-                        gdf[col] = gdf[col].astype(bool)
-                    else:
-                        logger.warning(
-                            f"Unsupported data type '{dtype}' for column '{col}'. Skipping conversion."
-                        )
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to convert column '{col}' to {dtype}: {e}"
-                    )
+    if fields:
+        _apply_field_types(gdf, fields)
     return gdf
 
 
@@ -303,14 +530,14 @@ def geojson_to_sdf(
 
 def json_to_df(
     json: dict[str, Any] | list[dict[str, Any]],
-    fields: list[dict[str, str]] | None = None,
+    fields: list["FieldDef"] | list[dict[str, str]] | None = None,
 ) -> pd.DataFrame:
     """
     Convert JSON features to a DataFrame with enforced data types.
 
     Paramters:
         json (dict or list): A JSON FeatureCollection (dict) or a list of JSON feature dicts.
-        fields (list[dict], optional): A list of dictionaries specifying field names and their desired data types.
+        fields (list[FieldDef] or list[dict], optional): The field names and their data types, used to set the column dtypes.
 
     Returns:
         pd.DataFrame: A DataFrame with the specified column types.
@@ -339,32 +566,8 @@ def json_to_df(
     df = pd.DataFrame(records)
 
     # Apply data type mapping
-    if fields and False:
-        for field in fields:
-            col = field.get("name")
-            dtype = field.get("type").lower()
-            if col in df.columns:
-                try:
-                    if dtype in ["int", "bigint", "integer", "int32", "int64"]:
-                        df[col] = (
-                            pd.to_numeric(df[col], errors="coerce")
-                            .fillna(0)
-                            .astype("int32")
-                        )
-                    elif dtype in ["float", "double"]:
-                        df[col] = pd.to_numeric(df[col], errors="coerce")
-                    elif dtype in ["str", "string"]:
-                        df[col] = df[col].astype(str)
-                    elif dtype == "bool":
-                        df[col] = df[col].astype(bool)
-                    else:
-                        logger.warning(
-                            f"Unsupported data type '{dtype}' for column '{col}'. Skipping conversion."
-                        )
-                except Exception as e:
-                    raise ValueError(
-                        f"Failed to convert column '{col}' to {dtype}: {e}"
-                    )
+    if fields:
+        _apply_field_types(df, fields)
 
     return df
 
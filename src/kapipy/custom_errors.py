@@ -21,6 +21,20 @@ class ServerError(HTTPError):
 class ExportError(Exception):
     """Custom exception for errors encountered during export operations."""
 
+class DownloadError(Exception):
+    """
+    Exception raised when one or more export jobs could not be downloaded.
+
+    Attributes:
+        errors (dict[int, Exception]): The error for each job that failed, keyed by job id.
+    """
+    def __init__(self, errors: dict):
+        super().__init__(
+            f"{len(errors)} export job(s) could not be downloaded: "
+            + "; ".join(f"job {job_id}: {error}" for job_id, error in errors.items())
+        )
+        self.errors = errors
+
 class UnknownItemTypeError(Exception):
     """
     Exception raised when an unknown item type is encountered.
@@ -1,10 +1,12 @@
 import logging
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Iterator, Union
 from abc import ABC, abstractmethod
 import re
 from .export import validate_export_params, request_export
 from .job_result import JobResult
+from .wfs_utils import SINK_CACHE_MODES, _reject_download_params, iter_wfs_pages
+from .wfs_response import RESPONSE_OPTIONS
 from .conversion import (
     get_data_type,
     sdf_to_single_polygon_geojson,
@@ -511,6 +513,119 @@ class BaseItem(ABC):
 
         return self._supports_changesets
 
+    async def _load_services_async(self) -> None:
+        """
+        Fetches the services list without blocking the event loop, so that
+        supports_changesets and _wfs_url can be resolved from the cache.
+        """
+        if self.services_list is None:
+            self.services_list = await self._session.get_async(self.services)
+
+    def _keyset_primary_key(self, kwargs: dict) -> None:
+        """
+        Fills in the primary_key download parameter from the item's primary key
+        fields when keyset pagination is requested and no primary_key was given.
+
+        Parameters:
+            kwargs (dict): The query keyword arguments, updated in place.
+
+        Raises:
+            ValueError: If the item does not have exactly one primary key field.
+        """
+        if kwargs.get("pagination") != "keyset" or kwargs.get("primary_key"):
+            return
+
+        primary_key_fields = self.data.primary_key_fields or []
+        if len(primary_key_fields) != 1:
+            raise ValueError(
+                f"Keyset pagination requires an item with a single primary key field. "
+                f"Item with id: {self.id} has: {primary_key_fields}"
+            )
+        kwargs["primary_key"] = primary_key_fields[0]
+
+    def _sink_fields(self, kwargs: dict) -> None:
+        """
+        Passes the item's fields to the sinks that need them to set up the output schema.
+
+        Parameters:
+            kwargs (dict): The query keyword arguments, updated in place.
+        """
+        if kwargs.get("cache_mode") in SINK_CACHE_MODES and kwargs.get("fields") is None:
+            kwargs["fields"] = self.data.fields
+
+    def _response_options(self, kwargs: dict) -> dict:
+        """
+        Takes the options that configure the returned WFSResponse out of the query arguments.
+
+        Parameters:
+            kwargs (dict): The query keyword arguments, updated in place.
+
+        Returns:
+            dict: The WFSResponse options, such as dtype_backend and keep.
+        """
+        return {name: kwargs.pop(name) for name in RESPONSE_OPTIONS if name in kwargs}
+
+    def iter_pages(self, **kwargs: Any) -> Iterator[list[dict]]:
+        """
+        Executes a WFS query on the item and yields the features of each page as it arrives.
+
+        Accepts the same parameters as the item's query method. Unlike query, nothing
+        is cached: each page is released once the consumer moves on to the next one,
+        so a layer of any size can be processed in constant memory.
+
+        The request is recorded with the audit manager once the last page has been consumed.
+
+        Parameters:
+            **kwargs: The query parameters, as for query, apart from the options
+                that only apply to a download: cache_mode, temp_file_path, resume,
+                fields and auto_memory_limit.
+
+        Yields:
+            list[dict]: The GeoJSON features of one WFS page.
+
+        Raises:
+            TypeError: If a download only option is given.
+        """
+
+        logger.debug(f"Streaming WFS query for item with id: {self.id}")
+
+        _reject_download_params("iter_pages", kwargs)
+        response_options = [name for name in RESPONSE_OPTIONS if name in kwargs]
+        if response_options:
+            raise TypeError(
+                f"iter_pages() does not accept the response options: {', '.join(response_options)}"
+            )
+        query = self._prepare_query(**kwargs)
+        query_details = yield from iter_wfs_pages(**query["download_params"])
+
+        self._audit.add_request_record(
+            item_id=self.id,
+            item_kind=self.kind,
+            item_type=self.type,
+            request_type=query["request_type"],
+            request_url=query_details.get("request_url", ""),
+            request_method=query_details.get("request_method", ""),
+            request_time=query_details.get("request_time", ""),
+            request_headers=query_details.get("request_headers", ""),
+            request_params=query_details.get("request_params", ""),
+            total_features=query_details.get("response", {}).get("totalFeatures", None),
+        )
+
+    def iter_features(self, **kwargs: Any) -> Iterator[dict]:
+        """
+        Executes a WFS query on the item and yields one GeoJSON feature at a time.
+
+        See iter_pages for details.
+
+        Parameters:
+            **kwargs: The query parameters, as for query.
+
+        Yields:
+            dict: A GeoJSON feature.
+        """
+        for features in self.iter_pages(**kwargs):
+            yield from features
+
     @property
     def _wfs_url(self) -> str:
         """
@@ -623,6 +738,7 @@ class BaseItem(ABC):
             export_format,
             crs=crs,
             filter_geometry=filter_geometry,
+            client=self._session.client,
             **kwargs,
         )
 
@@ -685,6 +801,7 @@ class BaseItem(ABC):
             export_format,
             crs,
             filter_geometry,
+            client=self._session.client,
             **kwargs,
         )
 
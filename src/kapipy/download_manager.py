@@ -0,0 +1,199 @@
+"""
+DownloadManager polls a set of export jobs and downloads each one as soon
+as it is ready, several at a time.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator
+
+from .custom_errors import DownloadError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MIN_POLL_INTERVAL = 1
+DEFAULT_MAX_POLL_INTERVAL = 10
+DEFAULT_BACKOFF = 2
+DEFAULT_MAX_POLL_ERRORS = 3
+
+
+class DownloadManager:
+    """
+    Downloads a list of export jobs as they finish.
+
+    Each job is polled on its own schedule. A job is first polled straight
+    away, and while it is still processing the wait before its next poll
+    grows from min_poll_interval by the backoff factor, up to
+    max_poll_interval. The manager only sleeps until the next job is due,
+    or until a download finishes. Finished jobs are downloaded on a pool of
+    max_concurrency threads while the remaining jobs keep being polled.
+
+    A failed status poll is retried on the same backoff schedule, and a job
+    is only given up on after max_poll_errors polls in a row have failed. A
+    job that fails does not stop the others. Its error is logged and kept in
+    errors, keyed by job id, and the job is left with downloaded set to False.
+    run raises a DownloadError for them once every other job is done.
+
+    Attributes:
+        jobs (list[JobResult]): The jobs to download.
+        folder (str): The folder the files are saved to.
+        max_concurrency (int): The most downloads to run at once.
+        min_poll_interval (float): The first wait in seconds between polls of a job.
+        max_poll_interval (float): The longest wait in seconds between polls of a job.
+        backoff (float): The factor the wait grows by after each poll.
+        max_poll_errors (int): The failed polls in a row after which a job is given up on.
+        errors (dict[int, Exception]): The error for each job that failed.
+    """
+
+    def __init__(
+        self,
+        jobs: list["JobResult"],
+        folder: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_poll_interval: float = DEFAULT_MIN_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        max_poll_errors: int = DEFAULT_MAX_POLL_ERRORS,
+    ) -> None:
+        """
+        Initializes the DownloadManager.
+
+        Parameters:
+            jobs (list[JobResult]): The jobs to download.
+            folder (str): The folder where the files will be saved.
+            max_concurrency (int, optional): The most downloads to run at once. Default is 4.
+            min_poll_interval (float, optional): The first wait in seconds between polls
+                of a job. Default is 1.
+            max_poll_interval (float, optional): The longest wait in seconds between polls
+                of a job. Default is 10.
+            backoff (float, optional): The factor the wait grows by after each poll
+                that finds the job still processing. Default is 2.
+            max_poll_errors (int, optional): The failed polls in a row after which a
+                job is given up on. Default is 3.
+
+        Raises:
+            ValueError: If max_concurrency or max_poll_errors is less than 1, the poll
+                intervals are not positive and in order, or backoff is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if max_poll_errors < 1:
+            raise ValueError("max_poll_errors must be at least 1.")
+        if min_poll_interval <= 0 or max_poll_interval < min_poll_interval:
+            raise ValueError(
+                "min_poll_interval must be positive and no more than max_poll_interval."
+            )
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1.")
+
+        self.jobs = list(jobs)
+        self.folder = folder
+        self.max_concurrency = max_concurrency
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.max_poll_errors = max_poll_errors
+        self.errors = {}
+
+    def as_completed(self) -> Iterator["JobResult"]:
+        """
+        Yields each job as soon as its download has finished.
+
+        Jobs are yielded in the order their downloads finish, not the order
+        they were given in. Failed jobs are not yielded; see errors.
+
+        Yields:
+            JobResult: A job whose file has been downloaded.
+        """
+        pending = list(self.jobs)
+        next_poll = {id(job): 0.0 for job in pending}
+        interval = {id(job): self.min_poll_interval for job in pending}
+        poll_errors = {id(job): 0 for job in pending}
+        downloads = {}
+
+        logger.info(f"Number of jobs to download: {len(pending)}")
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="kapipy_download"
+        )
+        try:
+            while pending or downloads:
+                now = time.monotonic()
+                for job in [job for job in pending if next_poll[id(job)] <= now]:
+                    try:
+                        finished = job.status.state != "processing"
+                    except Exception as e:
+                        poll_errors[id(job)] += 1
+                        if poll_errors[id(job)] >= self.max_poll_errors:
+                            logger.warning(f"Could not poll job {job.id}, giving up: {e}")
+                            self.errors[job.id] = e
+                            pending.remove(job)
+                            continue
+                        logger.warning(f"Could not poll job {job.id}, will retry: {e}")
+                        finished = False
+                    else:
+                        poll_errors[id(job)] = 0
+
+                    if finished:
+                        pending.remove(job)
+                        future = executor.submit(job.download, folder=self.folder)
+                        downloads[future] = job
+                    else:
+                        logger.info(job)
+                        next_poll[id(job)] = now + interval[id(job)]
+                        interval[id(job)] = min(
+                            interval[id(job)] * self.backoff, self.max_poll_interval
+                        )
+
+                # Wait until the next poll is due or a download finishes
+                timeout = None
+                if pending:
+                    timeout = max(
+                        0, min(next_poll[id(job)] for job in pending) - time.monotonic()
+                    )
+                if not downloads:
+                    if pending:
+                        time.sleep(timeout)
+                    continue
+                done, _ = wait(downloads, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    job = downloads.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.warning(f"Could not download job {job.id}: {e}")
+                        self.errors[job.id] = e
+                        continue
+                    logger.info(
+                        f"Downloaded job {job.id}. {len(pending) + len(downloads)} jobs remaining..."
+                    )
+                    yield job
+        finally:
+            # Let running downloads finish, but do not start queued ones
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self) -> list["JobResult"]:
+        """
+        Downloads every job and returns once they have all finished or failed.
+
+        Returns:
+            list[JobResult]: The jobs, in the order they were given.
+
+        Raises:
+            DownloadError: If any job failed, once all the other jobs are done.
+                Its errors attribute holds the error for each failed job.
+        """
+        for _ in self.as_completed():
+            pass
+        if self.errors:
+            raise DownloadError(self.errors)
+        logger.info("All jobs completed and downloaded.")
+        return self.jobs
+
+    def __repr__(self) -> str:
+        return (
+            f"DownloadManager(jobs={len(self.jobs)}, folder={self.folder!r}, "
+            f"max_concurrency={self.max_concurrency!r})"
+        )
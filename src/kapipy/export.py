@@ -32,6 +32,7 @@ def validate_export_params(
     export_format: str,
     crs: str = None,
     filter_geometry: dict = None,
+    client: httpx.Client | None = None,
     **kwargs: Any,
 ) -> bool:
     """
@@ -46,6 +47,8 @@ def validate_export_params(
         export_format (str): The format for the export.
         crs (str, optional): Coordinate Reference System, if applicable.
         filter_geometry (dict, optional): Spatial filter_geometry for the export.
+        client (httpx.Client, optional): The pooled client to send the request with,
+            usually the session's. Defaults to a one-off connection.
         **kwargs: Additional parameters for the export.
 
     Returns:
@@ -84,7 +87,8 @@ def validate_export_params(
     is_valid = False
 
     try:
-        response = httpx.post(validation_url, headers=headers, json=data)
+        post = client.post if client is not None else httpx.post
+        response = post(validation_url, headers=headers, json=data)
         response.raise_for_status()
 
         # if response has any 200 status code, check for validation errors
@@ -128,6 +132,7 @@ def request_export(
     export_format: str,
     crs: str = None,
     filter_geometry: dict = None,
+    client: httpx.Client | None = None,
     **kwargs: Any,
 ) -> dict:
     """
@@ -142,6 +147,8 @@ def request_export(
         export_format (str): The format for the export.
         crs (str, optional): Coordinate Reference System, if applicable.
         filter_geometry (dict, optional): Spatial filter_geometry for the export.
+        client (httpx.Client, optional): The pooled client to send the request with,
+            usually the session's. Defaults to a one-off connection.
         **kwargs: Additional parameters for the export.
 
     Returns:
@@ -179,7 +186,8 @@ def request_export(
 
     request_datetime = datetime.utcnow()
     try:
-        response = httpx.post(export_url, headers=headers, json=data)
+        post = client.post if client is not None else httpx.post
+        response = post(export_url, headers=headers, json=data)
         response.raise_for_status()
         try:
             json_response = response.json()
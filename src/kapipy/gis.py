@@ -12,6 +12,7 @@ import importlib.util
 from .custom_errors import ServerError, BadRequest
 import httpx
 from .session_manager import SessionManager
+from .http_cache import cached_request
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +35,12 @@ WFS_PATH = "wfs/"
 has_arcgis = importlib.util.find_spec("arcgis") is not None
 has_geopandas = importlib.util.find_spec("geopandas") is not None
 has_arcpy = importlib.util.find_spec("arcpy") is not None
+has_pyarrow = importlib.util.find_spec("pyarrow") is not None
 
 logger.debug(f'{has_arcgis=}')
 logger.debug(f'{has_geopandas=}')
 logger.debug(f'{has_arcpy=}')
+logger.debug(f'{has_pyarrow=}')
 
 
 class GISK:
@@ -62,6 +65,8 @@ class GISK:
         url=None,
         api_key=None,
         api_version=DEFAULT_API_VERSION,
+        http_limits: httpx.Limits | None = None,
+        http2: bool = False,
     ) -> None:
         """
         Initializes the GISK instance with the base URL, API version, and API key.
@@ -71,6 +76,8 @@ class GISK:
             url (str, optional): The base URL of the Koordinates server. Used if name is not provided.
             api_key (str): The API key for authenticating with the Koordinates server.
             api_version (str, optional): The API version to use. Defaults to 'v1.x'.
+            http_limits (httpx.Limits, optional): The connection pool limits of the session's HTTP client.
+            http2 (bool, optional): Whether the session's HTTP client uses HTTP/2. Requires the h2 package.
 
         Raises:
             ValueError: If the portal name is not recognized or if api_key is not provided.
@@ -97,7 +104,9 @@ class GISK:
             api_key=self._api_key, 
             api_url=self._api_url, 
             service_url=self._service_url,
-            wfs_url=self._wfs_url
+            wfs_url=self._wfs_url,
+            http_limits=http_limits,
+            http2=http2,
             )
         logger.debug(f"GISK initialized with URL: {self.url}")
         
@@ -183,7 +192,9 @@ class GISK:
         headers = {"Authorization": f"key {self._api_key}"}
         logger.debug(f"Making kserver GET request to {url} with params {params}")
         try:
-            response = httpx.get(url, headers=headers, params=params, timeout=30)
+            response = cached_request(
+                self.session.client, "GET", url, headers=headers, params=params
+            )
         except httpx.RequestError as exc:
             logger.error(f"An error occurred while requesting {exc.request.url!r}.")
             raise ServerError(str(exc)) from exc
@@ -0,0 +1,319 @@
+"""
+Persistent on-disk cache for HTTP responses.
+
+Scheduled jobs often resolve the same items, services and WFS queries on
+every run. With a response cache set, successful responses are stored on
+disk, keyed on a hash of the method, URL, params and API key, and reused
+until their time to live runs out. Stale responses that carried an ETag or
+Last-Modified header are revalidated with a conditional request, so an
+unchanged response costs a 304 rather than a full download. The least
+recently used responses are evicted once the cache grows past its size cap.
+
+The cache is off by default. Turn it on with set_response_cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Headers kept with a cached response
+_STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    """Write a file so that readers never see it half written."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    finally:
+        # Only left behind if the write or replace failed
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class ResponseCache:
+    """
+    A content-addressed cache of HTTP responses in a folder on disk.
+
+    Each response is stored as a body file and a small JSON metadata file,
+    named by the SHA-256 hash of the request. The metadata file's modified
+    time records when the response was last used, for LRU eviction.
+
+    Attributes:
+        folder (str): The folder the responses are stored in.
+        max_bytes (int): The total size of response bodies to keep.
+        ttls (dict[str, int]): Time to live in seconds for URLs containing each key.
+        default_ttl (int): Time to live in seconds for other URLs.
+    """
+
+    def __init__(
+        self,
+        folder: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: dict[str, int] | None = None,
+        default_ttl: int = DEFAULT_TTL,
+    ):
+        """
+        Initializes the ResponseCache, creating its folder if needed.
+
+        Parameters:
+            folder (str, optional): Where to store the responses. Defaults to
+                an "http_cache" folder in the kapipy temp directory.
+            max_bytes (int, optional): The total size of response bodies to
+                keep before the least recently used are evicted. Defaults to 1 GB.
+            ttls (dict[str, int], optional): Per-endpoint time to live in
+                seconds, keyed by a part of the URL, e.g. {"/services/wfs": 600}.
+                The longest matching key is used.
+            default_ttl (int, optional): Time to live in seconds for URLs that
+                match none of ttls. Defaults to one hour.
+        """
+        if max_bytes < 0 or default_ttl < 0:
+            raise ValueError("max_bytes and default_ttl must not be negative.")
+        self.folder = folder or os.path.join(tempfile.gettempdir(), "kapipy", "http_cache")
+        os.makedirs(self.folder, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        data: dict | None = None,
+    ) -> str:
+        """Return the cache key for a request. The API key is hashed in, never stored."""
+        request = {
+            "method": method.upper(),
+            "url": url,
+            "params": params or {},
+            "data": data or {},
+            "authorization": (headers or {}).get("Authorization"),
+        }
+        encoded = json.dumps(request, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        """Return the time to live in seconds for a URL."""
+        matches = [pattern for pattern in self.ttls if pattern in url]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.folder, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, key: str) -> tuple[dict, bytes] | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(meta_path)  # Mark as recently used
+        except (OSError, ValueError):
+            # Missing, half evicted by another process, or unreadable
+            return None
+        return meta, body
+
+    def _store(self, key: str, url: str, response: httpx.Response) -> None:
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        body = response.content
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in _STORED_HEADERS
+                if name in response.headers
+            },
+            "stored_at": time.time(),
+            "size": len(body),
+        }
+        with self._lock:
+            previous = self._entry_size(meta_path)
+            _write_atomic(body_path, body)
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+            self._add_bytes(len(body) - previous)
+            self._evict()
+
+    def _refresh(self, key: str, meta: dict) -> None:
+        """Restart the time to live of a response that was revalidated."""
+        meta_path, _ = self._paths(key)
+        meta["stored_at"] = time.time()
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _entry_size(meta_path: str) -> int:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("size", 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _entries(self) -> list[tuple[float, str, int]]:
+        """Return (last used, metadata path, size) for each stored response."""
+        entries = []
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                if name.endswith(".json"):
+                    meta_path = os.path.join(root, name)
+                    entries.append(
+                        (os.path.getmtime(meta_path), meta_path, self._entry_size(meta_path))
+                    )
+        return entries
+
+    def _add_bytes(self, size: int) -> None:
+        if self._total_bytes is None:
+            # The first count includes the response that was just stored
+            self._total_bytes = sum(entry_size for _, _, entry_size in self._entries())
+        else:
+            self._total_bytes += size
+
+    def _evict(self) -> None:
+        """Remove the least recently used responses until the cache fits in max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for _, meta_path, size in sorted(self._entries()):
+            if self._total_bytes <= self.max_bytes:
+                break
+            for path in (meta_path, f"{meta_path[:-len('.json')]}.body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= size
+            logger.debug(f"Evicted cached response {os.path.basename(meta_path)}")
+
+    def request(
+        self,
+        client: httpx.Client,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        data: dict | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request through the cache.
+
+        A fresh cached response is returned without a request. A stale one is
+        revalidated with If-None-Match or If-Modified-Since where possible.
+        Successful (200) responses are stored.
+
+        Parameters:
+            client (httpx.Client): The client to send the request with.
+            method (str): The HTTP method.
+            url (str): The URL.
+            headers (dict, optional): The request headers.
+            params (dict, optional): The query parameters.
+            data (dict, optional): The form data.
+            **kwargs: Passed on to client.request, e.g. timeout.
+
+        Returns:
+            httpx.Response: The cached or the new response.
+        """
+        key = self.key(method, url, headers, params, data)
+        cached = self._load(key)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta["stored_at"] < self.ttl_for(url):
+                logger.debug(f"Using cached response for {url}")
+                return self._response(method, url, meta, body)
+            if "etag" in meta["headers"]:
+                request_headers["If-None-Match"] = meta["headers"]["etag"]
+            if "last-modified" in meta["headers"]:
+                request_headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+
+        response = client.request(
+            method, url, headers=request_headers, params=params, data=data, **kwargs
+        )
+        if cached is not None and response.status_code == 304:
+            logger.debug(f"Cached response for {url} is still valid")
+            self._refresh(key, meta)
+            return self._response(method, url, meta, body)
+        if response.status_code == 200:
+            self._store(key, url, response)
+        return response
+
+    @staticmethod
+    def _response(method: str, url: str, meta: dict, body: bytes) -> httpx.Response:
+        return httpx.Response(
+            meta["status_code"],
+            headers=meta["headers"],
+            content=body,
+            request=httpx.Request(method, url),
+        )
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        with self._lock:
+            for _, meta_path, _ in self._entries():
+                for path in (meta_path, f"{meta_path[:-len('.json')]}.body"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            self._total_bytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCache(folder={self.folder!r}, max_bytes={self.max_bytes!r}, "
+            f"default_ttl={self.default_ttl!r})"
+        )
+
+
+_response_cache = None
+
+
+def set_response_cache(cache: ResponseCache | None) -> ResponseCache | None:
+    """
+    Turn the response cache on for all kapipy requests that support it, or off with None.
+
+    Item metadata and services requests made through a GISK session, and WFS
+    page requests, are cached. Export requests and downloads are never cached.
+
+    Parameters:
+        cache (ResponseCache or None): The cache to use.
+
+    Returns:
+        ResponseCache or None: The cache now in use.
+    """
+    global _response_cache
+    _response_cache = cache
+    logger.debug(f"Using response cache: {cache!r}")
+    return _response_cache
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the response cache in use, or None if caching is off."""
+    return _response_cache
+
+
+def cached_request(client: httpx.Client, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the response cache if one is set, otherwise directly."""
+    if _response_cache is None:
+        return client.request(method, url, **kwargs)
+    return _response_cache.request(client, method, url, **kwargs)
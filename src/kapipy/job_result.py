@@ -3,8 +3,6 @@
 import logging
 import os
 import time
-import asyncio
-import httpx
 from dataclasses import dataclass
 import hashlib
 
@@ -227,7 +225,8 @@ class JobResult:
         Returns:
             None
         """
-        self._last_response = self._session.get(self._job_url)
+        # Job state changes between polls, so it is never served from the response cache
+        self._last_response = self._session.get(self._job_url, cache=False)
 
 
     def output(self) -> dict:
@@ -293,23 +292,21 @@ class JobResult:
 
         headers = self._session.headers
 
-        with httpx.Client(follow_redirects=True) as client:
-            resp = client.get(self.download_url, headers=headers, follow_redirects=True)
-            resp.raise_for_status()
-            final_url = str(resp.url)
-
-            with client.stream("GET", final_url) as r, open(file_path, "wb") as f:
-                r.raise_for_status()
-                for chunk in r.iter_bytes(chunk_size=65536):
-                    f.write(chunk)
+        # One streamed request: redirects (e.g. to S3) are followed, and the body is
+        # written to disk and hashed chunk by chunk rather than held in memory.
+        client = self._session.client
+        sha256 = hashlib.sha256()
+        with client.stream(
+            "GET", self.download_url, headers=headers, follow_redirects=True
+        ) as r, open(file_path, "wb") as f:
+            r.raise_for_status()
+            final_url = str(r.url)
+            for chunk in r.iter_bytes(chunk_size=65536):
+                f.write(chunk)
+                sha256.update(chunk)
 
         file_size_bytes = os.path.getsize(file_path)
-        checksum = None
-        try:
-            with open(file_path, "rb") as f:
-                checksum = hashlib.sha256(f.read()).hexdigest()
-        except Exception:
-            pass
+        checksum = sha256.hexdigest()
         completed_at = time.time()
 
         # Set as attributes on the JobResult instance
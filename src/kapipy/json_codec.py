@@ -0,0 +1,126 @@
+"""
+JSON codec used on the WFS and API hot paths.
+
+Decoding 10,000 feature WFS pages with the standard library json module is a
+measurable part of a download. If orjson or msgspec is installed, it is used
+instead, otherwise the standard library is used. The codec can also be chosen
+explicitly with set_json_codec, or with the KAPIPY_JSON_CODEC environment
+variable.
+
+All codecs decode from bytes or str, raise ValueError on invalid JSON, and
+encode to UTF-8 bytes.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+JSON_CODECS = ("orjson", "msgspec", "json")
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def msgspec_loads(data: bytes | str) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return JSONCodec("msgspec", msgspec_loads, encoder.encode)
+
+
+def _load_codec(name: str) -> JSONCodec:
+    """Return the named codec. Raises ImportError if it is not installed."""
+    if name == "orjson":
+        import orjson
+
+        return JSONCodec(name, orjson.loads, orjson.dumps)
+    if name == "msgspec":
+        return _msgspec_codec()
+    if name == "json":
+        return JSONCodec(name, json.loads, _stdlib_dumps)
+    raise ValueError(f"Invalid JSON codec. Use one of: {', '.join(JSON_CODECS)}.")
+
+
+def _fastest_installed_codec_name() -> str:
+    for name in JSON_CODECS:
+        if name == "json" or importlib.util.find_spec(name) is not None:
+            return name
+
+
+_codec = None
+
+
+def set_json_codec(name: str) -> JSONCodec:
+    """
+    Choose the JSON codec used by kapipy.
+
+    Parameters:
+        name (str): One of "orjson", "msgspec" or "json" (the standard library).
+
+    Returns:
+        JSONCodec: The codec now in use.
+
+    Raises:
+        ValueError: If the name is not a known codec.
+        ImportError: If the codec's package is not installed.
+    """
+    global _codec
+    _codec = _load_codec(name)
+    logger.debug(f"Using JSON codec: {name}")
+    return _codec
+
+
+def get_json_codec() -> JSONCodec:
+    """
+    Return the JSON codec in use, choosing one on first use.
+
+    On first use the codec named by KAPIPY_JSON_CODEC is used. If that is
+    not set, or names a codec that is unknown or not installed, the fastest
+    installed codec is used.
+
+    Returns:
+        JSONCodec: The codec in use.
+    """
+    if _codec is None:
+        requested = os.getenv("KAPIPY_JSON_CODEC")
+        if requested:
+            try:
+                return set_json_codec(requested)
+            except (ImportError, ValueError) as e:
+                logger.warning(
+                    f"Cannot use JSON codec '{requested}' from KAPIPY_JSON_CODEC ({e}); "
+                    "using the fastest installed codec instead."
+                )
+        return set_json_codec(_fastest_installed_codec_name())
+    return _codec
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str with the codec in use."""
+    return get_json_codec().loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON bytes with the codec in use."""
+    return get_json_codec().dumps(obj)
@@ -1,5 +1,9 @@
+import asyncio
 import httpx
 import logging
+from . import json_codec
+from .http_cache import cached_request
+from .custom_errors import BadRequest, ServerError
 
 logger = logging.getLogger(__name__)
 # The default httpx logging level is INFO which spams the logs
@@ -7,15 +11,32 @@ logger = logging.getLogger(__name__)
 logger_httpx = logging.getLogger("httpx")
 logger_httpx.setLevel(logging.WARNING)
 
+DEFAULT_TIMEOUT = 30
+DEFAULT_HTTP_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30
+)
+
 class SessionManager:
     """
     Manages HTTP sessions and authentication for API requests to the Koordinates platform.
 
     Provides methods for making authenticated GET and POST requests, automatically injecting
     the API key into request headers and handling common HTTP errors.
+
+    All synchronous requests share one long-lived httpx.Client, so connections
+    are kept alive and reused rather than opened for every request. Async
+    requests likewise share one httpx.AsyncClient per event loop.
     """
 
-    def __init__(self, api_key: str, api_url: str, service_url: str, wfs_url: str):
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str,
+        service_url: str,
+        wfs_url: str,
+        http_limits: httpx.Limits | None = None,
+        http2: bool = False,
+    ):
         """
         Initializes the SessionManager with API credentials and endpoint URLs.
 
@@ -24,14 +45,66 @@ class SessionManager:
             api_url (str): The base URL for the API.
             service_url (str): The base URL for service endpoints.
             wfs_url (str): The base URL for WFS endpoints.
+            http_limits (httpx.Limits, optional): The connection pool limits.
+                Defaults to 20 connections, of which 10 are kept alive for 30 seconds.
+            http2 (bool, optional): Whether to use HTTP/2. Requires the h2 package.
         """
         self.api_key = api_key
         self.headers = {"Authorization": f"key {self.api_key}"}
         self.api_url = api_url
         self.service_url = service_url
         self.wfs_url = wfs_url
+        self._http_limits = http_limits or DEFAULT_HTTP_LIMITS
+        self._http2 = http2
+        self.client = httpx.Client(
+            limits=self._http_limits,
+            http2=http2,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        self._async_client = None
+        self._async_client_loop = None
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP client and its connections.
+        """
+        self.client.close()
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """
+        Returns the pooled async HTTP client for the running event loop.
 
-    def get(self, url: str, params: dict = None) -> dict:
+        An httpx.AsyncClient's connections belong to the event loop they were
+        opened on, so a new client is created if the loop has changed, for
+        example between two asyncio.run calls.
+
+        Returns:
+            httpx.AsyncClient: The shared async client.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_client is None
+            or self._async_client.is_closed
+            or self._async_client_loop is not loop
+        ):
+            self._async_client = httpx.AsyncClient(
+                limits=self._http_limits,
+                http2=self._http2,
+                timeout=DEFAULT_TIMEOUT,
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Closes the pooled async HTTP client, if one is open on the running event loop.
+        """
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
+
+    def get(self, url: str, params: dict = None, cache: bool = True) -> dict:
         """
         Makes a synchronous GET request to the specified URL with the provided parameters.
         Injects the API key into the request headers.
@@ -39,6 +112,8 @@ class SessionManager:
         Parameters:
             url (str): The URL to send the GET request to.
             params (dict, optional): Query parameters to include in the request. Defaults to None.
+            cache (bool, optional): Whether the response cache may be used, if one is set.
+                Defaults to True.
 
         Returns:
             dict: The JSON-decoded response from the server.
@@ -50,7 +125,46 @@ class SessionManager:
 
         logger.debug(f"Making kserver GET request to {url} with params {params}")
         try:
-            response = httpx.get(url, headers=self.headers, params=params, timeout=30)
+            if cache:
+                response = cached_request(
+                    self.client, "GET", url, headers=self.headers, params=params
+                )
+            else:
+                response = self.client.get(url, headers=self.headers, params=params)
+        except httpx.RequestError as exc:
+            logger.error(f"An error occurred while requesting {exc.request.url!r}.")
+            raise ServerError(str(exc)) from exc
+
+        if response.status_code == 400:
+            raise BadRequest(response.text)
+        response.raise_for_status()
+        return json_codec.loads(response.content)
+
+    async def get_async(
+        self, url: str, params: dict = None, client: httpx.AsyncClient | None = None
+    ) -> dict:
+        """
+        Makes an asynchronous GET request to the specified URL with the provided parameters.
+        Injects the API key into the request headers.
+
+        Parameters:
+            url (str): The URL to send the GET request to.
+            params (dict, optional): Query parameters to include in the request. Defaults to None.
+            client (httpx.AsyncClient, optional): The client to send the request with.
+                Defaults to the session's pooled async client.
+
+        Returns:
+            dict: The JSON-decoded response from the server.
+
+        Raises:
+            BadRequest: If the request fails with a 400 status code.
+            ServerError: For other HTTP errors or request exceptions.
+        """
+
+        logger.debug(f"Making async kserver GET request to {url} with params {params}")
+        try:
+            client = client or self.get_async_client()
+            response = await client.get(url, headers=self.headers, params=params)
         except httpx.RequestError as exc:
             logger.error(f"An error occurred while requesting {exc.request.url!r}.")
             raise ServerError(str(exc)) from exc
@@ -58,7 +172,7 @@ class SessionManager:
         if response.status_code == 400:
             raise BadRequest(response.text)
         response.raise_for_status()
-        return response.json()
+        return json_codec.loads(response.content)
 
     def post(self, url, data=None, json=None, **kwargs):
         """
@@ -80,7 +194,7 @@ class SessionManager:
 
         logger.debug(f"Making kserver POST request to {url} with data {data} and json {json}")
         try:
-            response = httpx.post(url, headers=self.headers, data=data, json=json, **kwargs)
+            response = self.client.post(url, headers=self.headers, data=data, json=json, **kwargs)
         except httpx.RequestError as exc:
             logger.error(f"An error occurred while requesting {exc.request.url!r}.")
             raise ServerError(str(exc)) from exc
@@ -88,7 +202,7 @@ class SessionManager:
         if response.status_code == 400:
             raise BadRequest(response.text)
         response.raise_for_status()
-        return response.json()
+        return json_codec.loads(response.content)
 
     def __repr__(self):
         return (
@@ -6,7 +6,7 @@ import logging
 from .job_result import JobResult
 from .data_classes import BaseItem
 from .wfs_response import WFSResponse  
-from .wfs_utils import download_wfs_data
+from .wfs_utils import download_wfs_data, download_wfs_data_async
 
 logger = logging.getLogger(__name__)
 
@@ -28,20 +28,94 @@ class TableItem(BaseItem):
         out_fields: str | list[str] = None,
         result_record_count: int = None,
         **kwargs: Any
-        ) -> dict:
+        ) -> WFSResponse:
 
         """
         Executes a WFS query on the item and returns the result as JSON.
 
         Parameters:
             cql_filter (str, optional): The CQL filter to apply to the query.
+            dtype_backend (str, optional): Set to "pyarrow" for the response's df and gdf
+                to use pandas ArrowDtype columns. Passed to the WFSResponse.
+            keep (str, optional): Which representations the response keeps once built:
+                "all", "tabular" or "latest". Passed to the WFSResponse.
             **kwargs: Additional parameters for the WFS query.
 
         Returns:
-            dict: The result of the WFS query in JSON format.
+            WFSResponse: The result of the WFS query.
         """
         logger.debug(f"Executing WFS query for item with id: {self.id}")
 
+        query = self._prepare_query(
+            from_time=from_time,
+            to_time=to_time,
+            cql_filter=cql_filter,
+            out_fields=out_fields,
+            result_record_count=result_record_count,
+            **kwargs,
+        )
+        query_details = download_wfs_data(**query["download_params"])
+        return self._query_response(query, query_details)
+
+    async def query_async(
+        self,
+        *,
+        from_time: str = None,
+        to_time: str = None,
+        cql_filter: str = None,
+        out_fields: str | list[str] = None,
+        result_record_count: int = None,
+        **kwargs: Any
+        ) -> WFSResponse:
+
+        """
+        Asynchronously executes a WFS query on the item.
+
+        Accepts the same parameters as query and returns the same WFSResponse,
+        but awaits the WFS pages on the running event loop using httpx.AsyncClient.
+        By default the session's pooled async client is used; another
+        httpx.AsyncClient can be passed as client instead.
+
+        Returns:
+            WFSResponse: The result of the WFS query.
+        """
+        logger.debug(f"Executing async WFS query for item with id: {self.id}")
+
+        await self._load_services_async()
+        query = self._prepare_query(
+            from_time=from_time,
+            to_time=to_time,
+            cql_filter=cql_filter,
+            out_fields=out_fields,
+            result_record_count=result_record_count,
+            **kwargs,
+        )
+        # Share the session's pooled connections across concurrent queries
+        query["download_params"].setdefault("client", self._session.get_async_client())
+        query_details = await download_wfs_data_async(**query["download_params"])
+        return self._query_response(query, query_details)
+
+    def _prepare_query(
+        self,
+        *,
+        from_time: str = None,
+        to_time: str = None,
+        cql_filter: str = None,
+        out_fields: str | list[str] = None,
+        result_record_count: int = None,
+        **kwargs: Any
+        ) -> dict:
+        """
+        Resolves the query arguments into the WFS download parameters.
+
+        Returns:
+            dict: The download parameters along with the request type, changeset flag and WFSResponse options.
+        """
+
+        self._keyset_primary_key(kwargs)
+        self._sink_fields(kwargs)
+        response_options = self._response_options(kwargs)
+
         viewparams = None
         is_changeset_request = False
         if from_time is not None or to_time is not None:
@@ -84,22 +158,32 @@ class TableItem(BaseItem):
             type_name = f"{self.type}-{self.id}"
             request_type = "wfs-query"
 
-        query_details = download_wfs_data(
-            url=self._wfs_url,
-            api_key=self._session.api_key,
-            typeNames=type_name,
-            viewparams=viewparams,
-            cql_filter=cql_filter,
-            out_fields=out_fields,
-            result_record_count=result_record_count,
-            **kwargs,
-        )
+        return {
+            "download_params": dict(
+                url=self._wfs_url,
+                api_key=self._session.api_key,
+                typeNames=type_name,
+                viewparams=viewparams,
+                cql_filter=cql_filter,
+                out_fields=out_fields,
+                result_record_count=result_record_count,
+                **kwargs,
+            ),
+            "request_type": request_type,
+            "is_changeset": is_changeset_request,
+            "response_options": response_options,
+        }
+
+    def _query_response(self, query: dict, query_details: dict) -> WFSResponse:
+        """
+        Records the query with the audit manager and wraps the result in a WFSResponse.
+        """
 
         self._audit.add_request_record(
             item_id=self.id,
             item_kind=self.kind,
             item_type=self.type,
-            request_type=request_type,
+            request_type=query["request_type"],
             request_url=query_details.get("request_url", ""),
             request_method=query_details.get("request_method", ""),
             request_time=query_details.get("request_time", ""),
@@ -111,8 +195,11 @@ class TableItem(BaseItem):
         return WFSResponse(
             geojson=query_details.get("response", {}).get("geojson", None),
             data_file_path=query_details.get("response", {}).get("file_path", None),
+            data_file_format=query_details.get("response", {}).get("file_format", "GeoJSON"),
+            columnar=query_details.get("response", {}).get("columnar", None),
             item=self,
-            is_changeset=is_changeset_request,
+            is_changeset=query["is_changeset"],
+            **query["response_options"],
             )
 
 
@@ -1,5 +1,8 @@
 import logging
-import json
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator
 
 from .conversion import (
     geojson_to_gdf,
@@ -7,10 +10,50 @@ from .conversion import (
     json_to_df,
 )
 
-from .gis import has_geopandas, has_arcgis
+from . import json_codec
+from .gis import has_geopandas, has_arcgis, has_pyarrow
+from .wfs_utils import (
+    DEFAULT_FEATURES_PER_PAGE,
+    _FeatureIndex,
+    _get_kapipy_temp_file,
+    _iter_disk_features,
+    _iter_ndjson_features,
+    _ndjson_byte_ranges,
+    _read_ndjson_range,
+)
+from .wfs_sinks import (
+    GEOMETRY_COLUMN,
+    _columnar_to_arrow,
+    _iter_columnar_features,
+    _iter_geopackage_features,
+    _iter_parquet_features,
+    _iter_shapefile_features,
+    _pages_to_arrow,
+    _read_parquet_table,
+    _with_geoarrow_geometry,
+)
+
+PARQUET_FORMATS = ("GeoParquet", "Parquet")
+DTYPE_BACKENDS = ("pyarrow",)
+KEEP_POLICIES = ("all", "tabular", "latest")
+# Query options that configure the returned WFSResponse rather than the request
+RESPONSE_OPTIONS = ("dtype_backend", "keep")
 
 logger = logging.getLogger(__name__)
 
+
+def _remove_spilled_file(file_path: str) -> None:
+    """Delete a temporary file that json was spilled to."""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove spilled WFSResponse file '{file_path}': {e}")
+    else:
+        logger.debug(f"Removed spilled WFSResponse file '{file_path}'")
+
+
 class WFSResponse:
     """
     Represents a response from a WFS (Web Feature Service) request.
@@ -25,28 +68,59 @@ class WFSResponse:
         _df (pd.DataFrame or None): Cached Pandas DataFrame.
         _gdf (gpd.GeoDataFrame or None): Cached GeoPandas DataFrame.
         _sdf (SpatialDataFrame or None): Cached Spatially Enabled DataFrame.
+        _arrow (pa.Table or None): Cached pyarrow Table.
+        dtype_backend (str or None): Set to "pyarrow" for df and gdf to use
+            pandas ArrowDtype columns.
+        keep (str): Which of the cached representations to keep. See __init__.
         total_features (int): The number of features in the GeoJSON.
     """
 
-    def __init__(self, geojson: dict | None, data_file_path: str | None, item: "BaseItem" = None, out_sr=None, is_changeset: bool = False):
+    def __init__(self, geojson: dict | None, data_file_path: str | None, item: "BaseItem" = None, out_sr=None, is_changeset: bool = False, data_file_format: str = "GeoJSON", columnar: dict | None = None, dtype_backend: str | None = None, keep: str = "all"):
         """
         Initialize a WFSResponse instance.
 
         Args:
             geojson (dict): The raw GeoJSON data.
+            data_file_path (str, optional): The file the features were cached to.
             item (BaseItem, optional): The associated item metadata.
             out_sr (Any, optional): The output spatial reference.
+            data_file_format (str, optional): The format of the cached file,
+                one of "GeoJSON", "GeoJSONSeq", "GeoParquet", "Parquet",
+                "Shapefile" or "GeoPackage".
+            columnar (dict, optional): A COLUMNAR mode result, with the
+                "attributes" DataFrame and the "geometry" WKB array.
+            dtype_backend (str, optional): Set to "pyarrow" for df and gdf
+                to use pandas ArrowDtype columns.
+            keep (str, optional): Which representations to keep once built.
+                "all" keeps json, df, gdf, sdf and arrow as they are built.
+                "tabular" drops the raw json once any tabular form exists.
+                "latest" keeps only the most recently built representation.
+                json that came from a MEMORY mode download is spilled to a
+                temporary NDJSON file before it is dropped, so it can still
+                be read again.
         """
 
         self._json = geojson
         self._data_file_path = data_file_path
+        self._data_file_format = data_file_format
+        self._columnar = columnar
         self.item = item
         self.out_sr = out_sr
         self._df = None
         self._gdf = None
         self._sdf = None
+        self._arrow = None
+        self._feature_index = None
+        # Deletes the temporary file json was spilled to, if this response owns one
+        self._spill_finalizer = None
+        self.dtype_backend = dtype_backend
+        self.keep = keep
+        # The names of the cached representations, oldest first
+        self._built = ["_json"] if geojson is not None else []
         if geojson:
             self.total_features = len(geojson["features"])
+        elif columnar is not None:
+            self.total_features = len(columnar["attributes"])
         else:
             self.total_features = None
         self.is_changeset = is_changeset
@@ -59,11 +133,268 @@ class WFSResponse:
         Returns:
             dict: The raw GeoJSON data.
         """
-        if self._json is None and self._data_file_path:
-            with open(self._data_file_path, "r", encoding="utf-8") as f:
-                self._json = json.load(f)
+        if self._json is None and (self._columnar is not None or self._data_file_path):
+            if self._columnar is not None or self._data_file_format != "GeoJSON":
+                geojson = {"type": "FeatureCollection", "features": self.read_features()}
+            else:
+                with open(self._data_file_path, "rb") as f:
+                    geojson = json_codec.loads(f.read())
+            self._remember("_json", geojson)
         return self._json
 
+    def _remember(self, name: str, value: Any) -> Any:
+        """
+        Cache a representation that has just been built, and evict others according to keep.
+
+        Parameters:
+            name (str): The attribute that holds the representation, e.g. "_gdf".
+            value (Any): The representation.
+
+        Returns:
+            Any: The value.
+
+        Raises:
+            ValueError: If keep is not a known policy.
+        """
+        if self.keep not in KEEP_POLICIES:
+            raise ValueError(
+                f"Invalid keep. Use one of: {', '.join(repr(k) for k in KEEP_POLICIES)}."
+            )
+        setattr(self, name, value)
+        if name in self._built:
+            self._built.remove(name)
+        self._built.append(name)
+
+        for older in self._built[:-1]:
+            if self.keep == "latest" or (self.keep == "tabular" and older == "_json"):
+                self._evict(older)
+        return value
+
+    def _evict(self, name: str) -> None:
+        """Drop a cached representation, spilling json to disk if nothing else holds it."""
+        if name == "_json" and self._columnar is None and not self._data_file_path:
+            self._spill_json()
+        logger.debug(f"Evicting cached {name.lstrip('_')} from WFSResponse")
+        setattr(self, name, None)
+        self._built.remove(name)
+
+    def _spill_json(self) -> None:
+        """Write the in-memory features to a temporary NDJSON file and read from it from now on."""
+        file_path = _get_kapipy_temp_file(suffix=".geojsonl")
+        dumps = json_codec.get_json_codec().dumps
+        with open(file_path, "wb") as f:
+            for feature in self._json.get("features", []):
+                f.write(dumps(feature))
+                f.write(b"\n")
+        logger.info(f"Spilled WFSResponse json to '{file_path}'")
+        self._close_index()
+        self._data_file_path = file_path
+        self._data_file_format = "GeoJSONSeq"
+        self._spill_finalizer = weakref.finalize(self, _remove_spilled_file, file_path)
+
+    def iter_features(self, byte_range: tuple[int, int] | None = None) -> Iterator[dict]:
+        """
+        Iterate over the GeoJSON features one at a time.
+
+        For DISK and NDJSON mode responses that have not been loaded with json,
+        the features are read from the file line by line rather than loading
+        the whole file.
+
+        Parameters:
+            byte_range (tuple[int, int], optional): For NDJSON mode responses,
+                only read the features whose lines start within this
+                (start, end) byte range. See byte_ranges.
+
+        Yields:
+            dict: A GeoJSON feature.
+
+        Raises:
+            ValueError: If a byte_range is given for a response that is not
+                cached as GeoJSONSeq.
+        """
+        if byte_range is not None:
+            if not self._is_geojsonseq_file():
+                raise ValueError("byte_range is only supported for NDJSON cache_mode responses.")
+            yield from _iter_ndjson_features(self._data_file_path, *byte_range)
+        elif self._json is None and self._columnar is not None:
+            yield from _iter_columnar_features(self._columnar)
+        elif self._json is None and self._data_file_path:
+            if self._data_file_format == "GeoJSONSeq":
+                yield from _iter_ndjson_features(self._data_file_path)
+            elif self._data_file_format in PARQUET_FORMATS:
+                yield from _iter_parquet_features(self._data_file_path)
+            elif self._data_file_format == "Shapefile":
+                yield from _iter_shapefile_features(self._data_file_path)
+            elif self._data_file_format == "GeoPackage":
+                yield from _iter_geopackage_features(self._data_file_path)
+            else:
+                yield from _iter_disk_features(self._data_file_path)
+        elif self._json is not None:
+            yield from self._json.get("features", [])
+
+    def close(self) -> None:
+        """
+        Release the memory-mapped feature index of a DISK or NDJSON mode file.
+
+        The index is built again if feature or indexing is used afterwards.
+        Close the response before deleting its data file, as an open memory
+        map stops the file being deleted on Windows.
+
+        If json was spilled to a temporary file under the keep policy, that
+        file is deleted, so the spilled features can no longer be read. The
+        file is also deleted when the response is garbage collected.
+        """
+        self._close_index()
+        if self._spill_finalizer is not None:
+            self._spill_finalizer()
+            self._spill_finalizer = None
+            self._data_file_path = None
+            self._data_file_format = "GeoJSON"
+
+    def _close_index(self) -> None:
+        if self._feature_index is not None:
+            self._feature_index.close()
+            self._feature_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _index(self) -> "_FeatureIndex | None":
+        """Return the feature offset index of a DISK or NDJSON mode file, built on first use."""
+        if self._json is not None or not self._data_file_path:
+            return None
+        if self._data_file_format not in ("GeoJSON", "GeoJSONSeq"):
+            return None
+        if self._feature_index is None:
+            self._feature_index = _FeatureIndex(
+                self._data_file_path, has_header=self._data_file_format == "GeoJSON"
+            )
+        return self._feature_index
+
+    def feature(self, i: int) -> dict:
+        """
+        Get a single feature by its position in the result.
+
+        For DISK and NDJSON mode responses that have not been loaded with json,
+        the file is memory-mapped and only the requested feature is decoded.
+        The feature offsets are indexed on first use.
+
+        Parameters:
+            i (int): The position of the feature. Negative positions count from the end.
+
+        Returns:
+            dict: The GeoJSON feature.
+
+        Raises:
+            IndexError: If i is out of range.
+        """
+        index = self._index()
+        if index is not None:
+            return index.feature(i)
+        return self.json["features"][i]
+
+    def __getitem__(self, key: int | slice) -> dict | list[dict]:
+        """
+        Get a feature by position, or a list of features by slice.
+
+        Like feature, only the requested features are decoded for DISK and
+        NDJSON mode responses.
+        """
+        if not isinstance(key, slice):
+            return self.feature(key)
+        index = self._index()
+        if index is not None:
+            return index.features(range(*key.indices(len(index))))
+        return self.json["features"][key]
+
+    def __len__(self) -> int:
+        """Return the number of features."""
+        index = self._index()
+        if index is not None:
+            return len(index)
+        if self.total_features is not None:
+            return self.total_features
+        return len(self.json["features"])
+
+    def _is_geojsonseq_file(self) -> bool:
+        return bool(self._data_file_path) and self._data_file_format == "GeoJSONSeq"
+
+    def byte_ranges(self, parts: int) -> list[tuple[int, int]]:
+        """
+        Split an NDJSON mode response file into byte ranges.
+
+        Each range can be read independently with iter_features(byte_range=...),
+        for example in separate worker processes. Together the ranges return
+        every feature exactly once.
+
+        Parameters:
+            parts (int): The number of ranges to split the file into.
+
+        Returns:
+            list[tuple[int, int]]: Up to parts (start, end) byte ranges.
+
+        Raises:
+            ValueError: If the response is not cached as GeoJSONSeq.
+        """
+        if not self._is_geojsonseq_file():
+            raise ValueError("byte_ranges is only supported for NDJSON cache_mode responses.")
+        return _ndjson_byte_ranges(self._data_file_path, parts)
+
+    def read_features(self, max_workers: int = 1) -> list[dict]:
+        """
+        Read all of the features into a list.
+
+        For NDJSON mode responses, max_workers above 1 splits the file into
+        that many byte ranges and decodes them in parallel worker processes.
+        The features are returned in file order.
+
+        Parameters:
+            max_workers (int, optional): The number of worker processes to use.
+
+        Returns:
+            list[dict]: The GeoJSON features.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        if max_workers == 1 or self._json is not None or not self._is_geojsonseq_file():
+            return list(self.iter_features())
+
+        ranges = self.byte_ranges(max_workers)
+        features = []
+        with ProcessPoolExecutor(max_workers=len(ranges) or 1) as executor:
+            for chunk in executor.map(
+                _read_ndjson_range,
+                [self._data_file_path] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+            ):
+                features.extend(chunk)
+        return features
+
+    def iter_pages(self, page_size: int = DEFAULT_FEATURES_PER_PAGE) -> Iterator[list[dict]]:
+        """
+        Iterate over the GeoJSON features in batches.
+
+        Parameters:
+            page_size (int, optional): The maximum number of features per batch.
+
+        Yields:
+            list[dict]: A batch of up to page_size GeoJSON features.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        batch = []
+        for feature in self.iter_features():
+            batch.append(feature)
+            if len(batch) == page_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     @property
     def df(self) -> "pd.DataFrame":
         """
@@ -76,9 +407,341 @@ class WFSResponse:
             Exception: If conversion fails.
         """
         if self._df is None:
-            self._df = json_to_df(self.json, fields=self.item.data.fields)
+            self._remember("_df", self.read_df())
         return self._df
 
+    def _is_parquet_file(self) -> bool:
+        return bool(self._data_file_path) and self._data_file_format in PARQUET_FORMATS
+
+    def _parquet_columns(self, columns: list[str] | None, geometry: bool) -> list[str] | None:
+        """Return the Parquet columns to read, with or without the geometry column."""
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(self._data_file_path).names
+        selected = [c for c in (columns or names) if c != GEOMETRY_COLUMN]
+        if geometry and GEOMETRY_COLUMN in names:
+            selected.append(GEOMETRY_COLUMN)
+        return selected
+
+    def read_df(
+        self, columns: list[str] | None = None, dtype_backend: str | None = None
+    ) -> "pd.DataFrame":
+        """
+        Convert the features to a Pandas DataFrame, optionally with only some columns.
+
+        For PARQUET mode responses only the requested columns are read from the file.
+        For COLUMNAR mode responses the accumulated columns are returned as they
+        are, without building any features. Unlike df, the result is not cached.
+
+        Parameters:
+            columns (list[str], optional): The attribute columns to include. Defaults to all.
+            dtype_backend (str, optional): "pyarrow" to build the DataFrame from
+                the arrow Table, with pandas ArrowDtype columns. Defaults to
+                the response's dtype_backend.
+
+        Returns:
+            pd.DataFrame: The features as a Pandas DataFrame.
+        """
+        if self._use_arrow_dtypes(dtype_backend):
+            import pandas as pd
+
+            return self._read_arrow(columns, geometry=False).to_pandas(
+                types_mapper=pd.ArrowDtype
+            )
+        if self._json is None and self._is_parquet_file():
+            return _read_parquet_table(
+                self._data_file_path, self._parquet_columns(columns, geometry=False)
+            ).to_pandas()
+        if self._json is None and self._columnar is not None:
+            df = self._columnar["attributes"]
+            return df if columns is None else df[columns]
+        df = json_to_df(self.json, fields=self.item.data.fields if self.item else None)
+        if columns is not None:
+            df = df[columns]
+        return df
+
+    def read_gdf(
+        self, columns: list[str] | None = None, dtype_backend: str | None = None
+    ) -> "gpd.GeoDataFrame":
+        """
+        Convert the features to a GeoPandas DataFrame, optionally with only some columns.
+
+        For PARQUET mode responses only the requested columns, plus the geometry,
+        are read from the file. Unlike gdf, the result is not cached.
+
+        Parameters:
+            columns (list[str], optional): The attribute columns to include. Defaults to all.
+            dtype_backend (str, optional): "pyarrow" to build the attribute
+                columns from the arrow Table as pandas ArrowDtype columns.
+                Defaults to the response's dtype_backend.
+
+        Returns:
+            gpd.GeoDataFrame: The features as a GeoPandas DataFrame.
+
+        Raises:
+            ValueError: If the geopandas package is not installed.
+        """
+        if not has_geopandas:
+            raise ValueError("Geopandas is not installed")
+
+        if self._use_arrow_dtypes(dtype_backend):
+            return self._arrow_gdf(columns)
+
+        if self._json is None and self._is_parquet_file():
+            import geopandas as gpd
+
+            if self._data_file_format == "GeoParquet":
+                return gpd.read_parquet(
+                    self._data_file_path,
+                    columns=self._parquet_columns(columns, geometry=True),
+                )
+            return gpd.GeoDataFrame(self.read_df(columns))
+        if self._json is None and self._columnar is not None:
+            return self._columnar_gdf(columns)
+        gdf = geojson_to_gdf(
+            self.json,
+            out_sr=self.out_sr,
+            fields=self.item.data.fields if self.item else None,
+        )
+        if columns is not None:
+            gdf = gdf[[c for c in columns if c != gdf.geometry.name] + [gdf.geometry.name]]
+        return gdf
+
+    def _arrow_gdf(self, columns: list[str] | None) -> "gpd.GeoDataFrame":
+        """Build a GeoDataFrame with ArrowDtype attribute columns from the arrow Table."""
+        return self._table_to_gdf(self._read_arrow(columns, geometry=True), arrow_dtypes=True)
+
+    def _table_to_gdf(self, table: "pa.Table", arrow_dtypes: bool) -> "gpd.GeoDataFrame":
+        """Convert an arrow Table with a WKB geometry column to a GeoDataFrame."""
+        import geopandas as gpd
+        import pandas as pd
+        import shapely
+
+        geometries = None
+        if GEOMETRY_COLUMN in table.column_names:
+            wkb = table.column(GEOMETRY_COLUMN).to_numpy(zero_copy_only=False)
+            geometries = shapely.from_wkb(wkb)
+            table = table.drop_columns([GEOMETRY_COLUMN])
+        return gpd.GeoDataFrame(
+            table.to_pandas(types_mapper=pd.ArrowDtype if arrow_dtypes else None),
+            geometry=geometries,
+            crs=self._crs if geometries is not None else None,
+        )
+
+    def _columnar_gdf(self, columns: list[str] | None) -> "gpd.GeoDataFrame":
+        """Wrap the COLUMNAR mode columns and WKB geometries in a GeoDataFrame."""
+        import geopandas as gpd
+        import shapely
+
+        wkb = self._columnar["geometry"]
+        geometries = shapely.from_wkb(wkb) if wkb is not None else [None] * self.total_features
+        return gpd.GeoDataFrame(
+            self.read_df(columns),
+            geometry=geometries,
+            crs=self._crs,
+        )
+
+    @property
+    def _crs(self) -> str | None:
+        return f"EPSG:{self.out_sr}" if self.out_sr else None
+
+    def _use_arrow_dtypes(self, dtype_backend: str | None) -> bool:
+        """Return whether to build frames with ArrowDtype columns."""
+        dtype_backend = dtype_backend or self.dtype_backend
+        if dtype_backend is None:
+            return False
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(
+                f"Invalid dtype_backend. Use one of: {', '.join(repr(b) for b in DTYPE_BACKENDS)}."
+            )
+        return True
+
+    @property
+    def arrow(self) -> "pa.Table":
+        """
+        Convert the features to a pyarrow Table.
+
+        Geometries are stored as WKB in a "geometry" column, tagged with the
+        GeoArrow "geoarrow.wkb" extension metadata and the CRS. For PARQUET
+        mode responses the table is read from the file, for COLUMNAR mode
+        responses it wraps the accumulated columns, and otherwise it is built
+        page by page from the features, using the item's field types.
+
+        Requires the pyarrow package to be installed.
+
+        Returns:
+            pa.Table: The features as a pyarrow Table.
+
+        Raises:
+            ValueError: If the pyarrow package is not installed.
+        """
+        if not has_pyarrow:
+            raise ValueError("Pyarrow is not installed")
+
+        if self._arrow is None:
+            self._remember("_arrow", self._build_arrow())
+        return self._arrow
+
+    def _build_arrow(self) -> "pa.Table":
+        """Build the arrow Table without caching it."""
+        if self._json is None and self._is_parquet_file():
+            table = _read_parquet_table(self._data_file_path)
+            return _with_geoarrow_geometry(table, self._crs)
+        if self._json is None and self._columnar is not None:
+            return _columnar_to_arrow(self._columnar, self._crs)
+        return _pages_to_arrow(
+            self.iter_pages(),
+            self.item.data.fields if self.item else None,
+            self._crs,
+        )
+
+    def _read_arrow(self, columns: list[str] | None, geometry: bool) -> "pa.Table":
+        """
+        Return the arrow Table with only the requested columns, plus the geometry.
+
+        The cached arrow Table is used if there is one, but a table built here
+        is not cached, so no other representation is evicted.
+        """
+        if not has_pyarrow:
+            raise ValueError("Pyarrow is not installed")
+
+        if self._arrow is None and self._json is None and self._is_parquet_file():
+            table = _read_parquet_table(
+                self._data_file_path, self._parquet_columns(columns, geometry)
+            )
+            return _with_geoarrow_geometry(table, self._crs)
+        table = self._arrow if self._arrow is not None else self._build_arrow()
+        names = [c for c in (columns or table.column_names) if c != GEOMETRY_COLUMN]
+        if geometry and GEOMETRY_COLUMN in table.column_names:
+            names.append(GEOMETRY_COLUMN)
+        return table.select(names)
+
+    def iter_df(self, chunksize: int = DEFAULT_FEATURES_PER_PAGE) -> Iterator["pd.DataFrame"]:
+        """
+        Convert the features to Pandas DataFrames of up to chunksize rows at a time.
+
+        The field types are applied to each chunk as for df, so a result that is
+        too large for one DataFrame can be processed in batches. For DISK and
+        NDJSON mode responses only one chunk of features is read from the file
+        at a time, and for PARQUET mode responses one batch of rows. Nothing is
+        cached. Categorical columns are decided per chunk.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows per DataFrame.
+
+        Yields:
+            pd.DataFrame: The next chunk of features. The index continues
+                from the previous chunk.
+        """
+        yield from self._iter_frames(chunksize, geometry=False)
+
+    def iter_gdf(self, chunksize: int = DEFAULT_FEATURES_PER_PAGE) -> Iterator["gpd.GeoDataFrame"]:
+        """
+        Convert the features to GeoPandas DataFrames of up to chunksize rows at a time.
+
+        Works as iter_df, with the geometry of each chunk. Requires the
+        geopandas package to be installed.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows per GeoDataFrame.
+
+        Yields:
+            gpd.GeoDataFrame: The next chunk of features. The index continues
+                from the previous chunk.
+
+        Raises:
+            ValueError: If the geopandas package is not installed.
+        """
+        if not has_geopandas:
+            raise ValueError("Geopandas is not installed")
+        yield from self._iter_frames(chunksize, geometry=True)
+
+    def _iter_frames(self, chunksize: int, geometry: bool) -> Iterator["pd.DataFrame"]:
+        """Yield the features as DataFrames, or GeoDataFrames, of up to chunksize rows."""
+        import pandas as pd
+
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer.")
+        arrow_dtypes = self._use_arrow_dtypes(None)
+        fields = self.item.data.fields if self.item else None
+
+        if self._json is None and self._is_parquet_file():
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(self._data_file_path)
+            batches = parquet_file.iter_batches(
+                batch_size=chunksize, columns=self._parquet_columns(None, geometry)
+            )
+            frames = (
+                self._table_to_frame(pa.Table.from_batches([batch]), geometry, arrow_dtypes)
+                for batch in batches
+            )
+        elif self._json is None and self._columnar is not None and not arrow_dtypes:
+            frames = self._iter_columnar_frames(chunksize, geometry)
+        elif self._json is None and self._columnar is not None:
+            import pyarrow as pa
+
+            frames = (
+                self._table_to_frame(pa.Table.from_batches([batch]), geometry, arrow_dtypes)
+                for batch in _columnar_to_arrow(self._columnar, self._crs).to_batches(
+                    max_chunksize=chunksize
+                )
+            )
+        elif arrow_dtypes:
+            frames = (
+                self._table_to_frame(_pages_to_arrow([page], fields, self._crs), geometry, True)
+                for page in self.iter_pages(page_size=chunksize)
+            )
+        elif geometry:
+            frames = (
+                geojson_to_gdf(page, out_sr=self.out_sr, fields=fields)
+                for page in self.iter_pages(page_size=chunksize)
+            )
+        else:
+            frames = (
+                json_to_df(page, fields=fields)
+                for page in self.iter_pages(page_size=chunksize)
+            )
+
+        start = 0
+        for frame in frames:
+            frame.index = pd.RangeIndex(start, start + len(frame))
+            start += len(frame)
+            yield frame
+
+    def _iter_columnar_frames(self, chunksize: int, geometry: bool) -> Iterator["pd.DataFrame"]:
+        """Yield slices of the COLUMNAR mode columns, with the geometries if requested."""
+        attributes = self._columnar["attributes"]
+        wkb = self._columnar["geometry"]
+        for start in range(0, len(attributes), chunksize):
+            end = start + chunksize
+            # Copy the slice, so that resetting its index leaves the columns untouched
+            chunk = attributes.iloc[start:end].copy()
+            if not geometry:
+                yield chunk
+                continue
+            import geopandas as gpd
+            import shapely
+
+            yield gpd.GeoDataFrame(
+                chunk,
+                geometry=shapely.from_wkb(wkb[start:end]) if wkb is not None else [None] * len(chunk),
+                crs=self._crs,
+            )
+
+    def _table_to_frame(
+        self, table: "pa.Table", geometry: bool, arrow_dtypes: bool
+    ) -> "pd.DataFrame":
+        """Convert an arrow Table to a GeoDataFrame, or to a DataFrame without the geometry."""
+        import pandas as pd
+
+        if geometry:
+            return self._table_to_gdf(table, arrow_dtypes)
+        if GEOMETRY_COLUMN in table.column_names:
+            table = table.drop_columns([GEOMETRY_COLUMN])
+        return table.to_pandas(types_mapper=pd.ArrowDtype if arrow_dtypes else None)
+
     @property
     def sdf(self) -> "pd.DataFrame":
         """
@@ -98,12 +761,13 @@ class WFSResponse:
             raise ValueError("Arcgis is not installed")
 
         if self._sdf is None:
-            self._sdf = geojson_to_sdf(
+            sdf = geojson_to_sdf(
                 self.json,
                 out_sr=self.out_sr,
                 geometry_type=self.item.data.geometry_type,
                 fields=self.item.data.fields,
             )
+            self._remember("_sdf", sdf)
         return self._sdf
 
     @property
@@ -122,10 +786,18 @@ class WFSResponse:
         """
 
         if not has_geopandas:
-            raise ValueError(f"Geopandas is not installed")
+            raise ValueError("Geopandas is not installed")
 
+        if self._gdf is None and (
+            self.dtype_backend is not None
+            or (self._json is None and (self._is_parquet_file() or self._columnar is not None))
+        ):
+            self._remember("_gdf", self.read_gdf())
         if self._gdf is None:
-            if self.json is not None:
+            if self._json is None and self.keep != "all" and self._data_file_path:
+                # Read the features without caching the json, which would be evicted anyway
+                j = self.read_features()
+            elif self.json is not None:
                 j = self.json
             elif self._json is None and self._data_file_path:
                 # this is a temporary implementation to read from file if json is not loaded
@@ -133,12 +805,17 @@ class WFSResponse:
                 # and the helper function loads directly from disk
                 # but at least this way the j variable goes out of scope after this block
                 # and is garbage collected
-                with open(self._data_file_path, "r", encoding="utf-8") as f:
-                    j = json.load(f)
+                with open(self._data_file_path, "rb") as f:
+                    j = json_codec.loads(f.read())
             else:
                 raise ValueError("No GeoJSON data available for conversion to GeoDataFrame")
-            self._gdf = geojson_to_gdf(
-                j, out_sr=self.out_sr, fields=self.item.data.fields
+            self._remember(
+                "_gdf",
+                geojson_to_gdf(
+                    j,
+                    out_sr=self.out_sr,
+                    fields=self.item.data.fields if self.item else None,
+                ),
             )
         return self._gdf
 
@@ -0,0 +1,1229 @@
+"""
+Sinks for WFS downloads.
+
+Each sink is a page cache with the same interface as the DISK and MEMORY
+caches in wfs_utils: add_page is called with each page of decoded GeoJSON as
+it arrives, and close returns the response details. The file sinks write
+features out page by page, so memory use is bounded by the page size. The
+columnar sink keeps the result in memory, but as typed columns rather than
+feature dicts.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import struct
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+import shapefile
+import shapely
+from shapely.geometry import mapping
+
+from .conversion import (
+    FIELD_TYPE_KINDS,
+    field_type_kind,
+    _field_name_type,
+    _string_dtype,
+    _typed_column,
+    geojson_geometries_to_array,
+)
+from .gis import has_pyarrow
+
+logger = logging.getLogger(__name__)
+
+GEOMETRY_COLUMN = "geometry"
+# Arrow field metadata holding the property name of a renamed column
+_PROPERTY_NAME_KEY = b"kapipy:property"
+
+
+def _sink_columns(
+    fields: list, features: list[dict]
+) -> tuple[list[tuple[str, str | None]], bool]:
+    """
+    Return the attribute columns for a sink, and whether the item has geometry.
+
+    Columns are taken from the item's fields, in order, skipping any that are
+    missing from the first page because they were left out of the query with
+    out_fields. Properties of the first page that are not in fields are added
+    at the end with a type of None, for the sink to infer. Properties that
+    first appear on a later page are not written; the sinks log them with
+    _log_dropped_properties. Without fields, the item has geometry if any
+    feature of the first page has one.
+    """
+    page_names = []
+    for feature in features:
+        for name in feature.get("properties") or {}:
+            if name not in page_names:
+                page_names.append(name)
+
+    columns = []
+    known_names = set()
+    has_geometry = False
+    for field in fields or []:
+        name, field_type = _field_name_type(field)
+        if field_type == "geometry":
+            has_geometry = True
+            continue
+        known_names.add(name)
+        if features and name not in page_names:
+            continue
+        columns.append((name, field_type))
+
+    columns.extend((name, None) for name in page_names if name not in known_names)
+    if not fields:
+        has_geometry = any(f.get("geometry") for f in features)
+    return columns, has_geometry
+
+
+def _log_dropped_properties(features: list[dict], columns: set, dropped: set) -> None:
+    """
+    Log each property of a page that is not one of the sink's columns, once.
+
+    The columns are fixed from the fields and the first page, so a property
+    that first appears on a later page and is not in fields is not written.
+
+    Parameters:
+        features (list[dict]): The page of features.
+        columns (set): The property names the sink writes.
+        dropped (set): The property names already logged, updated in place.
+    """
+    names = set()
+    for feature in features:
+        names.update(feature.get("properties") or {})
+    for name in sorted(names - columns - dropped):
+        logger.warning(
+            f"Property '{name}' is not in the item's fields or the first page; it is dropped."
+        )
+        dropped.add(name)
+
+
+def _attribute_column_names(names: list[str]) -> list[str]:
+    """
+    Return the column name for each property next to a "geometry" column.
+
+    A property called "geometry" would collide with the WKB geometry column,
+    so it is given a numbered suffix, as for GeoPackage columns.
+    """
+    columns = []
+    for name in names:
+        column, suffix = name, 0
+        while column == GEOMETRY_COLUMN or (column != name and column in names):
+            suffix += 1
+            column = f"{name}_{suffix}"
+        if column != name:
+            logger.warning(
+                f"Property '{name}' collides with the geometry column; renamed to '{column}'."
+            )
+        columns.append(column)
+    return columns
+
+
+def _page_geometries(features: list[dict]) -> np.ndarray:
+    """Return the shapely geometries of a page of features, None where missing."""
+    return geojson_geometries_to_array([f.get("geometry") for f in features])
+
+
+# --- GeoParquet ---
+def _arrow_type(field_type: str) -> "pa.DataType":
+    """Return the Arrow type for a field type, by its kind in FIELD_TYPE_KINDS."""
+    import pyarrow as pa
+
+    kind = field_type_kind(field_type)
+    if kind in ("integer", "bigint"):
+        # A fixed schema cannot fall back to 64 bits per page, as pandas can
+        return pa.int64()
+    if kind == "float32":
+        return pa.float32()
+    if kind == "float64":
+        return pa.float64()
+    if kind == "boolean":
+        return pa.bool_()
+    # Dates are kept as the ISO 8601 strings returned by the WFS service
+    return pa.string()
+
+
+def _arrow_array(values: list, arrow_type: "pa.DataType") -> "pa.Array":
+    import pyarrow as pa
+
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        if arrow_type != pa.string():
+            raise
+        return pa.array(
+            [None if v is None else str(v) for v in values], type=arrow_type
+        )
+
+
+def _arrow_schema(fields: list, features: list[dict]) -> tuple["pa.Schema", bool]:
+    """
+    Return the Arrow schema for the item's fields and the first page of features.
+
+    Field types are mapped with _arrow_type, and properties that are not in
+    fields are inferred from the first page. A binary "geometry" column is
+    added at the end if the item has geometry. Also returns whether it has.
+    A property called "geometry" is renamed, with its property name kept in
+    the field metadata.
+    """
+    import pyarrow as pa
+
+    sink_columns, has_geometry = _sink_columns(fields, features)
+    column_names = _attribute_column_names([name for name, _ in sink_columns])
+    columns = []
+    for (name, field_type), column_name in zip(sink_columns, column_names):
+        if field_type is None:
+            arrow_type = pa.array(
+                [(f.get("properties") or {}).get(name) for f in features]
+            ).type
+            if pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+        else:
+            arrow_type = _arrow_type(field_type)
+        metadata = {_PROPERTY_NAME_KEY: name.encode("utf-8")} if column_name != name else None
+        columns.append(pa.field(column_name, arrow_type, metadata=metadata))
+    if has_geometry:
+        columns.append(pa.field(GEOMETRY_COLUMN, pa.binary()))
+    return pa.schema(columns), has_geometry
+
+
+def _arrow_property_name(column: "pa.Field") -> str:
+    """Return the property name of an Arrow column from _arrow_schema."""
+    if column.metadata and _PROPERTY_NAME_KEY in column.metadata:
+        return column.metadata[_PROPERTY_NAME_KEY].decode("utf-8")
+    return column.name
+
+
+def _arrow_property_names(schema: "pa.Schema") -> set:
+    """Return the property names of the attribute columns of a schema from _arrow_schema."""
+    return {_arrow_property_name(c) for c in schema if c.name != GEOMETRY_COLUMN}
+
+
+def _arrow_page_table(schema: "pa.Schema", features: list[dict]) -> "pa.Table":
+    """Convert a page of features to an Arrow table, with geometries as WKB."""
+    import pyarrow as pa
+
+    properties = [f.get("properties") or {} for f in features]
+    arrays = []
+    for column in schema:
+        if column.name == GEOMETRY_COLUMN:
+            wkb = shapely.to_wkb(_page_geometries(features))
+            arrays.append(pa.array(wkb, type=pa.binary()))
+        else:
+            name = _arrow_property_name(column)
+            arrays.append(_arrow_array([p.get(name) for p in properties], column.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _geoarrow_field(srs_name: str | None) -> "pa.Field":
+    """Return the WKB geometry column field, tagged as a GeoArrow extension type."""
+    import pyarrow as pa
+
+    extension = {}
+    if srs_name:
+        from pyproj import CRS
+
+        extension["crs"] = CRS.from_user_input(srs_name).to_json_dict()
+    return pa.field(
+        GEOMETRY_COLUMN,
+        pa.binary(),
+        metadata={
+            b"ARROW:extension:name": b"geoarrow.wkb",
+            b"ARROW:extension:metadata": json.dumps(extension).encode("utf-8"),
+        },
+    )
+
+
+def _with_geoarrow_geometry(table: "pa.Table", srs_name: str | None) -> "pa.Table":
+    """Tag the WKB geometry column of a table as GeoArrow, if it has one."""
+    index = table.schema.get_field_index(GEOMETRY_COLUMN)
+    if index == -1:
+        return table
+    return table.set_column(index, _geoarrow_field(srs_name), table.column(index))
+
+
+def _pages_to_arrow(
+    pages: Iterator[list[dict]], fields: list | None, srs_name: str | None
+) -> "pa.Table":
+    """
+    Build one Arrow table from pages of GeoJSON features.
+
+    The schema is fixed from the fields and the first page, as for the
+    PARQUET sink. Each page is converted to a table as it is read, so the
+    features are not all held as dicts at the same time.
+    """
+    import pyarrow as pa
+
+    schema = None
+    tables = []
+    dropped = set()
+    for page in pages:
+        if schema is None:
+            schema, _ = _arrow_schema(fields, page)
+            properties = _arrow_property_names(schema)
+        else:
+            _log_dropped_properties(page, properties, dropped)
+        tables.append(_arrow_page_table(schema, page))
+    if schema is None:
+        schema, _ = _arrow_schema(fields, [])
+    table = pa.concat_tables(tables) if tables else schema.empty_table()
+    return _with_geoarrow_geometry(table, srs_name)
+
+
+def _columnar_to_arrow(columnar: dict, srs_name: str | None) -> "pa.Table":
+    """Build an Arrow table from the columns of a COLUMNAR mode result."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(columnar["attributes"], preserve_index=False)
+    if columnar["geometry"] is not None:
+        table = table.append_column(
+            _geoarrow_field(srs_name), pa.array(columnar["geometry"], type=pa.binary())
+        )
+    return table
+
+
+class _ParquetCache:
+    """
+    Stream pages of features to a GeoParquet file.
+
+    Each page is converted to a columnar batch and appended as one Parquet
+    row group. Geometries are stored as WKB in a "geometry" column, described
+    by GeoParquet metadata. The column types come from the item's fields
+    where they are known, otherwise they are inferred from the first page.
+    """
+
+    checkpoint = None
+    accepts_raw_pages = False
+
+    def __init__(
+        self,
+        temp_file_path: str,
+        fields: list | None = None,
+        srs_name: str | None = None,
+    ):
+        if not has_pyarrow:
+            raise ValueError("pyarrow must be installed to use the 'PARQUET' cache_mode.")
+        os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+        self.file_path = temp_file_path
+        self.fields = fields or []
+        self.srs_name = srs_name
+        self.total_features = 0
+        self.has_geometry = False
+        self._schema = None
+        self._writer = None
+        self._dropped = set()
+
+    @property
+    def file_format(self) -> str:
+        return "GeoParquet" if self.has_geometry else "Parquet"
+
+    def _geo_metadata(self) -> dict:
+        column = {"encoding": "WKB", "geometry_types": []}
+        if self.srs_name:
+            from pyproj import CRS
+
+            column["crs"] = CRS.from_user_input(self.srs_name).to_json_dict()
+        return {
+            "version": "1.0.0",
+            "primary_column": GEOMETRY_COLUMN,
+            "columns": {GEOMETRY_COLUMN: column},
+        }
+
+    def _open_writer(self, features: list[dict]) -> None:
+        """Fix the schema from the fields and the first page, and open the file."""
+        import pyarrow.parquet as pq
+
+        self._schema, self.has_geometry = _arrow_schema(self.fields, features)
+        if self.has_geometry:
+            self._schema = self._schema.with_metadata(
+                {b"geo": json.dumps(self._geo_metadata()).encode("utf-8")}
+            )
+        self._writer = pq.ParquetWriter(self.file_path, self._schema)
+
+    def add_page(self, page_data: dict) -> None:
+        features = page_data.get("features", [])
+        if self._writer is None:
+            self._open_writer(features)
+        else:
+            _log_dropped_properties(features, _arrow_property_names(self._schema), self._dropped)
+        if not features:
+            return
+
+        self._writer.write_table(_arrow_page_table(self._schema, features))
+        self.total_features += len(features)
+        logger.debug(f"Written {self.total_features} features so far...")
+
+    def close(self) -> dict:
+        if self._writer is None:
+            self._open_writer([])
+        self._writer.close()
+        return {
+            "file_path": os.path.abspath(self.file_path),
+            "file_format": self.file_format,
+            "totalFeatures": self.total_features,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _iter_parquet_features(file_path: str, batch_size: int = 10000) -> Iterator[dict]:
+    """Yield the rows of a file written by _ParquetCache as GeoJSON features."""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        rows = batch.to_pylist()
+        if GEOMETRY_COLUMN in batch.schema.names:
+            wkb = np.array([row.pop(GEOMETRY_COLUMN) for row in rows], dtype=object)
+            geometries = [
+                None if geom is None else mapping(geom)
+                for geom in shapely.from_wkb(wkb)
+            ]
+        else:
+            geometries = [None] * len(rows)
+        for properties, geometry in zip(rows, geometries):
+            yield {"type": "Feature", "geometry": geometry, "properties": properties}
+
+
+def _read_parquet_table(file_path: str, columns: list[str] | None = None) -> "pa.Table":
+    """Read a file written by _ParquetCache, optionally only some of its columns."""
+    import pyarrow.parquet as pq
+
+    return pq.read_table(file_path, columns=columns)
+
+
+# --- Shapefile ---
+_GEOJSON_SHAPE_TYPES = {
+    "Point": shapefile.POINT,
+    "MultiPoint": shapefile.MULTIPOINT,
+    "LineString": shapefile.POLYLINE,
+    "MultiLineString": shapefile.POLYLINE,
+    "Polygon": shapefile.POLYGON,
+    "MultiPolygon": shapefile.POLYGON,
+}
+DBF_FIELD_NAME_LENGTH = 10
+# The .shp and .dbf files of a shapefile are each limited to 2 GB
+SHAPEFILE_MAX_BYTES = 2 * 1024**3
+
+
+def _shapefile_shape_type(geometry_types: set) -> int:
+    """
+    Return the shape type for the geometry types of the first page.
+
+    A shapefile holds one shape type. Point and MultiPoint together are
+    written as MULTIPOINT; other mixtures cannot be written.
+
+    Raises:
+        ValueError: If the geometry types cannot be written to one shapefile.
+    """
+    shape_types = set()
+    for geometry_type in geometry_types:
+        shape_type = _GEOJSON_SHAPE_TYPES.get(geometry_type, shapefile.NULL)
+        if shape_type == shapefile.NULL:
+            raise ValueError(
+                f"Geometry type '{geometry_type}' cannot be written to a shapefile."
+            )
+        shape_types.add(shape_type)
+    if shape_types == {shapefile.POINT, shapefile.MULTIPOINT}:
+        return shapefile.MULTIPOINT
+    if len(shape_types) > 1:
+        raise ValueError(
+            f"A shapefile holds one geometry type, but the data has: "
+            f"{', '.join(sorted(geometry_types))}. Use the GPKG or PARQUET cache_mode instead."
+        )
+    return shape_types.pop() if shape_types else shapefile.NULL
+
+
+def _dbf_field(field_type: str | None, values: list) -> tuple[str, int, int]:
+    """
+    Return the DBF field type, size and decimal places for a field type, by
+    its kind in FIELD_TYPE_KINDS. Without a field type, the kind is inferred
+    from the first non-null value of the first page.
+    """
+    kind = field_type_kind(field_type, values)
+    if kind in ("integer", "bigint"):
+        return "N", 18, 0
+    if kind in ("float32", "float64"):
+        return "F", 19, 11
+    if kind == "boolean":
+        return "L", 1, 0
+    if kind == "date":
+        return "D", 8, 0
+    return "C", 254, 0
+
+
+def _dbf_field_names(names: list[str]) -> list[str]:
+    """Truncate field names to the DBF limit of 10 characters, keeping them unique."""
+    dbf_names = []
+    for name in names:
+        dbf_name = name[:DBF_FIELD_NAME_LENGTH]
+        suffix = 1
+        while dbf_name.lower() in (n.lower() for n in dbf_names):
+            tag = f"_{suffix}"
+            dbf_name = f"{name[: DBF_FIELD_NAME_LENGTH - len(tag)]}{tag}"
+            suffix += 1
+        dbf_names.append(dbf_name)
+    return dbf_names
+
+
+def _dbf_value(value: Any, dbf_type: str) -> Any:
+    if value is None:
+        return None
+    if dbf_type == "D" and isinstance(value, str):
+        # ISO 8601 date or datetime strings; DBF dates have no time part
+        return value[:10].replace("-", "")
+    if dbf_type == "C" and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+class _ShapefileCache:
+    """
+    Stream pages of features to an ESRI Shapefile with pyshp.
+
+    The shape type is taken from the geometries of the first page, and the
+    DBF schema from the item's fields where they are known, otherwise it is
+    inferred from the first page. Points are written as MULTIPOINT if the
+    first page also has MultiPoints. A later page with a geometry type that
+    does not fit the shape type raises a ValueError before any of it is
+    written. So does going past the 2 GB limit of the .shp or .dbf file.
+    Field names longer than 10 characters are truncated. A .prj file is
+    written for the output srsName and a .cpg file declares the UTF-8
+    encoding of the DBF.
+    """
+
+    checkpoint = None
+    accepts_raw_pages = False
+    file_format = "Shapefile"
+    max_file_bytes = SHAPEFILE_MAX_BYTES
+
+    def __init__(
+        self,
+        temp_file_path: str,
+        fields: list | None = None,
+        srs_name: str | None = None,
+    ):
+        os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+        self.file_path = temp_file_path
+        self.fields = fields or []
+        self.srs_name = srs_name
+        self.total_features = 0
+        self._columns = None
+        self._writer = None
+        self._dropped = set()
+
+    @property
+    def _base_path(self) -> str:
+        return os.path.splitext(self.file_path)[0]
+
+    def _open_writer(self, features: list[dict]) -> None:
+        """Fix the shape type and DBF schema from the first page, and open the files."""
+        sink_columns, _ = _sink_columns(self.fields, features)
+        shape_type = _shapefile_shape_type(
+            {f["geometry"]["type"] for f in features if f.get("geometry")}
+        )
+
+        self._writer = shapefile.Writer(
+            self._base_path, shapeType=shape_type, encoding="utf-8"
+        )
+        self._columns = []
+        dbf_names = _dbf_field_names([name for name, _ in sink_columns])
+        for (name, field_type), dbf_name in zip(sink_columns, dbf_names):
+            values = [(f.get("properties") or {}).get(name) for f in features]
+            dbf_type, size, decimal = _dbf_field(field_type, values)
+            self._writer.field(dbf_name, dbf_type, size, decimal)
+            self._columns.append((name, dbf_type))
+
+    def add_page(self, page_data: dict) -> None:
+        features = page_data.get("features", [])
+        if self._writer is None:
+            self._open_writer(features)
+        else:
+            columns = {name for name, _ in self._columns}
+            _log_dropped_properties(features, columns, self._dropped)
+            self._check_geometry_types(features)
+
+        shape_type = self._writer.shapeType
+        for feature in features:
+            geometry = feature.get("geometry")
+            if not geometry:
+                self._writer.null()
+            elif geometry["type"] == "Point" and shape_type == shapefile.MULTIPOINT:
+                self._writer.shape({"type": "MultiPoint", "coordinates": [geometry["coordinates"]]})
+            else:
+                self._writer.shape(geometry)
+            properties = feature.get("properties") or {}
+            self._writer.record(
+                *[_dbf_value(properties.get(name), t) for name, t in self._columns]
+            )
+        self.total_features += len(features)
+        self._check_file_sizes()
+        logger.debug(f"Written {self.total_features} features so far...")
+
+    def _check_geometry_types(self, features: list[dict]) -> None:
+        """Raise a ValueError if a later page has geometries that do not fit the shape type."""
+        shape_type = self._writer.shapeType
+        for geometry_type in {f["geometry"]["type"] for f in features if f.get("geometry")}:
+            page_shape_type = _GEOJSON_SHAPE_TYPES.get(geometry_type)
+            if page_shape_type == shape_type or (
+                page_shape_type == shapefile.POINT and shape_type == shapefile.MULTIPOINT
+            ):
+                continue
+            raise ValueError(
+                f"Geometry type '{geometry_type}' cannot be written to this "
+                f"{shapefile.SHAPETYPE_LOOKUP[shape_type]} shapefile, whose shape type was "
+                f"set by the first page. Use the GPKG or PARQUET cache_mode instead."
+            )
+
+    def _check_file_sizes(self) -> None:
+        """Raise a ValueError once the .shp or .dbf file is past the shapefile size limit."""
+        for extension in (".shp", ".dbf"):
+            file_path = f"{self._base_path}{extension}"
+            if os.path.exists(file_path) and os.path.getsize(file_path) > self.max_file_bytes:
+                raise ValueError(
+                    f"The {extension} file is larger than the shapefile limit of "
+                    f"{self.max_file_bytes} bytes. Use the GPKG or PARQUET cache_mode instead."
+                )
+
+    def _write_sidecars(self) -> None:
+        with open(f"{self._base_path}.cpg", "w", encoding="utf-8") as f:
+            f.write("UTF-8")
+        if self.srs_name:
+            from pyproj import CRS
+            from pyproj.enums import WktVersion
+
+            wkt = CRS.from_user_input(self.srs_name).to_wkt(WktVersion.WKT1_ESRI)
+            with open(f"{self._base_path}.prj", "w", encoding="utf-8") as f:
+                f.write(wkt)
+
+    def close(self) -> dict:
+        if self._writer is None:
+            self._open_writer([])
+        self._writer.close()
+        self._write_sidecars()
+        return {
+            "file_path": os.path.abspath(f"{self._base_path}.shp"),
+            "file_format": self.file_format,
+            "totalFeatures": self.total_features,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _iter_shapefile_features(file_path: str) -> Iterator[dict]:
+    """Yield the records of a shapefile as GeoJSON features."""
+    with shapefile.Reader(file_path, encoding="utf-8") as reader:
+        for shape_record in reader.iterShapeRecords():
+            yield shape_record.__geo_interface__
+
+
+# --- GeoPackage ---
+GPKG_APPLICATION_ID = 0x47504B47  # "GPKG"
+GPKG_USER_VERSION = 10300
+GPKG_GEOMETRY_COLUMN = "geom"
+_GPKG_HEADER = struct.Struct("<2sBBi4d")
+# Flags: little endian, with an [minx, maxx, miny, maxy] envelope
+_GPKG_FLAGS = 0b00000011
+
+_GPKG_CORE_TABLES = """
+CREATE TABLE gpkg_spatial_ref_sys (
+    srs_name TEXT NOT NULL,
+    srs_id INTEGER NOT NULL PRIMARY KEY,
+    organization TEXT NOT NULL,
+    organization_coordsys_id INTEGER NOT NULL,
+    definition TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE gpkg_contents (
+    table_name TEXT NOT NULL PRIMARY KEY,
+    data_type TEXT NOT NULL,
+    identifier TEXT UNIQUE,
+    description TEXT DEFAULT '',
+    last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+    min_x DOUBLE,
+    min_y DOUBLE,
+    max_x DOUBLE,
+    max_y DOUBLE,
+    srs_id INTEGER,
+    CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id)
+);
+CREATE TABLE gpkg_geometry_columns (
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    geometry_type_name TEXT NOT NULL,
+    srs_id INTEGER NOT NULL,
+    z TINYINT NOT NULL,
+    m TINYINT NOT NULL,
+    CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+    CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+    CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id)
+);
+CREATE TABLE gpkg_extensions (
+    table_name TEXT,
+    column_name TEXT,
+    extension_name TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name)
+);
+INSERT INTO gpkg_spatial_ref_sys VALUES (
+    'Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', 'undefined cartesian coordinate reference system'
+);
+INSERT INTO gpkg_spatial_ref_sys VALUES (
+    'Undefined geographic SRS', 0, 'NONE', 0, 'undefined', 'undefined geographic coordinate reference system'
+);
+INSERT INTO gpkg_spatial_ref_sys VALUES (
+    'WGS 84 geodetic', 4326, 'EPSG', 4326,
+    'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],AUTHORITY["EPSG","4326"]]',
+    'longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid'
+);
+"""
+
+# The schema extension tables, used to record the original name of a renamed column
+_GPKG_SCHEMA_TABLES = """
+CREATE TABLE gpkg_data_columns (
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    name TEXT,
+    title TEXT,
+    description TEXT,
+    mime_type TEXT,
+    constraint_name TEXT,
+    CONSTRAINT pk_gdc PRIMARY KEY (table_name, column_name),
+    CONSTRAINT gdc_tn UNIQUE (table_name, name)
+);
+CREATE TABLE gpkg_data_column_constraints (
+    constraint_name TEXT NOT NULL,
+    constraint_type TEXT NOT NULL,
+    value TEXT,
+    min NUMERIC,
+    min_is_inclusive BOOLEAN,
+    max NUMERIC,
+    max_is_inclusive BOOLEAN,
+    description TEXT,
+    CONSTRAINT gdcc_ntv UNIQUE (constraint_name, constraint_type, value)
+);
+INSERT INTO gpkg_extensions VALUES (
+    'gpkg_data_columns', NULL, 'gpkg_schema', 'http://www.geopackage.org/spec/#extension_schema', 'read-write'
+);
+INSERT INTO gpkg_extensions VALUES (
+    'gpkg_data_column_constraints', NULL, 'gpkg_schema', 'http://www.geopackage.org/spec/#extension_schema', 'read-write'
+);
+"""
+
+# The R-tree maintenance triggers from the GeoPackage 1.3 specification
+_GPKG_RTREE_TRIGGERS = """
+CREATE TRIGGER "rtree_{t}_{c}_insert" AFTER INSERT ON "{t}"
+WHEN (new."{c}" NOT NULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "rtree_{t}_{c}_update1" AFTER UPDATE OF "{c}" ON "{t}"
+WHEN OLD."{i}" = NEW."{i}" AND (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "rtree_{t}_{c}_update2" AFTER UPDATE OF "{c}" ON "{t}"
+WHEN OLD."{i}" = NEW."{i}" AND (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+END;
+CREATE TRIGGER "rtree_{t}_{c}_update3" AFTER UPDATE ON "{t}"
+WHEN OLD."{i}" != NEW."{i}" AND (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+  INSERT OR REPLACE INTO "rtree_{t}_{c}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "rtree_{t}_{c}_update4" AFTER UPDATE ON "{t}"
+WHEN OLD."{i}" != NEW."{i}" AND (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "rtree_{t}_{c}" WHERE id IN (OLD."{i}", NEW."{i}");
+END;
+CREATE TRIGGER "rtree_{t}_{c}_delete" AFTER DELETE ON "{t}"
+WHEN old."{c}" NOT NULL
+BEGIN
+  DELETE FROM "rtree_{t}_{c}" WHERE id = OLD."{i}";
+END;
+"""
+
+
+def _gpkg_column_type(field_type: str | None, values: list) -> str:
+    """
+    Return the GeoPackage column type for a field type, by its kind in
+    FIELD_TYPE_KINDS. Without a field type, the kind is inferred from the
+    first non-null value of the first page. Date fields are DATE columns,
+    and datetime and timestamp fields DATETIME columns.
+    """
+    kind = field_type_kind(field_type, values)
+    if kind in ("integer", "bigint"):
+        return "INTEGER"
+    if kind == "float32":
+        return "FLOAT"
+    if kind == "float64":
+        return "DOUBLE"
+    if kind == "boolean":
+        return "BOOLEAN"
+    if kind == "date":
+        return "DATE" if field_type.lower() == "date" else "DATETIME"
+    return "TEXT"
+
+
+def _gpkg_geometry_blobs(features: list[dict], srs_id: int) -> list[bytes | None]:
+    """Encode the geometries of a page as GeoPackage binary blobs."""
+    geometries = _page_geometries(features)
+    wkb = shapely.to_wkb(geometries, byte_order=1)
+    bounds = shapely.bounds(geometries)
+    blobs = []
+    for geometry_wkb, (minx, miny, maxx, maxy) in zip(wkb, bounds):
+        if geometry_wkb is None:
+            blobs.append(None)
+            continue
+        header = _GPKG_HEADER.pack(b"GP", 0, _GPKG_FLAGS, srs_id, minx, maxx, miny, maxy)
+        blobs.append(header + geometry_wkb)
+    return blobs
+
+
+def _gpkg_envelope(blob: bytes | None) -> tuple | None:
+    """Return the (minx, maxx, miny, maxy) envelope from a GeoPackage binary header."""
+    if blob is None:
+        return None
+    envelope = _GPKG_HEADER.unpack_from(blob)[4:]
+    if any(math.isnan(v) for v in envelope):
+        return None
+    return envelope
+
+
+def _gpkg_header_size(blob: bytes) -> int:
+    """Return the length of a GeoPackage binary header, from its envelope flags."""
+    envelope_doubles = {0: 0, 1: 4, 2: 6, 3: 6, 4: 8}[(blob[3] >> 1) & 0b111]
+    return 8 + 8 * envelope_doubles
+
+
+def _register_gpkg_functions(connection: sqlite3.Connection) -> None:
+    """Register the envelope functions used by the R-tree triggers."""
+    for name, index in (("ST_MinX", 0), ("ST_MaxX", 1), ("ST_MinY", 2), ("ST_MaxY", 3)):
+        connection.create_function(
+            name,
+            1,
+            lambda blob, i=index: (_gpkg_envelope(blob) or (None,) * 4)[i],
+            deterministic=True,
+        )
+    connection.create_function(
+        "ST_IsEmpty", 1, lambda blob: int(_gpkg_envelope(blob) is None), deterministic=True
+    )
+
+
+def _gpkg_identifier(name: str) -> str:
+    """Return a name that is safe to use as a quoted SQLite identifier."""
+    return re.sub(r"[^0-9A-Za-z_]", "_", name) or "features"
+
+
+def _gpkg_column_names(names: list[str]) -> list[str]:
+    """
+    Return a unique SQLite column name for each property name.
+
+    Names are made safe with _gpkg_identifier. One that matches the fid or
+    geometry column, or an earlier column, is given a numbered suffix.
+    SQLite column names are compared case insensitively.
+    """
+    used = {"fid", GPKG_GEOMETRY_COLUMN.lower()}
+    columns = []
+    for name in names:
+        base = _gpkg_identifier(name)
+        column, suffix = base, 0
+        while column.lower() in used:
+            suffix += 1
+            column = f"{base}_{suffix}"
+        used.add(column.lower())
+        columns.append(column)
+    return columns
+
+
+class _GeoPackageCache:
+    """
+    Stream pages of features to a GeoPackage with the standard library sqlite3.
+
+    No GDAL is needed. The feature table is created from the item's fields
+    (or inferred from the first page), and each page is inserted with one
+    executemany call and committed as one transaction. Geometries are
+    encoded as GeoPackage binary: a header with the srs_id and envelope,
+    followed by little endian WKB. The R-tree spatial index and the layer
+    extent are built once, after the last page.
+    """
+
+    checkpoint = None
+    accepts_raw_pages = False
+    file_format = "GeoPackage"
+
+    def __init__(
+        self,
+        temp_file_path: str,
+        fields: list | None = None,
+        srs_name: str | None = None,
+    ):
+        os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        self.file_path = temp_file_path
+        self.fields = fields or []
+        self.srs_name = srs_name
+        self.total_features = 0
+        self.table_name = _gpkg_identifier(
+            os.path.splitext(os.path.basename(temp_file_path))[0]
+        )
+        self.has_geometry = False
+        self.srs_id = -1
+        self._columns = None
+        self._insert_sql = None
+        self._dropped = set()
+        self._connection = sqlite3.connect(temp_file_path)
+        self._connection.execute(f"PRAGMA application_id = {GPKG_APPLICATION_ID}")
+        self._connection.execute(f"PRAGMA user_version = {GPKG_USER_VERSION}")
+        with self._connection:
+            self._connection.executescript(_GPKG_CORE_TABLES)
+
+    def _register_srs(self) -> None:
+        if not self.srs_name:
+            return
+        from pyproj import CRS
+        from pyproj.enums import WktVersion
+
+        crs = CRS.from_user_input(self.srs_name)
+        authority = crs.to_authority() or ("NONE", None)
+        if authority[1] is None:
+            return
+        self.srs_id = int(authority[1])
+        self._connection.execute(
+            "INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                crs.name,
+                self.srs_id,
+                authority[0],
+                self.srs_id,
+                crs.to_wkt(WktVersion.WKT1_GDAL),
+                None,
+            ),
+        )
+
+    def _create_table(self, features: list[dict]) -> None:
+        """Create the feature table from the fields and the first page."""
+        sink_columns, self.has_geometry = _sink_columns(self.fields, features)
+        self._columns = [name for name, _ in sink_columns]
+        table_columns = _gpkg_column_names(self._columns)
+        column_sql = ['"fid" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL']
+        if self.has_geometry:
+            column_sql.append(f'"{GPKG_GEOMETRY_COLUMN}" BLOB')
+        for (name, field_type), column in zip(sink_columns, table_columns):
+            values = [(f.get("properties") or {}).get(name) for f in features]
+            column_sql.append(f'"{column}" {_gpkg_column_type(field_type, values)}')
+
+        insert_columns = list(table_columns)
+        if self.has_geometry:
+            insert_columns.insert(0, GPKG_GEOMETRY_COLUMN)
+        placeholders = ", ".join("?" for _ in insert_columns)
+        quoted = ", ".join(f'"{c}"' for c in insert_columns)
+        self._insert_sql = f'INSERT INTO "{self.table_name}" ({quoted}) VALUES ({placeholders})'
+
+        with self._connection:
+            self._register_srs()
+            self._connection.execute(
+                f'CREATE TABLE "{self.table_name}" ({", ".join(column_sql)})'
+            )
+            renamed = [
+                (self.table_name, column, name)
+                for name, column in zip(self._columns, table_columns)
+                if column != name
+            ]
+            if renamed:
+                # Keep the property names that could not be used as column names
+                self._connection.executescript(_GPKG_SCHEMA_TABLES)
+                self._connection.executemany(
+                    "INSERT INTO gpkg_data_columns (table_name, column_name, name) "
+                    "VALUES (?, ?, ?)",
+                    renamed,
+                )
+            self._connection.execute(
+                "INSERT INTO gpkg_contents (table_name, data_type, identifier, srs_id) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    self.table_name,
+                    "features" if self.has_geometry else "attributes",
+                    self.table_name,
+                    self.srs_id if self.has_geometry else None,
+                ),
+            )
+            if self.has_geometry:
+                geometry_types = {
+                    f["geometry"]["type"] for f in features if f.get("geometry")
+                }
+                geometry_type_name = (
+                    geometry_types.pop().upper() if len(geometry_types) == 1 else "GEOMETRY"
+                )
+                self._connection.execute(
+                    "INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.table_name,
+                        GPKG_GEOMETRY_COLUMN,
+                        geometry_type_name,
+                        self.srs_id,
+                        2,  # z values are optional
+                        0,
+                    ),
+                )
+
+    def add_page(self, page_data: dict) -> None:
+        features = page_data.get("features", [])
+        if self._insert_sql is None:
+            self._create_table(features)
+        else:
+            _log_dropped_properties(features, set(self._columns), self._dropped)
+        if not features:
+            return
+
+        rows = [
+            [(f.get("properties") or {}).get(name) for name in self._columns]
+            for f in features
+        ]
+        for row in rows:
+            for i, value in enumerate(row):
+                if isinstance(value, (dict, list)):
+                    row[i] = json.dumps(value)
+        if self.has_geometry:
+            for row, blob in zip(rows, _gpkg_geometry_blobs(features, self.srs_id)):
+                row.insert(0, blob)
+
+        with self._connection:
+            self._connection.executemany(self._insert_sql, rows)
+        self.total_features += len(features)
+        logger.debug(f"Written {self.total_features} features so far...")
+
+    def _build_spatial_index(self) -> None:
+        """Create and fill the R-tree index, then record the layer extent."""
+        table, column = self.table_name, GPKG_GEOMETRY_COLUMN
+        rtree = f"rtree_{table}_{column}"
+        _register_gpkg_functions(self._connection)
+        with self._connection:
+            self._connection.execute(
+                f'CREATE VIRTUAL TABLE "{rtree}" USING rtree(id, minx, maxx, miny, maxy)'
+            )
+            self._connection.execute(
+                f'INSERT INTO "{rtree}" SELECT "fid", ST_MinX("{column}"), ST_MaxX("{column}"), '
+                f'ST_MinY("{column}"), ST_MaxY("{column}") FROM "{table}" '
+                f'WHERE "{column}" IS NOT NULL AND NOT ST_IsEmpty("{column}")'
+            )
+            self._connection.executescript(
+                _GPKG_RTREE_TRIGGERS.format(t=table, c=column, i="fid")
+            )
+            self._connection.execute(
+                "INSERT INTO gpkg_extensions VALUES (?, ?, 'gpkg_rtree_index', "
+                "'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')",
+                (table, column),
+            )
+            self._connection.execute(
+                f'UPDATE gpkg_contents SET (min_x, max_x, min_y, max_y) = '
+                f'(SELECT min(minx), max(maxx), min(miny), max(maxy) FROM "{rtree}") '
+                f"WHERE table_name = ?",
+                (table,),
+            )
+
+    def close(self) -> dict:
+        if self._insert_sql is None:
+            self._create_table([])
+        if self.has_geometry:
+            self._build_spatial_index()
+        self._connection.close()
+        return {
+            "file_path": os.path.abspath(self.file_path),
+            "file_format": self.file_format,
+            "table_name": self.table_name,
+            "totalFeatures": self.total_features,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._connection.close()
+
+
+def _iter_geopackage_features(file_path: str, table_name: str | None = None) -> Iterator[dict]:
+    """Yield the rows of a table written by _GeoPackageCache as GeoJSON features."""
+    connection = sqlite3.connect(file_path)
+    try:
+        if table_name is None:
+            (table_name,) = connection.execute(
+                "SELECT table_name FROM gpkg_contents LIMIT 1"
+            ).fetchone()
+        table_name = _gpkg_identifier(table_name)
+        geometry_column = connection.execute(
+            "SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?",
+            (table_name,),
+        ).fetchone()
+        geometry_column = geometry_column[0] if geometry_column else None
+        original_names = {}
+        has_data_columns = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'gpkg_data_columns'"
+        ).fetchone()
+        if has_data_columns:
+            original_names = dict(
+                connection.execute(
+                    "SELECT column_name, name FROM gpkg_data_columns "
+                    "WHERE table_name = ? AND name IS NOT NULL",
+                    (table_name,),
+                ).fetchall()
+            )
+
+        cursor = connection.execute(f'SELECT * FROM "{table_name}"')
+        columns = [d[0] for d in cursor.description]
+        # The first column is always the fid
+        property_columns = [
+            (i, original_names.get(column, column))
+            for i, column in enumerate(columns)
+            if i > 0 and column != geometry_column
+        ]
+        geometry_index = columns.index(geometry_column) if geometry_column else None
+        for row in cursor:
+            properties = {name: row[i] for i, name in property_columns}
+            blob = row[geometry_index] if geometry_index is not None else None
+            geometry = None
+            if blob is not None:
+                geometry = mapping(shapely.from_wkb(blob[_gpkg_header_size(blob) :]))
+            yield {"type": "Feature", "geometry": geometry, "properties": properties}
+    finally:
+        connection.close()
+
+
+# --- Columnar memory ---
+class _ColumnarCache:
+    """
+    Accumulate pages in memory as typed columns instead of feature dicts.
+
+    As each page arrives, its properties are appended to one chunk per field,
+    converted to the field's compact dtype, and its geometries to a chunk of
+    WKB. Property names are not repeated per feature and no per-feature
+    dicts are kept. On close the chunks are concatenated into one DataFrame
+    of attributes and one array of WKB geometries. As for the file sinks, the
+    columns are fixed from the fields and the first page, and a property
+    called "geometry" is renamed so it does not collide with the geometry.
+    """
+
+    checkpoint = None
+    accepts_raw_pages = False
+
+    def __init__(self, fields: list | None = None):
+        self.fields = fields or []
+        self.total_features = 0
+        self.has_geometry = False
+        self._columns = None
+        self._chunks = None
+        self._geometry_chunks = []
+        self._dropped = set()
+
+    def _page_column(self, values: list, field_type: str | None) -> pd.Series:
+        if field_type is None:
+            return pd.Series(values)
+        series = pd.Series(values, dtype=object)
+        if FIELD_TYPE_KINDS.get(field_type) == "date":
+            # Dates are parsed once on close, so that one unparseable page
+            # leaves the whole column as text rather than only that page
+            return series.astype(_string_dtype())
+        typed = _typed_column(series, field_type, categories=False)
+        return series if typed is None else typed
+
+    def add_page(self, page_data: dict) -> None:
+        features = page_data.get("features", [])
+        if self._columns is None:
+            self._columns, self.has_geometry = _sink_columns(self.fields, features)
+            self._chunks = {name: [] for name, _ in self._columns}
+        else:
+            _log_dropped_properties(features, set(self._chunks), self._dropped)
+        if not features:
+            return
+
+        properties = [f.get("properties") or {} for f in features]
+        for name, field_type in self._columns:
+            self._chunks[name].append(
+                self._page_column([p.get(name) for p in properties], field_type)
+            )
+        if not self.has_geometry and any(f.get("geometry") for f in features):
+            self.has_geometry = True
+            # Earlier pages had only null geometries; keep the rows aligned
+            self._geometry_chunks.append(np.full(self.total_features, None, dtype=object))
+        if self.has_geometry:
+            self._geometry_chunks.append(
+                shapely.to_wkb(geojson_geometries_to_array([f.get("geometry") for f in features]))
+            )
+        self.total_features += len(features)
+        logger.debug(f"Accumulated {self.total_features} features so far...")
+
+    def close(self) -> dict:
+        attributes = {}
+        columns = self._columns or []
+        # The geometry may be kept next to the attributes, as in the arrow table
+        column_names = _attribute_column_names([name for name, _ in columns])
+        for (name, field_type), column_name in zip(columns, column_names):
+            chunks = self._chunks.pop(name)
+            column = pd.concat(chunks, ignore_index=True) if chunks else pd.Series([], dtype=object)
+            if field_type is not None and len(column):
+                # Date and category decisions need the whole column
+                typed = _typed_column(column, field_type)
+                if typed is not None:
+                    column = typed
+            attributes[column_name] = column
+
+        geometry = None
+        if self.has_geometry:
+            geometry = (
+                np.concatenate(self._geometry_chunks)
+                if self._geometry_chunks
+                else np.array([], dtype=object)
+            )
+        self._geometry_chunks = []
+        return {
+            "columnar": {
+                "attributes": pd.DataFrame(attributes, index=pd.RangeIndex(self.total_features)),
+                "geometry": geometry,
+            },
+            "totalFeatures": self.total_features,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+def _iter_columnar_features(columnar: dict) -> Iterator[dict]:
+    """Yield the rows of a columnar result as GeoJSON features."""
+    attributes = columnar["attributes"]
+    records = attributes.astype(object).where(attributes.notna(), None).to_dict("records")
+    geometry = columnar["geometry"]
+    if geometry is None:
+        geometries = [None] * len(records)
+    else:
+        geometries = [
+            None if geom is None else mapping(geom) for geom in shapely.from_wkb(geometry)
+        ]
+    for properties, geom in zip(records, geometries):
+        yield {"type": "Feature", "geometry": geom, "properties": properties}
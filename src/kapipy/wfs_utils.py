@@ -1,10 +1,19 @@
+import asyncio
+import hashlib
 import httpx
 import os
+import math
+import mmap
+import re
 import tempfile
 import json
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Literal
+from typing import Any, AsyncIterator, Generator, Iterator, Literal
+
+import numpy as np
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -15,7 +24,15 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from . import json_codec
+from .http_cache import cached_request
 from .custom_errors import BadRequest, HTTPError, ServerError
+from .wfs_sinks import (
+    _ColumnarCache,
+    _GeoPackageCache,
+    _ParquetCache,
+    _ShapefileCache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +44,25 @@ DEFAULT_WFS_OUTPUT_FORMAT = "json"
 DEFAULT_SRSNAME = "EPSG:2193"
 MAX_PAGE_FETCHES = 1000
 DEFAULT_FEATURES_PER_PAGE = 10000
-
-_http_client = httpx.Client(
-    timeout=httpx.Timeout(connect=15, read=90, write=30, pool=10)
+# cache_mode="AUTO" keeps results estimated to fit in this many bytes in MEMORY
+DEFAULT_AUTO_MEMORY_LIMIT = 512 * 1024 * 1024
+AUTO_SAMPLE_SIZE = 100
+# Decoded features take several times their JSON size as Python objects
+DECODED_SIZE_FACTOR = 6
+# download_wfs_data options that have no meaning when streaming pages
+DOWNLOAD_ONLY_PARAMS = (
+    "cache_mode",
+    "temp_file_path",
+    "resume",
+    "fields",
+    "auto_memory_limit",
+    "client",
 )
 
+DEFAULT_HTTP_TIMEOUT = httpx.Timeout(connect=15, read=90, write=30, pool=10)
+
+_http_client = httpx.Client(timeout=DEFAULT_HTTP_TIMEOUT)
+
 
 def _get_kapipy_temp_file(suffix=".geojson", prefix="wfs_") -> str:
     """
@@ -53,6 +84,165 @@ def _get_kapipy_temp_file(suffix=".geojson", prefix="wfs_") -> str:
     return temp_file_path
 
 
+# --- Raw page scanning ---
+_FEATURES_ARRAY = re.compile(rb'"features"\s*:\s*\[')
+_ARRAY_SEPARATOR = re.compile(rb"\s*([,\]])")
+_QUOTE, _BACKSLASH = 0x22, 0x5C
+_OPEN_BRACE, _CLOSE_BRACE, _CLOSE_BRACKET = 0x7B, 0x7D, 0x5D
+
+
+class _RawPage:
+    """
+    A WFS page kept as the raw response body.
+
+    Holds the byte spans of each element of the top-level "features" array,
+    so the features can be copied to disk without building Python dicts.
+    """
+
+    __slots__ = ("body", "spans")
+
+    def __init__(self, body: bytes, spans: list[tuple[int, int]]):
+        self.body = body
+        self.spans = spans
+
+    @property
+    def feature_count(self) -> int:
+        return len(self.spans)
+
+    def iter_feature_bytes(self) -> Iterator[bytes]:
+        """Yield each feature's JSON bytes, on a single line."""
+        multiline = b"\n" in self.body or b"\r" in self.body
+        for start, end in self.spans:
+            feature = self.body[start:end]
+            if multiline and (b"\n" in feature or b"\r" in feature):
+                # Raw newlines can only be whitespace outside of JSON strings
+                feature = feature.replace(b"\r", b" ").replace(b"\n", b" ")
+            yield feature
+
+    def last_feature(self) -> dict:
+        start, end = self.spans[-1]
+        return json_codec.loads(self.body[start:end])
+
+
+def _unescaped_quotes(data: np.ndarray) -> np.ndarray:
+    """Return the positions of the double quotes that delimit JSON strings."""
+    quotes = np.flatnonzero(data == _QUOTE)
+    candidates = quotes[quotes > 0]
+    candidates = candidates[data[candidates - 1] == _BACKSLASH]
+    if not len(candidates):
+        return quotes
+    # A quote is escaped if it follows an odd number of backslashes. These are
+    # rare, so the runs are counted one at a time.
+    escaped = []
+    for position in candidates.tolist():
+        run = 1
+        while position - run > 0 and data[position - run - 1] == _BACKSLASH:
+            run += 1
+        if run % 2:
+            escaped.append(position)
+    return np.setdiff1d(quotes, escaped, assume_unique=True)
+
+
+def _feature_spans(body: bytes, position: int) -> list[tuple[int, int]] | None:
+    """
+    Find the byte span of each object in the array that starts at position.
+
+    The quotes, braces and brackets are located with numpy, so no Python code
+    runs per token. A brace or bracket is inside a string when an odd number
+    of quotes come before it. Returns None if the array holds anything other
+    than objects or is not closed.
+    """
+    data = np.frombuffer(body, dtype=np.uint8)[position:]
+    quotes = _unescaped_quotes(data)
+    braces = np.flatnonzero((data == _OPEN_BRACE) | (data == _CLOSE_BRACE))
+    braces = braces[(np.searchsorted(quotes, braces) & 1) == 0]
+    delta = np.where(data[braces] == _OPEN_BRACE, 1, -1)
+    depth = np.cumsum(delta)
+
+    # The array ends at the first closing bracket outside any string or object
+    brackets = np.flatnonzero(data == _CLOSE_BRACKET)
+    brackets = brackets[(np.searchsorted(quotes, brackets) & 1) == 0]
+    preceding = np.searchsorted(braces, brackets) - 1
+    bracket_depth = np.where(preceding >= 0, depth[np.maximum(preceding, 0)], 0)
+    closing = brackets[bracket_depth == 0]
+    if not len(closing):
+        return None
+    array_end = closing[0]
+
+    starts = braces[(depth == 1) & (delta == 1)]
+    ends = braces[(depth == 0) & (delta == -1)] + 1
+    starts, ends = starts[starts < array_end], ends[ends <= array_end]
+    if not len(starts) or len(starts) != len(ends):
+        return None
+    starts, ends = (starts + position).tolist(), (ends + position).tolist()
+
+    # Only whitespace may surround the objects, and a comma between them
+    gaps = {body[end:start] for end, start in zip(ends[:-1], starts[1:])}
+    if (
+        body[position : starts[0]].strip()
+        or body[ends[-1] : array_end + position].strip()
+        or any(gap.strip() != b"," for gap in gaps)
+    ):
+        return None
+    return list(zip(starts, ends))
+
+
+def _scan_raw_page(body: bytes) -> "_RawPage | dict":
+    """
+    Locate the features of a GeoJSON FeatureCollection without decoding it.
+
+    If the body does not look like a FeatureCollection with a top-level
+    "features" array, it is decoded normally instead.
+    """
+    match = _FEATURES_ARRAY.search(body)
+    if match is None:
+        return json_codec.loads(body)
+
+    # The members before "features" must form a valid top-level object,
+    # which rules out a "features" key nested inside something else.
+    try:
+        json_codec.loads(body[: match.start()].rstrip().rstrip(b",") + b"}")
+    except ValueError:
+        return json_codec.loads(body)
+
+    separator = _ARRAY_SEPARATOR.match(body, match.end())
+    if separator is not None and separator.group(1) == b"]":
+        return _RawPage(body, [])
+
+    spans = _feature_spans(body, match.end())
+    if spans is None:
+        # The features array was not closed where expected
+        return json_codec.loads(body)
+    return _RawPage(body, spans)
+
+
+def _page_feature_count(page_data: "dict | _RawPage") -> int:
+    """Return the number of features in a decoded or raw page."""
+    if isinstance(page_data, _RawPage):
+        return page_data.feature_count
+    return len(page_data.get("features", []))
+
+
+def _parse_page_response(response: httpx.Response, raw: bool = False) -> "dict | _RawPage":
+    """
+    Raise kapipy errors for a failed WFS response, otherwise decode it.
+
+    With raw=True the body is scanned rather than decoded, see _scan_raw_page.
+    """
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code if e.response else None
+        if status and 400 <= status < 500:
+            raise BadRequest(
+                f"Bad request ({status}): {getattr(e.response, 'text', '')}"
+            )
+        raise
+    if raw:
+        return _scan_raw_page(response.content)
+    return json_codec.loads(response.content)
+
+
 # --- Internal helper to fetch a single page ---
 @retry(
     retry=(
@@ -63,21 +253,44 @@ def _get_kapipy_temp_file(suffix=".geojson", prefix="wfs_") -> str:
     wait=wait_exponential(multiplier=1, min=2, max=10) + wait_random(0, 3),
     reraise=True,
 )
-def _fetch_single_page_data(url: str, headers: dict, params: dict, timeout=30) -> dict:
+def _fetch_single_page_data(
+    url: str, headers: dict, params: dict, timeout=30, raw: bool = False
+) -> "dict | _RawPage":
     try:
-        response = _http_client.post(url, headers=headers, data=params, timeout=timeout)
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        status = e.response.status_code if e.response else None
-        if status and 400 <= status < 500:
-            raise BadRequest(
-                f"Bad request ({status}): {getattr(e.response, 'text', '')}"
-            )
+        response = cached_request(
+            _http_client, "POST", url, headers=headers, data=params, timeout=timeout
+        )
+    except httpx.RequestError as e:
+        logger.warning(f"Request failed for URL {url}: {e}")
         raise
+    return _parse_page_response(response, raw)
+
+
+@retry(
+    retry=(
+        retry_if_exception_type(httpx.RequestError)
+        | retry_if_exception_type(httpx.ReadTimeout)
+    ),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10) + wait_random(0, 3),
+    reraise=True,
+)
+async def _fetch_single_page_data_async(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    params: dict,
+    timeout=30,
+    raw: bool = False,
+) -> "dict | _RawPage":
+    try:
+        response = await client.post(
+            url, headers=headers, data=params, timeout=timeout
+        )
     except httpx.RequestError as e:
         logger.warning(f"Request failed for URL {url}: {e}")
         raise
+    return _parse_page_response(response, raw)
 
 
 # --- Helper for building WFS params ---
@@ -111,139 +324,774 @@ def _build_wfs_params(
     return params
 
 
-# --- DISK mode implementation ---
-def _download_to_disk(
+# --- Page iteration ---
+def _max_page_fetches(page_count: int, result_record_count: int | None) -> int:
+    """Return the number of pages needed to satisfy the request."""
+    if result_record_count is None:
+        return MAX_PAGE_FETCHES
+    return min(MAX_PAGE_FETCHES, math.ceil(result_record_count / page_count))
+
+
+def _page_params(wfs_params: dict, page_number: int, page_count: int) -> dict:
+    """Return a copy of the WFS params for a single startIndex window."""
+    return {
+        **wfs_params,
+        "startIndex": page_number * page_count,
+        "count": page_count,
+    }
+
+
+def _cql_literal(value: Any) -> str:
+    """Format a property value as a CQL literal."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _keyset_params(
+    wfs_params: dict, page_count: int, primary_key: str, last_value: Any
+) -> dict:
+    """
+    Return a copy of the WFS params for the page after last_value.
+
+    Any existing cql_filter is kept and combined with the keyset condition.
+    """
+    params = {
+        **wfs_params,
+        "count": page_count,
+        "sortBy": f"{primary_key} ASC",
+    }
+    params.pop("startIndex", None)
+    if last_value is not None:
+        keyset_filter = f"{primary_key} > {_cql_literal(last_value)}"
+        cql_filter = wfs_params.get("cql_filter")
+        params["cql_filter"] = (
+            f"({cql_filter}) AND {keyset_filter}" if cql_filter else keyset_filter
+        )
+    return params
+
+
+def _last_key_value(page_data: "dict | _RawPage", primary_key: str) -> Any:
+    """Return the primary key value of the last feature in a page."""
+    if isinstance(page_data, _RawPage):
+        last_feature = page_data.last_feature()
+    else:
+        last_feature = page_data["features"][-1]
+    properties = last_feature.get("properties") or {}
+    if primary_key not in properties:
+        raise ValueError(
+            f"Primary key field '{primary_key}' is missing from the WFS response."
+        )
+    return properties[primary_key]
+
+
+def _iter_keyset_pages(
     url: str,
     headers: dict,
     wfs_params: dict,
-    temp_file_path: str,
     page_count: int,
     result_record_count: int | None,
-) -> int:
-    """Stream features to disk as a valid GeoJSON FeatureCollection."""
-    os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+    primary_key: str,
+    checkpoint: dict | None = None,
+    raw: bool = False,
+) -> Iterator["dict | _RawPage"]:
+    """
+    Yield WFS pages using keyset pagination on the primary key.
 
-    total_features = 0
-    pages_fetched = 0
-    start_index = 0
-    first_feature_written = False
+    Each page asks for the features whose key is greater than the last key
+    seen, sorted by the key. The server can then seek straight to the next
+    page rather than skipping over startIndex rows, so deep pages are as
+    fast as the first one and MAX_PAGE_FETCHES does not apply.
+    """
+    checkpoint = checkpoint or {}
+    total_features = checkpoint.get("total_features", 0)
+    last_value = checkpoint.get("last_key")
+    page_number = 0
 
-    with open(temp_file_path, "w", encoding="utf-8") as f:
-        f.write('{"type": "FeatureCollection", "features": [\n')
-        f.flush()
+    while result_record_count is None or total_features < result_record_count:
+        try:
+            page_data = _fetch_single_page_data(
+                url,
+                headers,
+                _keyset_params(wfs_params, page_count, primary_key, last_value),
+                raw=raw,
+            )
+        except (BadRequest, HTTPError, RetryError) as e:
+            logger.error(f"Error fetching page {page_number}: {e}")
+            raise
+
+        if not page_data or not isinstance(page_data, (dict, _RawPage)):
+            break
+
+        yield page_data
 
-        while pages_fetched < MAX_PAGE_FETCHES:
-            wfs_params["startIndex"] = start_index
-            wfs_params["count"] = page_count
+        feature_count = _page_feature_count(page_data)
+        if feature_count < page_count:
+            break
 
+        total_features += feature_count
+        last_value = _last_key_value(page_data, primary_key)
+        page_number += 1
+
+
+def _iter_pages(
+    url: str,
+    headers: dict,
+    wfs_params: dict,
+    page_count: int,
+    result_record_count: int | None,
+    max_workers: int = 1,
+    primary_key: str | None = None,
+    checkpoint: dict | None = None,
+    raw: bool = False,
+) -> Iterator["dict | _RawPage"]:
+    """
+    Yield WFS pages, in startIndex order, until the result is exhausted.
+
+    With max_workers greater than 1, up to that many startIndex windows are
+    requested in parallel over the shared http client. Pages are still
+    yielded strictly in order, and no further windows are requested once a
+    short or empty page is seen.
+
+    If a primary_key is given, keyset pagination is used instead. If a
+    checkpoint from a previous attempt is given, paging continues from it.
+    With raw=True, pages are yielded as _RawPage objects where possible.
+    """
+    if primary_key is not None:
+        yield from _iter_keyset_pages(
+            url,
+            headers,
+            wfs_params,
+            page_count,
+            result_record_count,
+            primary_key,
+            checkpoint,
+            raw,
+        )
+        return
+
+    max_pages = _max_page_fetches(page_count, result_record_count)
+
+    executor = None
+    if max_workers > 1:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kapipy_wfs"
+        )
+    pending = deque()
+    first_page = (checkpoint or {}).get("start_index", 0) // page_count
+    next_page = first_page
+
+    try:
+        for page_number in range(first_page, max_pages):
             try:
-                page_data = _fetch_single_page_data(url, headers, wfs_params)
+                if executor is None:
+                    page_data = _fetch_single_page_data(
+                        url,
+                        headers,
+                        _page_params(wfs_params, page_number, page_count),
+                        raw=raw,
+                    )
+                else:
+                    # Keep up to max_workers windows in flight ahead of the consumer
+                    while next_page < max_pages and len(pending) < max_workers:
+                        pending.append(
+                            executor.submit(
+                                _fetch_single_page_data,
+                                url,
+                                headers,
+                                _page_params(wfs_params, next_page, page_count),
+                                raw=raw,
+                            )
+                        )
+                        next_page += 1
+                    page_data = pending.popleft().result()
             except (BadRequest, HTTPError, RetryError) as e:
-                logger.error(f"Error fetching page {pages_fetched}: {e}")
+                logger.error(f"Error fetching page {page_number}: {e}")
                 raise
-            if not page_data or not isinstance(page_data, dict):
+
+            if not page_data or not isinstance(page_data, (dict, _RawPage)):
                 break
 
-            features = page_data.get("features", [])
-            if not features:
+            yield page_data
+
+            if _page_feature_count(page_data) < page_count:
                 break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            for feature in features:
-                if first_feature_written:
-                    f.write(",\n")
-                else:
-                    first_feature_written = True
-                json.dump(feature, f)
-                total_features += 1
 
-            f.flush()
-            logger.debug(f"Written {total_features} features so far...")
+async def _aiter_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict,
+    wfs_params: dict,
+    page_count: int,
+    result_record_count: int | None,
+    max_workers: int = 1,
+    primary_key: str | None = None,
+    checkpoint: dict | None = None,
+    raw: bool = False,
+) -> AsyncIterator["dict | _RawPage"]:
+    """
+    Async twin of _iter_pages.
 
-            if len(features) < page_count:
+    Up to max_workers startIndex windows are awaited concurrently on the
+    event loop, and pages are yielded strictly in order. If a primary_key
+    is given, keyset pagination is used instead. If a checkpoint from a
+    previous attempt is given, paging continues from it.
+    """
+    checkpoint = checkpoint or {}
+    if primary_key is not None:
+        total_features = checkpoint.get("total_features", 0)
+        last_value = checkpoint.get("last_key")
+        while result_record_count is None or total_features < result_record_count:
+            try:
+                page_data = await _fetch_single_page_data_async(
+                    client,
+                    url,
+                    headers,
+                    _keyset_params(wfs_params, page_count, primary_key, last_value),
+                    raw=raw,
+                )
+            except (BadRequest, HTTPError, RetryError) as e:
+                logger.error(f"Error fetching keyset page after {last_value!r}: {e}")
+                raise
+            if not page_data or not isinstance(page_data, (dict, _RawPage)):
                 break
-            if (
-                result_record_count is not None
-                and total_features >= result_record_count
-            ):
+            yield page_data
+            feature_count = _page_feature_count(page_data)
+            if feature_count < page_count:
                 break
+            total_features += feature_count
+            last_value = _last_key_value(page_data, primary_key)
+        return
 
-            start_index += page_count
-            pages_fetched += 1
+    max_pages = _max_page_fetches(page_count, result_record_count)
+    pending = deque()
+    first_page = checkpoint.get("start_index", 0) // page_count
+    next_page = first_page
 
-        f.write(f'\n], "totalFeatures": {total_features}}}')
-        f.flush()
+    try:
+        for page_number in range(first_page, max_pages):
+            while next_page < max_pages and len(pending) < max_workers:
+                pending.append(
+                    asyncio.ensure_future(
+                        _fetch_single_page_data_async(
+                            client,
+                            url,
+                            headers,
+                            _page_params(wfs_params, next_page, page_count),
+                            raw=raw,
+                        )
+                    )
+                )
+                next_page += 1
 
-    return total_features
+            try:
+                page_data = await pending.popleft()
+            except (BadRequest, HTTPError, RetryError) as e:
+                logger.error(f"Error fetching page {page_number}: {e}")
+                raise
 
+            if not page_data or not isinstance(page_data, (dict, _RawPage)):
+                break
 
-# --- MEMORY mode implementation ---
-def _download_to_memory(
+            yield page_data
+
+            if _page_feature_count(page_data) < page_count:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# --- DISK mode implementation ---
+class _DiskCache:
+    """
+    Stream pages of features to disk as a valid GeoJSON FeatureCollection.
+
+    Pages arrive as _RawPage objects, so each feature's bytes are copied from
+    the response body to the file without being decoded and re-encoded.
+    """
+
+    checkpoint = None
+    accepts_raw_pages = True
+    file_format = "GeoJSON"
+    _header = b'{"type": "FeatureCollection", "features": [\n'
+    _separator = b",\n"
+
+    def __init__(self, temp_file_path: str):
+        os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+        self.file_path = temp_file_path
+        self.total_features = 0
+        self._f = open(temp_file_path, "wb")
+        self._f.write(self._header)
+        self._f.flush()
+
+    def add_page(self, page_data: "dict | _RawPage") -> None:
+        if isinstance(page_data, _RawPage):
+            features = page_data.iter_feature_bytes()
+        else:
+            dumps = json_codec.get_json_codec().dumps
+            features = (dumps(feature) for feature in page_data.get("features", []))
+        for feature in features:
+            if self.total_features:
+                self._f.write(self._separator)
+            self._f.write(feature)
+            self.total_features += 1
+
+        self._f.flush()
+        logger.debug(f"Written {self.total_features} features so far...")
+
+    def _footer(self) -> bytes:
+        return f'\n], "totalFeatures": {self.total_features}}}'.encode("utf-8")
+
+    def close(self) -> dict:
+        self._f.write(self._footer())
+        self._f.close()
+        return {
+            "file_path": os.path.abspath(self.file_path),
+            "file_format": self.file_format,
+            "totalFeatures": self.total_features,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+
+
+class _ResumableDiskCache(_DiskCache):
+    """
+    A DISK cache that records a checkpoint sidecar after every committed page.
+
+    The checkpoint holds a hash of the request params, the next startIndex
+    (or the last primary key value for keyset pagination), the feature count
+    and the byte offset of the end of the last committed page. If a previous
+    attempt for the same params left a checkpoint behind, the file is truncated
+    to that offset and the download continues from the next page. The
+    checkpoint is removed once the download completes.
+    """
+
+    def __init__(
+        self, temp_file_path: str, params_hash: str, primary_key: str | None
+    ):
+        self.checkpoint_path = f"{temp_file_path}.checkpoint.json"
+        self.params_hash = params_hash
+        self.primary_key = primary_key
+        self.checkpoint = self._read_checkpoint(temp_file_path)
+
+        if self.checkpoint is None:
+            super().__init__(temp_file_path)
+            self._write_checkpoint(last_key=None)
+            return
+
+        logger.info(
+            f"Resuming download into '{temp_file_path}' after "
+            f"{self.checkpoint['total_features']} features"
+        )
+        self.file_path = temp_file_path
+        self.total_features = self.checkpoint["total_features"]
+        self._f = open(temp_file_path, "r+b")
+        self._f.seek(self.checkpoint["byte_offset"])
+        self._f.truncate()
+
+    def _read_checkpoint(self, temp_file_path: str) -> dict | None:
+        if not (
+            os.path.exists(self.checkpoint_path) and os.path.exists(temp_file_path)
+        ):
+            return None
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(
+                f"Ignoring unreadable checkpoint '{self.checkpoint_path}': {e}"
+            )
+            return None
+        if checkpoint.get("params_hash") != self.params_hash:
+            logger.info(
+                "Checkpoint is for a different request; starting a new download."
+            )
+            return None
+        if os.path.getsize(temp_file_path) < checkpoint.get("byte_offset", 0):
+            logger.warning(
+                "Checkpoint is ahead of the data file; starting a new download."
+            )
+            return None
+        return checkpoint
+
+    def _write_checkpoint(self, last_key: Any) -> None:
+        checkpoint = {
+            "params_hash": self.params_hash,
+            "start_index": self.total_features,
+            "last_key": last_key,
+            "total_features": self.total_features,
+            "byte_offset": self._f.tell(),
+        }
+        temp_checkpoint_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_checkpoint_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_checkpoint_path, self.checkpoint_path)
+
+    def add_page(self, page_data: "dict | _RawPage") -> None:
+        super().add_page(page_data)
+        if not _page_feature_count(page_data):
+            return
+        last_key = None
+        if self.primary_key is not None:
+            last_key = _last_key_value(page_data, self.primary_key)
+        self._write_checkpoint(last_key)
+
+    def close(self) -> dict:
+        response = super().close()
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return response
+
+
+class _NDJSONCache(_DiskCache):
+    """
+    Stream pages of features to disk as GeoJSONSeq (RFC 8142), one feature
+    per line with no surrounding FeatureCollection.
+
+    The file can be appended to, read line by line, or split into byte
+    ranges that are read in parallel.
+    """
+
+    file_format = "GeoJSONSeq"
+    _header = b""
+    _separator = b"\n"
+
+    def _footer(self) -> bytes:
+        return b"\n" if self.total_features else b""
+
+
+class _ResumableNDJSONCache(_ResumableDiskCache, _NDJSONCache):
+    """A resumable NDJSON cache, see _ResumableDiskCache."""
+
+
+def _params_hash(
     url: str,
-    headers: dict,
     wfs_params: dict,
     page_count: int,
+    primary_key: str | None,
     result_record_count: int | None,
-) -> dict:
+) -> str:
+    """Return a stable hash identifying a download request."""
+    key = json.dumps(
+        {
+            "url": url,
+            "wfs_params": wfs_params,
+            "page_count": page_count,
+            "primary_key": primary_key,
+            "result_record_count": result_record_count,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _iter_disk_features(file_path: str) -> Iterator[dict]:
+    """
+    Yield features one at a time from a file written by _DiskCache.
+
+    _DiskCache writes one feature per line, so the file can be read back
+    without loading the whole FeatureCollection.
+    """
+    loads = json_codec.get_json_codec().loads
+    with open(file_path, "rb") as f:
+        f.readline()  # FeatureCollection header
+        for line in f:
+            line = line.strip()
+            if line.startswith(b"]"):
+                break
+            if line:
+                yield loads(line.rstrip(b","))
+
+
+def _ndjson_byte_ranges(file_path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    Split a GeoJSONSeq file into up to parts contiguous byte ranges.
+
+    The ranges are of roughly equal size and cover the whole file. They need
+    not fall on line boundaries: a line belongs to the range it starts in.
+    """
+    if parts < 1:
+        raise ValueError("parts must be a positive integer.")
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+    parts = min(parts, size)
+    bounds = [size * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts)]
+
+
+def _iter_ndjson_features(
+    file_path: str, start: int = 0, end: int | None = None
+) -> Iterator[dict]:
+    """
+    Yield the features of a GeoJSONSeq file, one line at a time.
+
+    If a byte range is given, only the lines that start within [start, end)
+    are read, so that disjoint ranges can be read independently.
+    """
+    loads = json_codec.get_json_codec().loads
+    with open(file_path, "rb") as f:
+        position = start
+        if start > 0:
+            # Skip the rest of a line that started in the previous range
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())
+        while end is None or position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            # RFC 8142 record separators are accepted as well as plain newlines
+            line = line.strip().lstrip(b"\x1e")
+            if line:
+                yield loads(line)
+
+
+def _read_ndjson_range(file_path: str, start: int, end: int) -> list[dict]:
+    """Read the features in a byte range of a GeoJSONSeq file into a list."""
+    return list(_iter_ndjson_features(file_path, start, end))
+
+
+class _FeatureIndex:
+    """
+    Random access to the features of a file written by _DiskCache or _NDJSONCache.
+
+    Both write one feature per line, so the byte offsets of the features are
+    found by locating the newlines of the memory-mapped file with numpy. Only
+    the features that are asked for are decoded. close releases the memory
+    map, which must be done before the file can be deleted on Windows.
+    """
+
+    def __init__(self, file_path: str, has_header: bool):
+        self._mmap = None
+        self.starts = self.ends = np.array([], dtype=np.int64)
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        newlines = np.flatnonzero(data == 0x0A)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(data)]))
+        if has_header:
+            # The FeatureCollection header is the first line
+            starts, ends = starts[1:], ends[1:]
+        keep = starts < ends
+        starts, ends = starts[keep], ends[keep]
+
+        # RFC 8142 record separators are accepted as well as plain newlines
+        starts = starts + (data[starts] == 0x1E)
+        # Feature lines start with "{"; this skips the footer and blank lines
+        keep = (starts < ends) & (data[np.minimum(starts, len(data) - 1)] == 0x7B)
+        starts, ends = starts[keep], ends[keep]
+        for trailing in (0x0D, 0x2C):  # "\r", then the "," between features
+            ends = ends - (data[ends - 1] == trailing)
+        self.starts, self.ends = starts, ends
+        # Release the numpy view so the memory map can be closed
+        del data
+
+    def close(self) -> None:
+        """Close the memory map."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def feature(self, i: int) -> dict:
+        """Decode the feature at position i. Negative positions count from the end."""
+        if not -len(self) <= i < len(self):
+            raise IndexError("feature index out of range")
+        return json_codec.loads(self._mmap[self.starts[i] : self.ends[i]])
+
+    def features(self, indices: range) -> list[dict]:
+        """Decode the features at the given positions."""
+        loads = json_codec.get_json_codec().loads
+        return [loads(self._mmap[self.starts[i] : self.ends[i]]) for i in indices]
+
+
+# --- MEMORY mode implementation ---
+class _MemoryCache:
     """Load all features into memory (original behaviour)."""
-    all_features = []
-    start_index = 0
-    pages_fetched = 0
-    result = None
 
-    while pages_fetched < MAX_PAGE_FETCHES:
-        wfs_params["startIndex"] = start_index
-        wfs_params["count"] = page_count
+    checkpoint = None
+    accepts_raw_pages = False
 
-        try:
-            page_data = _fetch_single_page_data(url, headers, wfs_params)
-        except (BadRequest, HTTPError, RetryError) as e:
-            logger.error(f"Error fetching page {pages_fetched}: {e}")
-            raise
+    def __init__(self):
+        self._result = None
+        self._features = []
 
-        if not page_data or not isinstance(page_data, dict):
-            break
+    def add_page(self, page_data: dict) -> None:
+        if self._result is None:
+            self._result = page_data
+        self._features.extend(page_data.get("features", []))
 
-        if result is None:
-            result = page_data
+    def close(self) -> dict:
+        result = self._result if self._result is not None else {"type": "FeatureCollection"}
+        result["features"] = self._features
+        result["totalFeatures"] = len(self._features)
+        result.pop("numberReturned", None)
+        return {
+            "geojson": result,
+            "totalFeatures": result["totalFeatures"],
+        }
 
-        features = page_data.get("features", [])
-        if not features:
-            break
+    def __enter__(self):
+        return self
 
-        all_features.extend(features)
-        if len(features) < page_count:
-            break
-        if result_record_count is not None and len(all_features) >= result_record_count:
-            break
+    def __exit__(self, exc_type, exc, tb):
+        pass
 
-        start_index += page_count
-        pages_fetched += 1
 
-    result["features"] = all_features
-    result["totalFeatures"] = len(all_features)
-    result.pop("numberReturned", None)
-    return result
+_FILE_CACHES = {"DISK": _DiskCache, "NDJSON": _NDJSONCache}
+_RESUMABLE_CACHES = {"DISK": _ResumableDiskCache, "NDJSON": _ResumableNDJSONCache}
+# Sinks that need the item's fields and the output srsName to set up the file
+_SINK_CACHES = {
+    "PARQUET": _ParquetCache,
+    "SHAPEFILE": _ShapefileCache,
+    "GPKG": _GeoPackageCache,
+}
+_CACHE_FILE_SUFFIXES = {
+    "DISK": ".geojson",
+    "NDJSON": ".geojsonl",
+    "PARQUET": ".parquet",
+    "SHAPEFILE": ".shp",
+    "GPKG": ".gpkg",
+}
+CACHE_MODES = ("MEMORY", "COLUMNAR", "DISK", "NDJSON", *_SINK_CACHES)
+# Cache modes that are given the item's fields
+SINK_CACHE_MODES = ("COLUMNAR", *_SINK_CACHES)
 
 
-# --- Public main method ---
-def download_wfs_data(
-    url: str,
+def _open_cache(
+    cache_mode: str,
+    temp_file_path: str | None,
+    resume_hash: str | None = None,
+    primary_key: str | None = None,
+    fields: list | None = None,
+    srs_name: str | None = None,
+) -> "_DiskCache | _MemoryCache | _ColumnarCache | _ParquetCache":
+    """
+    Return the page cache for the requested cache_mode.
+
+    If resume_hash is given, a resumable DISK or NDJSON cache is returned.
+    Without a temp_file_path, its file name is derived from the hash so that a
+    repeat of the same request finds the previous attempt.
+    """
+    if resume_hash is not None:
+        if cache_mode not in _RESUMABLE_CACHES:
+            raise ValueError(
+                "resume is only supported in 'DISK' and 'NDJSON' cache_mode."
+            )
+        if not temp_file_path:
+            temp_file_path = os.path.join(
+                tempfile.gettempdir(),
+                "kapipy",
+                f"wfs_{resume_hash[:16]}{_CACHE_FILE_SUFFIXES[cache_mode]}",
+            )
+            logger.info(
+                f"No temp_file_path specified; using resumable temp file: '{temp_file_path}'"
+            )
+        return _RESUMABLE_CACHES[cache_mode](temp_file_path, resume_hash, primary_key)
+    if cache_mode == "MEMORY":
+        return _MemoryCache()
+    if cache_mode == "COLUMNAR":
+        return _ColumnarCache(fields=fields)
+    if cache_mode not in _CACHE_FILE_SUFFIXES:
+        raise ValueError(
+            f"Invalid cache_mode. Use one of: {', '.join(repr(m) for m in CACHE_MODES)}."
+        )
+    if not temp_file_path:
+        # Create a unique, writable temp file automatically
+        temp_file_path = _get_kapipy_temp_file(suffix=_CACHE_FILE_SUFFIXES[cache_mode])
+        logger.info(
+            f"No temp_file_path specified; using system temp file: '{temp_file_path}'"
+        )
+    if cache_mode in _SINK_CACHES:
+        return _SINK_CACHES[cache_mode](temp_file_path, fields=fields, srs_name=srs_name)
+    return _FILE_CACHES[cache_mode](temp_file_path)
+
+
+# --- AUTO cache mode ---
+def _sample_params(wfs_params: dict) -> dict:
+    """Return the params for a small first page used to estimate the result size."""
+    return {**wfs_params, "startIndex": 0, "count": AUTO_SAMPLE_SIZE}
+
+
+def _estimate_result_bytes(sample: dict, result_record_count: int | None) -> int | None:
+    """
+    Estimate the memory the decoded result would take, from a sample page.
+
+    The number of features comes from the page's numberMatched (or
+    totalFeatures), and the size of each from the sample's features.
+    Returns None if the server did not report the number of features.
+    """
+    features = sample.get("features", [])
+    total = sample.get("numberMatched", sample.get("totalFeatures"))
+    if len(features) < AUTO_SAMPLE_SIZE:
+        total = len(features)
+    elif not isinstance(total, int):
+        return None
+    if result_record_count is not None:
+        total = min(total, result_record_count)
+    if not features:
+        return 0
+    sample_bytes = len(json_codec.dumps(features))
+    return int(total * sample_bytes / len(features) * DECODED_SIZE_FACTOR)
+
+
+def _auto_cache_mode(
+    sample: dict, result_record_count: int | None, memory_limit: int
+) -> str:
+    """Choose MEMORY or DISK for cache_mode="AUTO" from a sample page."""
+    estimate = _estimate_result_bytes(sample, result_record_count)
+    if estimate is None:
+        logger.info("cache_mode='AUTO': result size is unknown; using 'DISK'")
+        return "DISK"
+    cache_mode = "MEMORY" if estimate <= memory_limit else "DISK"
+    logger.info(
+        f"cache_mode='AUTO': estimated {estimate / 1024 / 1024:.1f} MB in memory; using '{cache_mode}'"
+    )
+    return cache_mode
+
+
+# --- Shared request set up ---
+def _prepare_wfs_request(
     typeNames: str,
     api_key: str,
-    srsName: str = DEFAULT_SRSNAME,
-    cql_filter: str = None,
-    bbox: str = None,
-    out_fields: str | list[str] = None,
-    result_record_count: int = None,
-    page_count: int = DEFAULT_FEATURES_PER_PAGE,
-    cache_mode: Literal["DISK", "MEMORY"] = "MEMORY",
-    temp_file_path: str | None = None,
+    srsName: str,
+    cql_filter: str | None,
+    bbox: str | None,
+    out_fields: str | list[str] | None,
+    result_record_count: int | None,
+    page_count: int,
+    max_workers: int,
+    pagination: str,
+    primary_key: str | None,
     **other_wfs_params: Any,
-) -> dict:
+) -> tuple[dict, dict, int, str | None]:
     """
-    Downloads features from a WFS service.
-    - In DISK mode: streams to a GeoJSON file (safe, low memory).
-    - In MEMORY mode: stores all features in memory (fast but risky for large data).
+    Validate the request and return the headers, WFS params, page count and
+    the primary key to use for keyset pagination (None for offset pagination).
     """
     if not api_key:
         raise HTTPError("API key must be provided.")
@@ -257,37 +1105,45 @@ def download_wfs_data(
 
     if result_record_count is not None and result_record_count < page_count:
         page_count = result_record_count
+    if max_workers is None or max_workers < 1:
+        raise ValueError("max_workers must be a positive integer.")
+
+    if pagination == "offset":
+        primary_key = None
+    elif pagination == "keyset":
+        if not primary_key:
+            raise ValueError("Keyset pagination requires a primary_key field.")
+        if bbox is not None:
+            raise ValueError(
+                "Keyset pagination cannot be combined with a bbox string. Use a cql_filter instead."
+            )
+        if max_workers > 1:
+            logger.warning(
+                "Keyset pagination fetches pages sequentially; ignoring max_workers."
+            )
+        if out_fields is not None:
+            if isinstance(out_fields, str):
+                out_fields = out_fields.split(",")
+            if primary_key not in out_fields:
+                out_fields = [*out_fields, primary_key]
+    else:
+        raise ValueError("Invalid pagination. Use 'offset' or 'keyset'.")
 
     wfs_params = _build_wfs_params(
         typeNames, srsName, cql_filter, bbox, out_fields, **other_wfs_params
     )
-    request_datetime = datetime.utcnow()
+    return headers, wfs_params, page_count, primary_key
 
-    if cache_mode == "DISK":
-        if not temp_file_path:
-            # Create a unique, writable temp file automatically
-            temp_file_path = _get_kapipy_temp_file(suffix=".geojson")
-            logger.info(
-                f"No temp_file_path specified; using system temp file: '{temp_file_path}'"
-            )
-        total_features = _download_to_disk(
-            url, headers, wfs_params, temp_file_path, page_count, result_record_count
-        )
-        response = {
-            "file_path": os.path.abspath(temp_file_path),
-            "totalFeatures": total_features,
-        }
-    elif cache_mode == "MEMORY":
-        geojson = _download_to_memory(
-            url, headers, wfs_params, page_count, result_record_count
-        )
-        response = {
-            "geojson": geojson,
-            "totalFeatures": geojson.get("totalFeatures", None),
-        }
-    else:
-        raise ValueError("Invalid cache_mode. Use 'DISK' or 'MEMORY'.")
 
+def _request_details(
+    url: str,
+    request_datetime: datetime,
+    headers: dict,
+    wfs_params: dict,
+    cache_mode: str,
+    response: dict,
+) -> dict:
+    """Return the request details, with the API key removed, for auditing."""
     headers.pop("Authorization", None)
     wfs_params.pop("startIndex", None)
     wfs_params.pop("count", None)
@@ -301,3 +1157,278 @@ def download_wfs_data(
         "cache_mode": cache_mode,
         "response": response,
     }
+
+
+# --- Public main method ---
+def download_wfs_data(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    bbox: str = None,
+    out_fields: str | list[str] = None,
+    result_record_count: int = None,
+    page_count: int = DEFAULT_FEATURES_PER_PAGE,
+    cache_mode: Literal[
+        "DISK", "NDJSON", "PARQUET", "SHAPEFILE", "GPKG", "MEMORY", "COLUMNAR", "AUTO"
+    ] = "MEMORY",
+    temp_file_path: str | None = None,
+    max_workers: int = 1,
+    pagination: Literal["offset", "keyset"] = "offset",
+    primary_key: str | None = None,
+    resume: bool = False,
+    fields: list | None = None,
+    auto_memory_limit: int = DEFAULT_AUTO_MEMORY_LIMIT,
+    **other_wfs_params: Any,
+) -> dict:
+    """
+    Downloads features from a WFS service.
+    - In DISK mode: streams to a GeoJSON file (safe, low memory).
+    - In NDJSON mode: streams to a GeoJSONSeq file, one feature per line.
+    - In PARQUET mode: appends each page to a GeoParquet file as a row group.
+      Column types are taken from fields (the item's field definitions)
+      where given. Requires pyarrow.
+    - In SHAPEFILE mode: writes each page to an ESRI Shapefile with pyshp,
+      with the DBF schema taken from fields where given.
+    - In GPKG mode: inserts each page into a GeoPackage table with sqlite3,
+      and builds the R-tree spatial index once the download completes.
+    - In MEMORY mode: stores all features in memory (fast but risky for large data).
+    - In COLUMNAR mode: stores the features in memory as one typed column per
+      field and an array of WKB geometries, which is far smaller than the
+      feature dicts and converts to a DataFrame without copying each row.
+    - In AUTO mode: first requests a small sample page, and estimates the
+      memory the whole result would take from its numberMatched and the
+      size of its features. Uses MEMORY if that is within auto_memory_limit
+      bytes, otherwise DISK (also DISK if the size is unknown, or with resume).
+
+    Pages are requested one after another by default. Setting max_workers
+    above 1 requests that many startIndex windows concurrently; features are
+    always reassembled in the original page order.
+
+    With pagination="keyset", pages are requested with a
+    "primary_key > last seen value" cql_filter sorted by primary_key, rather
+    than with startIndex offsets. Per-page latency then stays flat however
+    deep the query goes, and there is no MAX_PAGE_FETCHES limit.
+
+    In DISK and NDJSON mode, resume=True records a checkpoint sidecar next to the file
+    after every page. If the download fails, repeating the same call continues
+    from the last completed page instead of starting again from startIndex 0.
+    """
+    headers, wfs_params, page_count, primary_key = _prepare_wfs_request(
+        typeNames,
+        api_key,
+        srsName,
+        cql_filter,
+        bbox,
+        out_fields,
+        result_record_count,
+        page_count,
+        max_workers,
+        pagination,
+        primary_key,
+        **other_wfs_params,
+    )
+    request_datetime = datetime.utcnow()
+
+    resume_hash = None
+    if resume:
+        resume_hash = _params_hash(
+            url, wfs_params, page_count, primary_key, result_record_count
+        )
+
+    if cache_mode == "AUTO":
+        cache_mode = "DISK" if resume else _auto_cache_mode(
+            _fetch_single_page_data(url, headers, _sample_params(wfs_params)),
+            result_record_count,
+            auto_memory_limit,
+        )
+
+    with _open_cache(
+        cache_mode, temp_file_path, resume_hash, primary_key, fields, srsName
+    ) as cache:
+        for page_data in _iter_pages(
+            url,
+            headers,
+            wfs_params,
+            page_count,
+            result_record_count,
+            max_workers,
+            primary_key,
+            cache.checkpoint,
+            cache.accepts_raw_pages,
+        ):
+            cache.add_page(page_data)
+        response = cache.close()
+
+    return _request_details(
+        url, request_datetime, headers, wfs_params, cache_mode, response
+    )
+
+
+def _reject_download_params(caller: str, kwargs: dict) -> None:
+    """Raise TypeError if any download only options are in kwargs."""
+    download_only = [name for name in DOWNLOAD_ONLY_PARAMS if name in kwargs]
+    if download_only:
+        raise TypeError(
+            f"{caller}() does not accept the download options: {', '.join(download_only)}"
+        )
+
+
+def iter_wfs_pages(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    bbox: str = None,
+    out_fields: str | list[str] = None,
+    result_record_count: int = None,
+    page_count: int = DEFAULT_FEATURES_PER_PAGE,
+    max_workers: int = 1,
+    pagination: Literal["offset", "keyset"] = "offset",
+    primary_key: str | None = None,
+    **other_wfs_params: Any,
+) -> Generator[list[dict], None, dict]:
+    """
+    Yields the features of each WFS page as soon as it arrives.
+
+    Nothing is cached, so a layer of any size can be processed in constant
+    memory. Once exhausted, the generator returns the same request details as
+    download_wfs_data, with only the totalFeatures count in the response.
+
+    Raises:
+        TypeError: If a download_wfs_data option that does not apply to
+            streaming, such as cache_mode or resume, is given.
+    """
+    _reject_download_params("iter_wfs_pages", other_wfs_params)
+    headers, wfs_params, page_count, primary_key = _prepare_wfs_request(
+        typeNames,
+        api_key,
+        srsName,
+        cql_filter,
+        bbox,
+        out_fields,
+        result_record_count,
+        page_count,
+        max_workers,
+        pagination,
+        primary_key,
+        **other_wfs_params,
+    )
+    request_datetime = datetime.utcnow()
+
+    total_features = 0
+    for page_data in _iter_pages(
+        url,
+        headers,
+        wfs_params,
+        page_count,
+        result_record_count,
+        max_workers,
+        primary_key,
+    ):
+        features = page_data.get("features", [])
+        total_features += len(features)
+        yield features
+
+    return _request_details(
+        url,
+        request_datetime,
+        headers,
+        wfs_params,
+        "STREAM",
+        {"totalFeatures": total_features},
+    )
+
+
+async def download_wfs_data_async(
+    url: str,
+    typeNames: str,
+    api_key: str,
+    srsName: str = DEFAULT_SRSNAME,
+    cql_filter: str = None,
+    bbox: str = None,
+    out_fields: str | list[str] = None,
+    result_record_count: int = None,
+    page_count: int = DEFAULT_FEATURES_PER_PAGE,
+    cache_mode: Literal[
+        "DISK", "NDJSON", "PARQUET", "SHAPEFILE", "GPKG", "MEMORY", "COLUMNAR", "AUTO"
+    ] = "MEMORY",
+    temp_file_path: str | None = None,
+    max_workers: int = 1,
+    pagination: Literal["offset", "keyset"] = "offset",
+    primary_key: str | None = None,
+    resume: bool = False,
+    client: httpx.AsyncClient | None = None,
+    fields: list | None = None,
+    auto_memory_limit: int = DEFAULT_AUTO_MEMORY_LIMIT,
+    **other_wfs_params: Any,
+) -> dict:
+    """
+    Async twin of download_wfs_data, built on httpx.AsyncClient.
+
+    Accepts the same parameters, including resume, and returns the same
+    request details. Pass an existing httpx.AsyncClient as client to share
+    its connection pool across many queries. query_async passes the
+    session's pooled client; only if no client is given is one opened for
+    the duration of the call.
+    """
+    headers, wfs_params, page_count, primary_key = _prepare_wfs_request(
+        typeNames,
+        api_key,
+        srsName,
+        cql_filter,
+        bbox,
+        out_fields,
+        result_record_count,
+        page_count,
+        max_workers,
+        pagination,
+        primary_key,
+        **other_wfs_params,
+    )
+    request_datetime = datetime.utcnow()
+
+    resume_hash = None
+    if resume:
+        resume_hash = _params_hash(
+            url, wfs_params, page_count, primary_key, result_record_count
+        )
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=DEFAULT_HTTP_TIMEOUT)
+    try:
+        if cache_mode == "AUTO":
+            cache_mode = "DISK" if resume else _auto_cache_mode(
+                await _fetch_single_page_data_async(
+                    client, url, headers, _sample_params(wfs_params)
+                ),
+                result_record_count,
+                auto_memory_limit,
+            )
+        with _open_cache(
+            cache_mode, temp_file_path, resume_hash, primary_key, fields, srsName
+        ) as cache:
+            async for page_data in _aiter_pages(
+                client,
+                url,
+                headers,
+                wfs_params,
+                page_count,
+                result_record_count,
+                max_workers,
+                primary_key,
+                cache.checkpoint,
+                raw=cache.accepts_raw_pages,
+            ):
+                cache.add_page(page_data)
+            response = cache.close()
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    return _request_details(
+        url, request_datetime, headers, wfs_params, cache_mode, response
+    )
@@ -0,0 +1,68 @@
+import httpx
+import json
+import re
+import threading
+import time
+
+from kapipy.wfs_utils import _scan_raw_page
+
+
+def make_features(total: int) -> list[dict]:
+    return [
+        {
+            "type": "Feature",
+            "id": f"layer-1.{i}",
+            "geometry": {"type": "Point", "coordinates": [175.0 + i / 1000, -37.0]},
+            "properties": {"id": i, "name": f"feature {i}"},
+        }
+        for i in range(1, total + 1)
+    ]
+
+
+class FakeWFSServer:
+    """Serves startIndex/count windows over a fixed list of features."""
+
+    def __init__(self, total: int, delay: float = 0, fail_after: int | None = None):
+        self.features = make_features(total)
+        self.delay = delay
+        self.fail_after = fail_after
+        self.requested_start_indexes = []
+        self.requested_params = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, headers, params, timeout=30, raw=False):
+        with self._lock:
+            self.requested_start_indexes.append(params.get("startIndex"))
+            self.requested_params.append(dict(params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.fail_after is not None and len(self.requested_params) > self.fail_after:
+            raise httpx.ConnectError("Simulated network failure")
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if "sortBy" in params:
+                # Keyset request: "[(filter) AND ]id > N" sorted by id
+                match = re.search(r"id > (\d+)$", params.get("cql_filter", ""))
+                last_id = int(match.group(1)) if match else 0
+                matched = [f for f in self.features if f["properties"]["id"] > last_id]
+                page = matched[: params["count"]]
+            else:
+                matched = self.features
+                start = params["startIndex"]
+                page = matched[start : start + params["count"]]
+            page_data = {
+                "type": "FeatureCollection",
+                "features": page,
+                "numberMatched": len(matched),
+                "numberReturned": len(page),
+                "crs": {"type": "name", "properties": {"name": "EPSG:2193"}},
+            }
+            if raw:
+                return _scan_raw_page(json.dumps(page_data).encode("utf-8"))
+            return page_data
+        finally:
+            with self._lock:
+                self.in_flight -= 1
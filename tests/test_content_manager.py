@@ -31,3 +31,40 @@ def test_get_item(mock_search_by_id, mock_get_item_details, content_manager):
 def test_download_jobs(content_manager):
 
     assert isinstance(content_manager.jobs, list)
+
+@patch("kapipy.content_manager.ContentManager._get_item_details")
+@patch("kapipy.content_manager.ContentManager._search_by_id")
+def test_get_many_keeps_order_and_collects_errors(mock_search_by_id, mock_get_item_details):
+    """
+    Test that ContentManager.get_many returns items in input order, prefetches
+    each item's services list, and collects errors per id instead of raising.
+    """
+    from unittest.mock import MagicMock
+    from kapipy.custom_errors import BadRequest
+
+    session = MagicMock()
+    session.get.return_value = [{"key": "wfs"}]
+    content_manager = ContentManager(session, None)
+
+    def search(id):
+        if id == "bad":
+            raise BadRequest("Bad id")
+        if id == "missing":
+            return []
+        return SEARCH_LAYER_JSON
+
+    mock_search_by_id.side_effect = search
+    mock_get_item_details.return_value = LAYER_JSON
+
+    items, errors = content_manager.get_many([50787, "bad", "missing", 50787], max_workers=3)
+
+    assert [item.id if item else None for item in items] == [50787, None, None, 50787]
+    assert list(errors) == ["bad"]
+    assert isinstance(errors["bad"], BadRequest)
+    assert items[0].services_list == [{"key": "wfs"}]
+    session.get.assert_called_with(LAYER_JSON["services"])
+
+
+def test_get_many_rejects_bad_max_workers(content_manager):
+    with pytest.raises(ValueError):
+        content_manager.get_many([1], max_workers=0)
@@ -4,11 +4,17 @@ import json
 from datetime import datetime
 from shapely.geometry import Polygon
 from kapipy.conversion import (
+    FIELD_KINDS,
+    FIELD_TYPE_KINDS,
+    field_type_kind,
     map_field_type,
     map_geometry_type,
     is_valid_date,
+    dates_are_valid,
+    downgrade_invalid_date_fields,
     geojson_to_featureset,
     geojson_to_gdf,
+    geojson_geometries_to_array,
     geojson_to_sdf,
     json_to_df,
     sdf_to_single_polygon_geojson,
@@ -35,6 +41,39 @@ def test_map_field_type():
     assert map_field_type("date") == "esriFieldTypeDate"
     assert map_field_type("unknown_type") == "esriFieldTypeString"
 
+@pytest.mark.parametrize(
+    "field_type, expected",
+    [
+        ("int", "esriFieldTypeInteger"),
+        ("smallint", "esriFieldTypeInteger"),
+        ("int32", "esriFieldTypeInteger"),
+        ("bigint", "esriFieldTypeDouble"),
+        ("int64", "esriFieldTypeDouble"),
+        ("real", "esriFieldTypeSingle"),
+        ("numeric", "esriFieldTypeDouble"),
+        ("boolean", "esriFieldTypeSmallInteger"),
+        ("datetime", "esriFieldTypeDate"),
+        ("timestamp", "esriFieldTypeDate"),
+        ("objectid", "esriFieldTypeOID"),
+        ("guid", "esriFieldTypeGUID"),
+        ("Integer", "esriFieldTypeInteger"),
+    ],
+)
+def test_map_field_type_by_kind(field_type, expected):
+    assert map_field_type(field_type) == expected
+
+@pytest.mark.parametrize("field_type", ["date", "datetime", "timestamp"])
+def test_downgrade_invalid_date_fields(field_type):
+    fields = [FieldDef("bad", field_type), FieldDef("good", field_type), FieldDef("name", "string")]
+    features = [
+        {"properties": {"bad": "not a date", "good": "2024-03-01T10:00:00Z", "name": "a"}},
+        {"properties": {"bad": "2024-03-01", "good": None, "name": "b"}},
+    ]
+
+    downgrade_invalid_date_fields(fields, features)
+
+    assert [f.type for f in fields] == ["string", field_type, "string"]
+
 def test_map_geometry_type():
     assert map_geometry_type("Point") == "esriGeometryPoint"
     assert map_geometry_type("MultiPoint") == "esriGeometryMultipoint"
@@ -50,6 +89,20 @@ def test_is_valid_date():
     assert not is_valid_date("not-a-date")
     assert is_valid_date(datetime.now())
 
+@pytest.mark.parametrize(
+    "values",
+    [
+        [None, "2024-03-01T10:00:00Z", "2024-03-02", 1709251200000, 1.5],
+        ["2024-03-01T10:00:00Z", "01/02/2024", "March 3 2024"],
+        ["2024-03-01", "not a date"],
+        ["2024-03-01", ""],
+        [None, None],
+        [],
+    ],
+)
+def test_dates_are_valid_matches_is_valid_date(values):
+    assert dates_are_valid(values) == all(is_valid_date(v) for v in values)
+
 @pytest.mark.skipif(not has_arcgis, reason="arcgis module not installed")
 def test_geojson_to_featureset_point():
     from dataclasses import dataclass
@@ -129,6 +182,40 @@ def test_geojson_to_gdf():
     assert gdf.iloc[0]["id"] == 1
     assert gdf.iloc[0]["name"] == "A"
 
+@pytest.mark.parametrize(
+    "geometries",
+    [
+        [{"type": "Point", "coordinates": [1.0, 2.0]}, None, {"type": "Point", "coordinates": [3.0, 4.0]}],
+        [{"type": "LineString", "coordinates": [[0, 0], [1, 1], [2, 0]]}],
+        [
+            {"type": "Polygon", "coordinates": [[[0, 0], [4, 0], [4, 4], [0, 0]], [[1, 1], [2, 1], [2, 2], [1, 1]]]},
+            {"type": "Polygon", "coordinates": [[[5, 5], [6, 5], [6, 6], [5, 5]]]},
+        ],
+        [
+            {"type": "MultiPolygon", "coordinates": [[[[0, 0], [1, 0], [1, 1], [0, 0]]], [[[2, 2], [3, 2], [3, 3], [2, 2]]]]},
+        ],
+        [{"type": "Point", "coordinates": [1.0, 2.0, 3.0]}],
+        # Mixed types and dimensions fall back to shapely.from_geojson
+        [
+            {"type": "Point", "coordinates": [1.0, 2.0]},
+            {"type": "LineString", "coordinates": [[0, 0, 1], [1, 1, 1]]},
+            {"type": "GeometryCollection", "geometries": [{"type": "Point", "coordinates": [0, 0]}]},
+        ],
+    ],
+)
+def test_geojson_geometries_to_array_matches_shape(geometries):
+    from shapely.geometry import shape
+
+    result = geojson_geometries_to_array(geometries)
+
+    assert len(result) == len(geometries)
+    for geometry, expected in zip(result, geometries):
+        if expected is None:
+            assert geometry is None
+        else:
+            assert geometry.equals_exact(shape(expected), tolerance=0)
+            assert geometry.has_z == shape(expected).has_z
+
 @pytest.mark.skipif(not has_arcgis, reason="arcgis module not installed")
 def test_geojson_to_sdf():
     
@@ -170,6 +257,58 @@ def test_json_to_df():
     assert df.iloc[0]["id"] == 1
     assert df.iloc[1]["name"] == "B"
 
+def test_json_to_df_applies_field_types():
+    features = [
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {
+                "id": i,
+                "big_id": 2**40 + i,
+                "height": i / 4,
+                "name": f"Mark {i}",
+                "land_district": ["Canterbury", "Otago"][i % 2],
+                "surveyed": "2024-03-01T10:00:00Z" if i else None,
+                "active": i % 3 == 0,
+            },
+        }
+        for i in range(1200)
+    ]
+    features[5]["properties"]["id"] = None
+    fields = [
+        FieldDef(name="id", type="integer"),
+        FieldDef(name="big_id", type="integer"),
+        FieldDef(name="height", type="numeric"),
+        FieldDef(name="name", type="string"),
+        FieldDef(name="land_district", type="string"),
+        FieldDef(name="surveyed", type="date"),
+        FieldDef(name="active", type="boolean"),
+        FieldDef(name="shape", type="geometry"),
+    ]
+
+    df = json_to_df({"type": "FeatureCollection", "features": features}, fields=fields)
+
+    assert df["id"].dtype == "Int32"
+    assert df["id"].isna().sum() == 1
+    assert df["big_id"].dtype == "Int64"
+    assert df["height"].dtype == "float64"
+    assert isinstance(df["name"].dtype, pd.StringDtype)
+    assert df["land_district"].dtype == "category"
+    assert isinstance(df["surveyed"].dtype, pd.DatetimeTZDtype)
+    assert str(df["surveyed"].dt.tz) == "UTC"
+    assert df["surveyed"].isna().sum() == 1
+    assert df["active"].dtype == "boolean"
+
+
+def test_json_to_df_leaves_unparseable_dates():
+    features = [
+        {"properties": {"when": "2024-03-01"}},
+        {"properties": {"when": "not a date"}},
+    ]
+    df = json_to_df(features, fields=[{"name": "when", "type": "date"}])
+
+    assert df["when"].tolist() == ["2024-03-01", "not a date"]
+
 @pytest.mark.skipif(not has_geopandas, reason="geopandas module not installed")
 def test_gdf_to_single_polygon_geojson():
     import geopandas as gpd
@@ -315,4 +454,47 @@ def test_geom_sdf_into_cql_filter():
     fs = geojson_to_featureset(geojson, "esriGeometryPoint", fields)
     sdf = fs.sdf
     cql = geom_sdf_into_cql_filter(sdf, "geom", 4326)
-    assert cql.startswith("INTERSECTS(")
\ No newline at end of file
+    assert cql.startswith("INTERSECTS(")
+
+@pytest.mark.parametrize("field_type", sorted(FIELD_TYPE_KINDS))
+def test_every_field_type_has_a_kind_and_a_pandas_dtype(field_type):
+    from kapipy.conversion import _typed_column
+
+    kind = field_type_kind(field_type)
+    values = {
+        "integer": [1, None],
+        "bigint": [2**40, None],
+        "float32": [1.5, None],
+        "float64": [1.5, None],
+        "string": ["a", None],
+        "boolean": [True, None],
+        "date": ["2020-01-02T03:04:05Z", None],
+    }[kind]
+    expected = {
+        "integer": "Int32",
+        "bigint": "Int64",
+        "float32": "float32",
+        "float64": "float64",
+        "boolean": "boolean",
+    }
+
+    column = _typed_column(pd.Series(values, dtype=object), field_type)
+
+    assert kind in FIELD_KINDS
+    assert field_type_kind(field_type.upper()) == kind
+    if kind == "string":
+        assert pd.api.types.is_string_dtype(column)
+    elif kind == "date":
+        assert isinstance(column.dtype, pd.DatetimeTZDtype)
+    else:
+        assert str(column.dtype) == expected[kind]
+    assert map_field_type(field_type) != "esriFieldTypeString" or kind == "string"
+
+
+def test_field_type_kind_is_inferred_from_values():
+    assert field_type_kind(None, [None, True]) == "boolean"
+    assert field_type_kind(None, [None, 3]) == "bigint"
+    assert field_type_kind(None, [2.5]) == "float64"
+    assert field_type_kind(None, ["x"]) == "string"
+    assert field_type_kind(None, []) == "string"
+    assert field_type_kind("document") is None
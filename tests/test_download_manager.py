@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from kapipy.content_manager import ContentManager
+from kapipy.custom_errors import DownloadError, ServerError
+from kapipy.download_manager import DownloadManager
+from kapipy.job_result import JobStatus
+
+
+class FakeJob:
+    """A job that finishes after a number of polls and records its downloads."""
+
+    def __init__(self, id, polls_until_complete=0, download_seconds=0, fail=False, poll_errors=0):
+        self.id = id
+        self.poll_errors = poll_errors
+        self.polls = 0
+        self.polls_until_complete = polls_until_complete
+        self.download_seconds = download_seconds
+        self.fail = fail
+        self.downloaded = False
+        self.folders = []
+
+    @property
+    def status(self):
+        self.polls += 1
+        if self.polls <= self.poll_errors:
+            raise ServerError("Request timed out")
+        state = "complete" if self.polls > self.polls_until_complete else "processing"
+        return JobStatus(state=state, progress=None)
+
+    def download(self, folder):
+        time.sleep(self.download_seconds)
+        if self.fail:
+            raise RuntimeError(f"Export job {self.id} failed with state: error")
+        self.folders.append(folder)
+        self.downloaded = True
+
+
+def test_as_completed_yields_jobs_as_downloads_finish(tmp_path):
+    slow = FakeJob(1, download_seconds=0.2)
+    fast = FakeJob(2, polls_until_complete=1)
+    manager = DownloadManager([slow, fast], str(tmp_path), min_poll_interval=0.01)
+
+    assert [job.id for job in manager.as_completed()] == [2, 1]
+    assert slow.folders == fast.folders == [str(tmp_path)]
+
+
+def test_downloads_run_concurrently(tmp_path):
+    jobs = [FakeJob(i, download_seconds=0.2) for i in range(4)]
+    manager = DownloadManager(jobs, str(tmp_path), max_concurrency=4)
+
+    start = time.monotonic()
+    manager.run()
+
+    assert time.monotonic() - start < 0.6
+    assert all(job.downloaded for job in jobs)
+
+
+def test_poll_interval_backs_off_to_the_maximum(tmp_path):
+    job = FakeJob(1, polls_until_complete=5)
+    manager = DownloadManager(
+        [job], str(tmp_path), min_poll_interval=0.01, max_poll_interval=0.04, backoff=2
+    )
+
+    start = time.monotonic()
+    manager.run()
+
+    # Waits of 0.01, 0.02, 0.04 and 0.04 seconds between the six polls
+    assert job.polls == 6
+    assert 0.1 <= time.monotonic() - start < 0.5
+
+
+def test_failed_download_is_raised_after_the_others(tmp_path):
+    good = FakeJob(1)
+    bad = FakeJob(2, fail=True)
+    manager = DownloadManager([good, bad], str(tmp_path))
+
+    with pytest.raises(DownloadError) as excinfo:
+        manager.run()
+
+    assert good.downloaded and not bad.downloaded
+    assert list(excinfo.value.errors) == [2]
+    assert manager.errors == excinfo.value.errors
+
+
+def test_failed_poll_is_retried(tmp_path):
+    job = FakeJob(1, poll_errors=1)
+    manager = DownloadManager([job], str(tmp_path), min_poll_interval=0.01)
+
+    manager.run()
+
+    assert job.polls == 2
+    assert job.downloaded
+    assert manager.errors == {}
+
+
+def test_job_is_given_up_after_repeated_poll_errors(tmp_path):
+    job = FakeJob(1, poll_errors=10)
+    manager = DownloadManager([job], str(tmp_path), min_poll_interval=0.01, max_poll_errors=3)
+
+    with pytest.raises(DownloadError):
+        manager.run()
+
+    assert job.polls == 3
+    assert isinstance(manager.errors[1], ServerError)
+
+
+def test_content_manager_download_raises_for_failed_jobs(tmp_path):
+    content = ContentManager(None, None)
+    content.jobs = [FakeJob(1), FakeJob(2, fail=True)]
+
+    with pytest.raises(DownloadError):
+        content.download(folder=str(tmp_path))
+
+    assert content.jobs[0].downloaded
+
+
+def test_content_manager_download_skips_downloaded_jobs(tmp_path):
+    done = FakeJob(1)
+    done.downloaded = True
+    todo = FakeJob(2)
+    content = ContentManager(None, None)
+    content.jobs = [done, todo]
+
+    assert content.download(folder=str(tmp_path), poll_interval=1) == [done, todo]
+    assert done.polls == 0
+    assert todo.downloaded
+
+
+def test_rejects_bad_settings(tmp_path):
+    with pytest.raises(ValueError):
+        DownloadManager([], str(tmp_path), max_concurrency=0)
+    with pytest.raises(ValueError):
+        DownloadManager([], str(tmp_path), min_poll_interval=5, max_poll_interval=1)
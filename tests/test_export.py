@@ -172,3 +172,16 @@ def test_request_export_invalid_data_type(sample_api_args):
     sample_api_args["data_type"] = "raster"
     with pytest.raises(ValueError, match="Unsupported or not implemented data type"):
         request_export(**sample_api_args)
+
+
+def test_request_export_uses_given_client(sample_api_args):
+    """Should send the request with the pooled client when one is given."""
+    client = MagicMock()
+    client.post.return_value.json.return_value = {"id": 999}
+
+    with patch("kapipy.export.httpx.post") as mock_post:
+        result = request_export(**sample_api_args, client=client)
+
+    assert result["response"]["id"] == 999
+    client.post.assert_called_once()
+    mock_post.assert_not_called()
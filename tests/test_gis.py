@@ -58,3 +58,64 @@ def test_audit_manager(gisk):
     assert(isinstance(gisk.audit, AuditManager))
 
 
+
+
+def test_requests_share_the_session_client(gisk):
+    """GISK.get and the session's get and post all go through one pooled client."""
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    gisk.session.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert gisk.get("https://data.linz.govt.nz/api/v1.x/layers/") == {"ok": True}
+    assert gisk.session.get("https://data.linz.govt.nz/api/v1.x/tables/") == {"ok": True}
+    assert gisk.session.post("https://data.linz.govt.nz/api/v1.x/exports/", json={}) == {"ok": True}
+    assert len(requests) == 3
+    assert all(r.headers["Authorization"] == "key test_key" for r in requests)
+
+
+def test_session_http_options():
+    import httpx
+
+    limits = httpx.Limits(max_connections=4)
+    with patch("kapipy.session_manager.httpx.Client") as mock_client:
+        gisk = GISK(name="linz", api_key="test_key", http_limits=limits, http2=True)
+
+    assert mock_client.call_args.kwargs["limits"] is limits
+    assert mock_client.call_args.kwargs["http2"] is True
+    gisk.session.close()
+    gisk.session.client.close.assert_called_once()
+
+
+def test_async_requests_share_one_client_per_event_loop(gisk):
+    import asyncio
+
+    session = gisk.session
+
+    async def run():
+        first = session.get_async_client()
+        assert session.get_async_client() is first
+        await session.aclose()
+        return first
+
+    first = asyncio.run(run())
+    assert first.is_closed
+
+    async def run_with_client():
+        import httpx
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await session.get_async("https://data.linz.govt.nz/api/v1.x/layers/", client=client)
+
+    assert asyncio.run(run_with_client()) == {"ok": True}
+
+    async def new_loop_client():
+        return session.get_async_client()
+
+    assert asyncio.run(new_loop_client()) is not first
@@ -0,0 +1,172 @@
+import httpx
+import pytest
+
+from kapipy import http_cache
+from kapipy.http_cache import ResponseCache, cached_request, set_response_cache
+
+
+class FakeServer:
+    """Counts requests and answers conditional requests for an unchanged ETag with 304."""
+
+    def __init__(self, etag: str | None = '"v1"'):
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(200, json={"path": request.url.path}, headers=headers)
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def client(server):
+    return httpx.Client(transport=httpx.MockTransport(server))
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    yield
+    set_response_cache(None)
+
+
+def test_fresh_response_is_served_from_disk(tmp_path, server, client):
+    cache = ResponseCache(folder=str(tmp_path))
+
+    first = cache.request(client, "GET", "https://example.com/api/layers/1/")
+    second = cache.request(client, "GET", "https://example.com/api/layers/1/")
+
+    assert len(server.requests) == 1
+    assert second.json() == first.json() == {"path": "/api/layers/1/"}
+
+
+def test_cache_key_includes_params_and_api_key(tmp_path, server, client):
+    cache = ResponseCache(folder=str(tmp_path))
+    url = "https://example.com/api/data/"
+
+    cache.request(client, "GET", url, params={"id": 1}, headers={"Authorization": "key a"})
+    cache.request(client, "GET", url, params={"id": 2}, headers={"Authorization": "key a"})
+    cache.request(client, "GET", url, params={"id": 1}, headers={"Authorization": "key b"})
+
+    assert len(server.requests) == 3
+    assert not any(b"key a" in path.read_bytes() for path in tmp_path.rglob("*.json"))
+
+
+def test_stale_response_is_revalidated_with_etag(tmp_path, server, client):
+    cache = ResponseCache(folder=str(tmp_path), ttls={"/layers/": 0})
+
+    cache.request(client, "GET", "https://example.com/api/layers/1/")
+    response = cache.request(client, "GET", "https://example.com/api/layers/1/")
+
+    assert len(server.requests) == 2
+    assert server.requests[1].headers["If-None-Match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/layers/1/"}
+
+
+def test_ttl_uses_longest_matching_pattern(tmp_path):
+    cache = ResponseCache(folder=str(tmp_path), ttls={"/api/": 60, "/api/layers/": 5}, default_ttl=1)
+
+    assert cache.ttl_for("https://example.com/api/layers/1/") == 5
+    assert cache.ttl_for("https://example.com/api/tables/1/") == 60
+    assert cache.ttl_for("https://example.com/services/wfs/") == 1
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path, server, client):
+    body_size = len(b'{"path":"/a"}')
+    cache = ResponseCache(folder=str(tmp_path), max_bytes=body_size * 2)
+
+    cache.request(client, "GET", "https://example.com/a")
+    cache.request(client, "GET", "https://example.com/b")
+    cache.request(client, "GET", "https://example.com/a")  # a is now more recent than b
+    cache.request(client, "GET", "https://example.com/c")
+
+    assert len(list(tmp_path.rglob("*.body"))) == 2
+    cache.request(client, "GET", "https://example.com/a")
+    assert len(server.requests) == 3
+    cache.request(client, "GET", "https://example.com/b")
+    assert len(server.requests) == 4
+
+
+def test_cached_request_without_cache_goes_to_client(server, client):
+    assert http_cache.get_response_cache() is None
+
+    cached_request(client, "GET", "https://example.com/a")
+    cached_request(client, "GET", "https://example.com/a")
+
+    assert len(server.requests) == 2
+
+
+def test_session_get_uses_response_cache(tmp_path, server, client):
+    from kapipy.session_manager import SessionManager
+
+    set_response_cache(ResponseCache(folder=str(tmp_path)))
+    session = SessionManager("TEST_KEY", "https://example.com/api/", "", "")
+    session.client = client
+
+    session.get("https://example.com/api/layers/1/")
+    session.get("https://example.com/api/layers/1/")
+
+    assert len(server.requests) == 1
+
+
+def test_session_get_can_bypass_response_cache(tmp_path, server, client):
+    from kapipy.session_manager import SessionManager
+
+    set_response_cache(ResponseCache(folder=str(tmp_path)))
+    session = SessionManager("TEST_KEY", "https://example.com/api/", "", "")
+    session.client = client
+
+    session.get("https://example.com/api/exports/1/", cache=False)
+    session.get("https://example.com/api/exports/1/", cache=False)
+
+    assert len(server.requests) == 2
+
+
+def test_entry_evicted_during_load_is_a_miss(tmp_path, server, client, monkeypatch):
+    cache = ResponseCache(folder=str(tmp_path))
+    cache.request(client, "GET", "https://example.com/a")
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(http_cache.os, "utime", evicted)
+    response = cache.request(client, "GET", "https://example.com/a")
+
+    assert response.json() == {"path": "/a"}
+    assert len(server.requests) == 2
+
+
+def test_write_atomic_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(http_cache.os, "replace", fail)
+    with pytest.raises(OSError):
+        http_cache._write_atomic(str(tmp_path / "entry.body"), b"content")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_atomic_uses_unique_temp_files(tmp_path, monkeypatch):
+    temp_paths = []
+    replace = http_cache.os.replace
+
+    def record(src, dst):
+        temp_paths.append(src)
+        replace(src, dst)
+
+    monkeypatch.setattr(http_cache.os, "replace", record)
+    path = str(tmp_path / "entry.body")
+    http_cache._write_atomic(path, b"first")
+    http_cache._write_atomic(path, b"second")
+
+    assert len(set(temp_paths)) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.body"]
+    assert (tmp_path / "entry.body").read_bytes() == b"second"
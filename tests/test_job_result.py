@@ -117,18 +117,16 @@ def test_output_fails(sample_payload, mock_session):
 @patch("os.path.exists", return_value=True)
 @patch("os.path.getsize", return_value=1234)
 @patch("builtins.open", new_callable=mock_open, read_data=b"filecontent")
-@patch("httpx.Client")
-def test_download_success(mock_httpx, mock_openfile, mock_getsize, mock_exists, mock_makedirs, sample_payload, mock_session, tmp_path):
+def test_download_success(mock_openfile, mock_getsize, mock_exists, mock_makedirs, sample_payload, mock_session, tmp_path):
     job = JobResult(sample_payload, mock_session)
     job._last_response["state"] = "complete"
 
-    # mock HTTPX behavior
-    mock_client = mock_httpx.return_value.__enter__.return_value
+    # mock HTTPX behavior of the session's pooled client
+    mock_client = mock_session.client
     mock_response = MagicMock()
     mock_response.url = "https://cdn.example.com/file.zip"
     mock_response.iter_bytes.return_value = [b"filecontent"]
     mock_response.raise_for_status.return_value = None
-    mock_client.get.return_value = mock_response
     mock_client.stream.return_value.__enter__.return_value = mock_response
 
     result = job.download(folder=str(tmp_path))
@@ -140,6 +138,35 @@ def test_download_success(mock_httpx, mock_openfile, mock_getsize, mock_exists,
     assert job.downloaded
     assert os.path.basename(result.file_path).endswith(".zip")
     assert result.checksum == hashlib.sha256(b"filecontent").hexdigest()
+    mock_client.get.assert_not_called()
+    mock_client.stream.assert_called_once_with(
+        "GET", "https://example.com/download.zip", headers=mock_session.headers, follow_redirects=True
+    )
+
+
+def test_download_follows_redirect_in_one_streamed_request(sample_payload, mock_session, tmp_path):
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.host == "example.com":
+            return httpx.Response(302, headers={"Location": "https://cdn.example.com/file.zip"})
+        return httpx.Response(200, content=b"zipbytes" * 1000)
+
+    mock_session.client = httpx.Client(transport=httpx.MockTransport(handler))
+    job = JobResult(sample_payload, mock_session)
+
+    result = job.download(folder=str(tmp_path))
+
+    assert [str(r.url) for r in requests] == [
+        "https://example.com/download.zip",
+        "https://cdn.example.com/file.zip",
+    ]
+    assert result.final_url == "https://cdn.example.com/file.zip"
+    assert result.file_size_bytes == 8000
+    assert result.checksum == hashlib.sha256(b"zipbytes" * 1000).hexdigest()
 
 
 def test_download_raises_no_download_url(sample_payload, mock_session):
@@ -0,0 +1,67 @@
+import importlib.util
+import sys
+
+import pytest
+
+from kapipy import json_codec
+
+AVAILABLE_CODECS = [
+    name
+    for name in json_codec.JSON_CODECS
+    if name == "json" or importlib.util.find_spec(name) is not None
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_codec():
+    codec = json_codec._codec
+    yield
+    json_codec._codec = codec
+
+
+@pytest.mark.parametrize("name", AVAILABLE_CODECS)
+def test_codec_round_trip(name):
+    json_codec.set_json_codec(name)
+    page = {"type": "FeatureCollection", "features": [{"properties": {"name": "Ōtautahi", "id": 1}}]}
+
+    encoded = json_codec.dumps(page)
+
+    assert isinstance(encoded, bytes)
+    assert json_codec.loads(encoded) == page
+    assert json_codec.loads(encoded.decode("utf-8")) == page
+
+
+@pytest.mark.parametrize("name", AVAILABLE_CODECS)
+def test_codec_raises_value_error_on_invalid_json(name):
+    json_codec.set_json_codec(name)
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{"features": [')
+
+
+def test_invalid_codec_name():
+    with pytest.raises(ValueError):
+        json_codec.set_json_codec("yaml")
+
+
+def test_codec_from_environment(monkeypatch):
+    monkeypatch.setenv("KAPIPY_JSON_CODEC", "json")
+    json_codec._codec = None
+
+    assert json_codec.get_json_codec().name == "json"
+
+
+def test_unknown_codec_from_environment_falls_back(monkeypatch, caplog):
+    monkeypatch.setenv("KAPIPY_JSON_CODEC", "orjsn")
+    json_codec._codec = None
+
+    assert json_codec.get_json_codec().name == AVAILABLE_CODECS[0]
+    assert "orjsn" in caplog.text
+
+
+def test_missing_codec_from_environment_falls_back(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setenv("KAPIPY_JSON_CODEC", "orjson")
+    json_codec._codec = None
+
+    expected = [name for name in AVAILABLE_CODECS if name != "orjson"][0]
+    assert json_codec.get_json_codec().name == expected
@@ -0,0 +1,425 @@
+import gc
+import os
+
+import pytest
+from unittest.mock import patch
+
+from kapipy.wfs_response import WFSResponse
+from kapipy.wfs_utils import download_wfs_data
+
+from sample_wfs_data import FakeWFSServer, make_features
+
+
+def _file_response(tmp_path, cache_mode, file_name, total=25):
+    server = FakeWFSServer(total=total)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            url="https://example.com/services/wfs/",
+            typeNames="layer-1",
+            api_key="TEST_KEY",
+            page_count=10,
+            cache_mode=cache_mode,
+            temp_file_path=str(tmp_path / file_name),
+        )
+    return WFSResponse(
+        geojson=None,
+        data_file_path=result["response"]["file_path"],
+        data_file_format=result["response"]["file_format"],
+    )
+
+
+@pytest.fixture
+def disk_response(tmp_path):
+    return _file_response(tmp_path, "DISK", "out.geojson")
+
+
+@pytest.fixture
+def ndjson_response(tmp_path):
+    return _file_response(tmp_path, "NDJSON", "out.geojsonl")
+
+
+def test_iter_pages_from_disk_does_not_load_json(disk_response):
+    pages = list(disk_response.iter_pages(page_size=7))
+
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert pages[0][0]["properties"]["id"] == 1
+    assert pages[-1][-1]["properties"]["id"] == 25
+    assert disk_response._json is None
+
+
+def test_iter_features_from_disk_matches_json(disk_response):
+    streamed = list(disk_response.iter_features())
+    assert streamed == disk_response.json["features"]
+
+
+def test_iter_pages_from_memory():
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None)
+
+    pages = list(response.iter_pages(page_size=2))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+
+
+def test_iter_pages_invalid_page_size():
+    response = WFSResponse(geojson={"type": "FeatureCollection", "features": []}, data_file_path=None)
+    with pytest.raises(ValueError):
+        list(response.iter_pages(page_size=0))
+
+
+def test_ndjson_file_has_one_feature_per_line(ndjson_response):
+    with open(ndjson_response._data_file_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    assert len(lines) == 25
+    assert ndjson_response.json["features"] == make_features(25)
+
+
+def test_ndjson_iter_pages_does_not_load_json(ndjson_response):
+    pages = list(ndjson_response.iter_pages(page_size=10))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert ndjson_response._json is None
+
+
+@pytest.mark.parametrize("parts", [1, 3, 7, 100])
+def test_ndjson_byte_ranges_cover_every_feature_once(ndjson_response, parts):
+    ranges = ndjson_response.byte_ranges(parts)
+
+    features = [
+        feature
+        for byte_range in ranges
+        for feature in ndjson_response.iter_features(byte_range=byte_range)
+    ]
+    assert len(ranges) == parts
+    assert features == make_features(25)
+
+
+def test_ndjson_read_features_in_parallel(ndjson_response):
+    assert ndjson_response.read_features(max_workers=3) == make_features(25)
+
+
+def test_byte_ranges_requires_ndjson(disk_response):
+    with pytest.raises(ValueError):
+        disk_response.byte_ranges(2)
+
+
+@pytest.fixture
+def parquet_response(tmp_path):
+    pytest.importorskip("pyarrow")
+    return _file_response(tmp_path, "PARQUET", "out.parquet")
+
+
+def test_parquet_response_reads_selected_columns(parquet_response):
+    df = parquet_response.read_df(columns=["name"])
+
+    assert list(df.columns) == ["name"]
+    assert df["name"].tolist() == [f"feature {i}" for i in range(1, 26)]
+
+
+def test_parquet_response_gdf(parquet_response):
+    pytest.importorskip("geopandas")
+    gdf = parquet_response.read_gdf(columns=["id"])
+
+    assert list(gdf.columns) == ["id", "geometry"]
+    assert gdf.crs.to_epsg() == 2193
+    assert gdf.geometry.iloc[0].x == pytest.approx(175.001)
+
+
+def test_parquet_response_iter_features(parquet_response):
+    features = list(parquet_response.iter_features())
+
+    expected = make_features(25)
+    assert [f["properties"] for f in features] == [f["properties"] for f in expected]
+    assert features[0]["geometry"]["coordinates"] == tuple(expected[0]["geometry"]["coordinates"])
+
+
+def test_shapefile_response_iter_features(tmp_path):
+    response = _file_response(tmp_path, "SHAPEFILE", "out.shp")
+
+    features = list(response.iter_features())
+
+    assert response.json["features"][0]["properties"] == {"id": 1, "name": "feature 1"}
+    assert [f["properties"]["id"] for f in features] == list(range(1, 26))
+
+
+def test_geopackage_response_iter_features(tmp_path):
+    response = _file_response(tmp_path, "GPKG", "out.gpkg")
+
+    features = list(response.iter_features())
+
+    assert [f["properties"] for f in features] == [f["properties"] for f in make_features(25)]
+    assert features[-1]["geometry"]["coordinates"] == pytest.approx((175.025, -37.0))
+
+
+@pytest.mark.parametrize("cache_mode, file_name", [("DISK", "out.geojson"), ("PARQUET", "out.parquet")])
+def test_arrow_table_has_geoarrow_geometry(tmp_path, cache_mode, file_name):
+    pytest.importorskip("pyarrow")
+    response = _file_response(tmp_path, cache_mode, file_name)
+    response.out_sr = 2193
+
+    table = response.arrow
+
+    assert table.num_rows == 25
+    assert table.column("id").to_pylist() == list(range(1, 26))
+    field = table.schema.field("geometry")
+    assert field.metadata[b"ARROW:extension:name"] == b"geoarrow.wkb"
+    assert b"2193" in field.metadata[b"ARROW:extension:metadata"]
+
+
+def test_arrow_from_memory_uses_item_fields():
+    pa = pytest.importorskip("pyarrow")
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None)
+
+    table = response.arrow
+
+    assert table.schema.field("id").type == pa.int64()
+    assert table.column_names == ["id", "name", "geometry"]
+
+
+def test_read_df_with_arrow_dtypes(disk_response):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    df = disk_response.read_df(columns=["name"], dtype_backend="pyarrow")
+
+    assert list(df.columns) == ["name"]
+    assert isinstance(df["name"].dtype, pd.ArrowDtype)
+
+
+def test_read_df_with_arrow_dtypes_is_not_cached(disk_response):
+    pytest.importorskip("pyarrow")
+    disk_response.keep = "latest"
+    df = disk_response.df
+
+    disk_response.read_df(dtype_backend="pyarrow")
+
+    assert disk_response._arrow is None
+    assert disk_response._df is df
+
+
+def test_gdf_with_arrow_dtypes(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("geopandas")
+    response = _file_response(tmp_path, "PARQUET", "out.parquet")
+    response.out_sr = 2193
+    response.dtype_backend = "pyarrow"
+
+    gdf = response.gdf
+
+    assert isinstance(gdf["id"].dtype, pd.ArrowDtype)
+    assert gdf.crs.to_epsg() == 2193
+    assert gdf.geometry.iloc[0].x == pytest.approx(175.001)
+
+
+def test_invalid_dtype_backend(disk_response):
+    with pytest.raises(ValueError):
+        disk_response.read_df(dtype_backend="numpy")
+
+
+@pytest.mark.parametrize(
+    "cache_mode, file_name",
+    [("DISK", "out.geojson"), ("NDJSON", "out.geojsonl"), ("PARQUET", "out.parquet")],
+)
+def test_iter_df_yields_chunks(tmp_path, cache_mode, file_name):
+    if cache_mode == "PARQUET":
+        pytest.importorskip("pyarrow")
+    response = _file_response(tmp_path, cache_mode, file_name)
+
+    chunks = list(response.iter_df(chunksize=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(chunks[0].columns) == ["id", "name"]
+    assert chunks[-1].index.tolist() == list(range(20, 25))
+    assert chunks[-1]["id"].tolist() == list(range(21, 26))
+    assert response._json is None
+
+
+def test_iter_gdf_yields_chunks(disk_response):
+    pytest.importorskip("geopandas")
+    disk_response.out_sr = 2193
+
+    chunks = list(disk_response.iter_gdf(chunksize=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[0].crs.to_epsg() == 2193
+    assert chunks[-1].geometry.iloc[-1].x == pytest.approx(175.025)
+
+
+def test_iter_gdf_from_columnar():
+    pytest.importorskip("geopandas")
+    server = FakeWFSServer(total=25)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            url="https://example.com/services/wfs/",
+            typeNames="layer-1",
+            api_key="TEST_KEY",
+            page_count=10,
+            cache_mode="COLUMNAR",
+        )
+    response = WFSResponse(
+        geojson=None, data_file_path=None, out_sr=2193, columnar=result["response"]["columnar"]
+    )
+
+    chunks = list(response.iter_gdf(chunksize=20))
+
+    assert [len(chunk) for chunk in chunks] == [20, 5]
+    assert chunks[1]["id"].tolist() == list(range(21, 26))
+    assert result["response"]["columnar"]["attributes"].index[0] == 0
+
+
+def test_iter_df_invalid_chunksize(disk_response):
+    with pytest.raises(ValueError):
+        list(disk_response.iter_df(chunksize=0))
+
+
+@pytest.mark.parametrize("fixture", ["disk_response", "ndjson_response"])
+def test_random_access_to_file_features(request, fixture):
+    response = request.getfixturevalue(fixture)
+    expected = make_features(25)
+
+    assert len(response) == 25
+    assert response.feature(0) == expected[0]
+    assert response[-1] == expected[-1]
+    assert response[5:8] == expected[5:8]
+    assert response[::10] == expected[::10]
+    assert response._json is None
+
+
+def test_random_access_out_of_range(disk_response):
+    with pytest.raises(IndexError):
+        disk_response.feature(25)
+
+
+def test_random_access_to_empty_file(tmp_path):
+    response = _file_response(tmp_path, "DISK", "out.geojson", total=0)
+
+    assert len(response) == 0
+    assert response[:] == []
+
+
+def test_random_access_from_memory():
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None)
+
+    assert len(response) == 5
+    assert response[1:3] == make_features(5)[1:3]
+
+
+def test_close_releases_feature_index(disk_response):
+    disk_response.feature(0)
+    index = disk_response._feature_index
+
+    disk_response.close()
+
+    assert disk_response._feature_index is None
+    assert index._mmap is None
+    # The index is built again on the next access
+    assert disk_response.feature(1) == make_features(25)[1]
+
+
+def test_context_manager_closes_feature_index(tmp_path):
+    response = _file_response(tmp_path, "NDJSON", "out.geojsonl")
+    with response:
+        response[0]
+        index = response._feature_index
+
+    assert index._mmap is None
+    os.remove(response._data_file_path)
+
+
+def test_spill_closes_previous_feature_index(disk_response):
+    disk_response.feature(0)
+    index = disk_response._feature_index
+    assert disk_response.json["features"] == make_features(25)
+
+    disk_response._spill_json()
+
+    assert index._mmap is None
+    assert disk_response._feature_index is None
+
+
+def test_keep_all_caches_every_representation(disk_response):
+    df = disk_response.df
+
+    assert disk_response._json is not None
+    assert disk_response._df is df
+
+
+def test_keep_tabular_drops_json_from_file(disk_response):
+    disk_response.keep = "tabular"
+
+    df = disk_response.df
+
+    assert disk_response._json is None
+    assert disk_response._df is df
+    assert disk_response.json["features"] == make_features(25)
+
+
+def test_keep_latest_evicts_older_representations(disk_response):
+    pytest.importorskip("geopandas")
+    disk_response.keep = "latest"
+    disk_response.out_sr = 2193
+
+    assert len(disk_response.df) == 25
+    gdf = disk_response.gdf
+
+    assert disk_response._df is None
+    assert disk_response._json is None
+    assert disk_response._gdf is gdf
+
+
+def test_keep_spills_memory_json_to_disk():
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None, keep="tabular")
+
+    df = response.df
+
+    assert len(df) == 5
+    assert response._json is None
+    assert response._data_file_path.endswith(".geojsonl")
+    assert response[2] == make_features(5)[2]
+    assert response.json["features"] == make_features(5)
+
+
+def test_close_removes_spilled_json_file():
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None, keep="tabular")
+    df = response.df
+    file_path = response._data_file_path
+    assert response[0] == make_features(5)[0]
+
+    response.close()
+
+    assert not os.path.exists(file_path)
+    assert response._data_file_path is None
+    assert len(df) == 5
+
+
+def test_spilled_json_file_removed_with_response():
+    geojson = {"type": "FeatureCollection", "features": make_features(5)}
+    response = WFSResponse(geojson=geojson, data_file_path=None, keep="latest")
+    assert response.df is not None
+    file_path = response._data_file_path
+    assert os.path.exists(file_path)
+
+    del response
+    gc.collect()
+
+    assert not os.path.exists(file_path)
+
+
+def test_close_keeps_downloaded_file(disk_response):
+    file_path = disk_response._data_file_path
+
+    disk_response.close()
+
+    assert os.path.exists(file_path)
+    assert disk_response[0] == make_features(25)[0]
+
+
+def test_invalid_keep(disk_response):
+    disk_response.keep = "some"
+    with pytest.raises(ValueError):
+        _ = disk_response.df
@@ -0,0 +1,826 @@
+import asyncio
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qsl
+
+from dacite import from_dict
+from kapipy.vector_item import VectorItem
+from kapipy.wfs_response import WFSResponse
+from kapipy.wfs_utils import (
+    _RawPage,
+    _scan_raw_page,
+    download_wfs_data,
+    download_wfs_data_async,
+    iter_wfs_pages,
+)
+from kapipy.conversion import FIELD_TYPE_KINDS
+from sample_api_data import LAYER_JSON
+from sample_wfs_data import FakeWFSServer, make_features
+
+
+@pytest.fixture
+def vector_item():
+    """A VectorItem attached to a mocked session and audit manager."""
+    item = from_dict(data_class=VectorItem, data=LAYER_JSON)
+    session = MagicMock()
+    session.api_key = "TEST_KEY"
+    session.service_url = "https://example.com/services/"
+    session.get.return_value = [{"key": "wfs"}]
+    session.get_async = AsyncMock(return_value=[{"key": "wfs"}])
+    item.attach_resources(session=session, audit=MagicMock(), content=None)
+    return item
+
+
+@pytest.fixture
+def wfs_args():
+    return dict(
+        url="https://example.com/services/wfs/",
+        typeNames="layer-1",
+        api_key="TEST_KEY",
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_download_to_memory_pages_in_order(wfs_args, max_workers):
+    server = FakeWFSServer(total=95)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args, page_count=10, max_workers=max_workers
+        )
+
+    geojson = result["response"]["geojson"]
+    assert [f["properties"]["id"] for f in geojson["features"]] == list(range(1, 96))
+    assert geojson["totalFeatures"] == 95
+    assert "numberReturned" not in geojson
+    assert "startIndex" not in result["request_params"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_download_to_disk_pages_in_order(wfs_args, tmp_path, max_workers):
+    server = FakeWFSServer(total=42)
+    file_path = tmp_path / "out.geojson"
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=5,
+            cache_mode="DISK",
+            temp_file_path=str(file_path),
+            max_workers=max_workers,
+        )
+
+    assert result["response"]["totalFeatures"] == 42
+    with open(file_path, encoding="utf-8") as f:
+        geojson = json.load(f)
+    assert [f["properties"]["id"] for f in geojson["features"]] == list(range(1, 43))
+
+
+def test_concurrent_fetch_uses_parallel_windows(wfs_args):
+    server = FakeWFSServer(total=80, delay=0.02)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        download_wfs_data(**wfs_args, page_count=10, max_workers=4)
+
+    assert server.max_in_flight > 1
+    assert sorted(set(server.requested_start_indexes))[:8] == list(range(0, 80, 10))
+
+
+def test_result_record_count_limits_pages(wfs_args):
+    server = FakeWFSServer(total=100)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args, page_count=10, result_record_count=30, max_workers=8
+        )
+
+    assert result["response"]["totalFeatures"] == 30
+    assert sorted(server.requested_start_indexes) == [0, 10, 20]
+
+
+def test_invalid_max_workers(wfs_args):
+    with pytest.raises(ValueError):
+        download_wfs_data(**wfs_args, max_workers=0)
+
+
+def test_download_wfs_data_async_matches_sync(wfs_args):
+    server = FakeWFSServer(total=57)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = {k: v for k, v in parse_qsl(request.content.decode())}
+        page = server(
+            str(request.url),
+            dict(request.headers),
+            {"startIndex": int(params["startIndex"]), "count": int(params["count"])},
+        )
+        return httpx.Response(200, json=page)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await download_wfs_data_async(
+                **wfs_args, page_count=10, max_workers=3, client=client
+            )
+
+    result = asyncio.run(run())
+
+    geojson = result["response"]["geojson"]
+    assert [f["properties"]["id"] for f in geojson["features"]] == list(range(1, 58))
+    assert result["response"]["totalFeatures"] == 57
+    assert "Authorization" not in result["request_headers"]
+
+
+def test_vector_item_query_async(vector_item):
+    item = vector_item
+    session = item._session
+    server = FakeWFSServer(total=12)
+    clients = []
+
+    async def fake_fetch(client, url, headers, params, timeout=30, raw=False):
+        clients.append(client)
+        return server(url, headers, params, raw=raw)
+
+    with patch("kapipy.wfs_utils._fetch_single_page_data_async", side_effect=fake_fetch):
+        response = asyncio.run(item.query_async(out_sr=2193, page_count=5))
+
+    # The WFS pages are fetched with the session's pooled client
+    assert set(map(id, clients)) == {id(session.get_async_client.return_value)}
+    assert isinstance(response, WFSResponse)
+    assert response.total_features == 12
+    assert response.out_sr == 2193
+    session.get_async.assert_awaited_once()
+    session.get.assert_not_called()
+
+
+def test_iter_wfs_pages_streams_and_returns_details(wfs_args):
+    server = FakeWFSServer(total=23)
+    pages = []
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        stream = iter_wfs_pages(**wfs_args, page_count=10)
+        while True:
+            try:
+                pages.append(next(stream))
+            except StopIteration as stop:
+                details = stop.value
+                break
+
+    assert [len(page) for page in pages] == [10, 10, 3]
+    assert details["response"]["totalFeatures"] == 23
+    assert "Authorization" not in details["request_headers"]
+
+
+def test_vector_item_iter_features(vector_item):
+    server = FakeWFSServer(total=25)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        stream = vector_item.iter_features(out_sr=2193, page_count=10)
+        first = next(stream)
+        # Only the first page has been requested so far
+        assert server.requested_start_indexes == [0]
+        ids = [first["properties"]["id"]] + [f["properties"]["id"] for f in stream]
+
+    assert ids == list(range(1, 26))
+    vector_item._audit.add_request_record.assert_called_once()
+    assert vector_item._audit.add_request_record.call_args.kwargs["total_features"] == 25
+
+
+@pytest.mark.parametrize(
+    "option", [{"cache_mode": "DISK"}, {"temp_file_path": "out.geojson"}, {"resume": True}]
+)
+def test_iter_pages_rejects_download_options(vector_item, wfs_args, option):
+    server = FakeWFSServer(total=5)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        with pytest.raises(TypeError, match=next(iter(option))):
+            next(vector_item.iter_pages(out_sr=2193, **option))
+        with pytest.raises(TypeError):
+            next(iter_wfs_pages(**wfs_args, **option))
+
+    assert server.requested_params == []
+
+
+def test_keyset_pagination(wfs_args):
+    server = FakeWFSServer(total=25)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=10,
+            cql_filter="name <> 'x'",
+            out_fields="name",
+            pagination="keyset",
+            primary_key="id",
+        )
+
+    features = result["response"]["geojson"]["features"]
+    assert [f["properties"]["id"] for f in features] == list(range(1, 26))
+    filters = [params.get("cql_filter") for params in server.requested_params]
+    assert filters == ["name <> 'x'", "(name <> 'x') AND id > 10", "(name <> 'x') AND id > 20"]
+    assert all(params["sortBy"] == "id ASC" for params in server.requested_params)
+    assert all("startIndex" not in params for params in server.requested_params)
+    assert server.requested_params[0]["PropertyName"] == "(name,id)"
+
+
+def test_keyset_pagination_is_not_limited_by_max_page_fetches(wfs_args):
+    server = FakeWFSServer(total=30)
+    with patch("kapipy.wfs_utils.MAX_PAGE_FETCHES", 2), patch(
+        "kapipy.wfs_utils._fetch_single_page_data", side_effect=server
+    ):
+        result = download_wfs_data(
+            **wfs_args, page_count=5, pagination="keyset", primary_key="id"
+        )
+
+    assert result["response"]["totalFeatures"] == 30
+
+
+def test_keyset_pagination_requires_primary_key(wfs_args):
+    with pytest.raises(ValueError):
+        download_wfs_data(**wfs_args, pagination="keyset")
+
+
+def test_vector_item_keyset_uses_primary_key_fields(vector_item):
+    server = FakeWFSServer(total=12)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        response = vector_item.query(out_sr=2193, page_count=5, pagination="keyset")
+
+    assert response.total_features == 12
+    assert server.requested_params[-1]["cql_filter"] == "id > 10"
+
+
+@pytest.mark.parametrize(
+    "pagination, cache_mode",
+    [("offset", "DISK"), ("keyset", "DISK"), ("offset", "NDJSON")],
+)
+def test_resume_disk_download_from_checkpoint(wfs_args, tmp_path, pagination, cache_mode):
+    file_path = tmp_path / "out.geojson"
+    checkpoint_path = tmp_path / "out.geojson.checkpoint.json"
+    download_args = dict(
+        **wfs_args,
+        page_count=10,
+        cache_mode=cache_mode,
+        temp_file_path=str(file_path),
+        pagination=pagination,
+        primary_key="id",
+        resume=True,
+    )
+
+    failing_server = FakeWFSServer(total=45, fail_after=2)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=failing_server):
+        with pytest.raises(httpx.ConnectError):
+            download_wfs_data(**download_args)
+
+    with open(checkpoint_path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    assert checkpoint["total_features"] == 20
+    assert checkpoint["start_index"] == 20
+
+    server = FakeWFSServer(total=45)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(**download_args)
+
+    assert len(server.requested_params) == 3
+    if pagination == "offset":
+        assert server.requested_start_indexes == [20, 30, 40]
+    else:
+        assert server.requested_params[0]["cql_filter"] == "id > 20"
+    assert result["response"]["totalFeatures"] == 45
+    with open(file_path, encoding="utf-8") as f:
+        if cache_mode == "NDJSON":
+            features = [json.loads(line) for line in f]
+        else:
+            features = json.load(f)["features"]
+    assert [f["properties"]["id"] for f in features] == list(range(1, 46))
+    assert not checkpoint_path.exists()
+
+
+@pytest.mark.parametrize("pagination", ["offset", "keyset"])
+def test_resume_async_download_from_checkpoint(wfs_args, tmp_path, pagination):
+    file_path = tmp_path / "out.geojson"
+    download_args = dict(
+        **wfs_args,
+        page_count=10,
+        cache_mode="DISK",
+        temp_file_path=str(file_path),
+        pagination=pagination,
+        primary_key="id",
+        resume=True,
+    )
+
+    def async_fetch(server):
+        async def fetch(client, url, headers, params, timeout=30, raw=False):
+            return server(url, headers, params, timeout, raw)
+
+        return fetch
+
+    failing_server = FakeWFSServer(total=45, fail_after=2)
+    with patch(
+        "kapipy.wfs_utils._fetch_single_page_data_async", side_effect=async_fetch(failing_server)
+    ):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(download_wfs_data_async(**download_args))
+
+    server = FakeWFSServer(total=45)
+    with patch("kapipy.wfs_utils._fetch_single_page_data_async", side_effect=async_fetch(server)):
+        result = asyncio.run(download_wfs_data_async(**download_args))
+
+    assert len(server.requested_params) == 3
+    assert "resume" not in server.requested_params[0]
+    assert result["response"]["totalFeatures"] == 45
+    with open(file_path, encoding="utf-8") as f:
+        assert [f["properties"]["id"] for f in json.load(f)["features"]] == list(range(1, 46))
+
+
+def test_resume_ignores_checkpoint_for_different_request(wfs_args, tmp_path):
+    file_path = tmp_path / "out.geojson"
+    failing_server = FakeWFSServer(total=45, fail_after=2)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=failing_server):
+        with pytest.raises(httpx.ConnectError):
+            download_wfs_data(
+                **wfs_args,
+                page_count=10,
+                cache_mode="DISK",
+                temp_file_path=str(file_path),
+                resume=True,
+            )
+
+    server = FakeWFSServer(total=45)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=10,
+            cql_filter="id > 0",
+            cache_mode="DISK",
+            temp_file_path=str(file_path),
+            resume=True,
+        )
+
+    assert server.requested_start_indexes[0] == 0
+    assert result["response"]["totalFeatures"] == 45
+
+
+def test_resume_requires_disk_mode(wfs_args):
+    with pytest.raises(ValueError):
+        download_wfs_data(**wfs_args, resume=True)
+
+
+def test_scan_raw_page_finds_feature_spans():
+    features = [
+        {"type": "Feature", "properties": {"name": 'brace } and "quote" ]'}},
+        {"type": "Feature", "properties": {"name": "line\nbreak", "nested": {"a": [1, {"b": 2}]}}},
+    ]
+    body = json.dumps(
+        {"type": "FeatureCollection", "features": features, "totalFeatures": 2},
+        indent=2,
+    ).encode("utf-8")
+
+    page = _scan_raw_page(body)
+
+    assert isinstance(page, _RawPage)
+    assert page.feature_count == 2
+    lines = list(page.iter_feature_bytes())
+    assert all(b"\n" not in line for line in lines)
+    assert [json.loads(line) for line in lines] == features
+    assert page.last_feature() == features[-1]
+
+
+def test_scan_raw_page_handles_escapes_and_trailing_members():
+    features = [
+        {"type": "Feature", "properties": {"path": "C:\\", "quote": 'say \\"hi\\" {'}},
+        {"type": "Feature", "properties": {"path": "\\\\server\\", "n": 1}},
+    ]
+    body = json.dumps(
+        {
+            "type": "FeatureCollection",
+            "features": features,
+            "crs": {"type": "name", "properties": {"name": "EPSG:2193"}},
+        }
+    ).encode("utf-8")
+
+    page = _scan_raw_page(body)
+
+    assert isinstance(page, _RawPage)
+    assert [json.loads(f) for f in page.iter_feature_bytes()] == features
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"type": "FeatureCollection", "features": []}',
+        b'{"crs": {"features": [{"x": 1}]}, "features": [{"y": 2}]}',
+        b'{"exceptions": [{"text": "no features"}]}',
+        b'{"type": "FeatureCollection", "features": [{"a": 1}, 2, {"b": 3}]}',
+    ],
+)
+def test_scan_raw_page_falls_back_to_json(body):
+    page = _scan_raw_page(body)
+
+    expected = json.loads(body)
+    if isinstance(page, _RawPage):
+        assert [json.loads(f) for f in page.iter_feature_bytes()] == expected["features"]
+    else:
+        assert page == expected
+
+
+def test_disk_mode_copies_raw_page_bytes(wfs_args, tmp_path):
+    server = FakeWFSServer(total=15)
+    file_path = tmp_path / "out.geojson"
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server) as fetch:
+        download_wfs_data(
+            **wfs_args, page_count=10, cache_mode="DISK", temp_file_path=str(file_path)
+        )
+
+    assert all(call.kwargs["raw"] for call in fetch.call_args_list)
+    with open(file_path, encoding="utf-8") as f:
+        geojson = json.load(f)
+    assert geojson["features"] == server.features
+
+
+def test_parquet_sink_writes_row_group_per_page(wfs_args, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    server = FakeWFSServer(total=25)
+    file_path = tmp_path / "out.parquet"
+    fields = [
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "shape", "type": "geometry"},
+    ]
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=10,
+            cache_mode="PARQUET",
+            temp_file_path=str(file_path),
+            fields=fields,
+        )
+
+    assert result["response"]["file_format"] == "GeoParquet"
+    assert result["response"]["totalFeatures"] == 25
+    parquet_file = pq.ParquetFile(file_path)
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.schema_arrow.field("id").type == "int64"
+    geo = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+    assert geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
+    assert geo["columns"]["geometry"]["crs"]["id"]["code"] == 2193
+
+
+def test_vector_item_query_passes_fields_to_parquet_sink(vector_item, tmp_path):
+    pytest.importorskip("pyarrow")
+    server = FakeWFSServer(total=5)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        response = vector_item.query(
+            out_sr=2193,
+            cache_mode="PARQUET",
+            temp_file_path=str(tmp_path / "out.parquet"),
+        )
+
+    assert "fields" not in server.requested_params[0]
+    assert response.df["id"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_shapefile_sink_writes_page_by_page(wfs_args, tmp_path):
+    import shapefile
+
+    server = FakeWFSServer(total=25)
+    for feature in server.features:
+        feature["properties"]["survey_date_recorded"] = "2024-03-01T10:00:00Z"
+    fields = [
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "survey_date_recorded", "type": "date"},
+        {"name": "shape", "type": "geometry"},
+    ]
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=10,
+            cache_mode="SHAPEFILE",
+            temp_file_path=str(tmp_path / "marks.shp"),
+            fields=fields,
+        )
+
+    assert result["response"]["file_format"] == "Shapefile"
+    assert result["response"]["totalFeatures"] == 25
+    assert (tmp_path / "marks.prj").read_text().startswith("PROJCS[")
+    with shapefile.Reader(str(tmp_path / "marks.shp")) as reader:
+        assert reader.shapeType == shapefile.POINT
+        assert [f[0] for f in reader.fields[1:]] == ["id", "name", "survey_dat"]
+        assert [f[1] for f in reader.fields[1:]] == ["N", "C", "D"]
+        assert len(reader) == 25
+        record = reader.record(24)
+        assert record["id"] == 25
+        assert reader.shape(24).points[0][0] == pytest.approx(175.025)
+
+
+def test_geopackage_sink_writes_features_and_spatial_index(wfs_args, tmp_path):
+    import sqlite3
+
+    server = FakeWFSServer(total=25)
+    file_path = tmp_path / "marks.gpkg"
+    fields = [
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "shape", "type": "geometry"},
+    ]
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=10,
+            cache_mode="GPKG",
+            temp_file_path=str(file_path),
+            fields=fields,
+        )
+
+    assert result["response"]["file_format"] == "GeoPackage"
+    assert result["response"]["totalFeatures"] == 25
+    connection = sqlite3.connect(file_path)
+    try:
+        assert connection.execute("PRAGMA application_id").fetchone()[0] == 0x47504B47
+        assert connection.execute(
+            "SELECT geometry_type_name, srs_id FROM gpkg_geometry_columns"
+        ).fetchone() == ("POINT", 2193)
+        srs_ids = connection.execute("SELECT srs_id FROM gpkg_spatial_ref_sys").fetchall()
+        assert sorted(row[0] for row in srs_ids) == [-1, 0, 2193, 4326]
+        assert connection.execute('SELECT count(*) FROM "rtree_marks_geom"').fetchone()[0] == 25
+        blob, name = connection.execute(
+            'SELECT geom, name FROM marks WHERE id = 25'
+        ).fetchone()
+        assert blob[:2] == b"GP"
+        assert name == "feature 25"
+        min_x, max_x = connection.execute(
+            "SELECT min_x, max_x FROM gpkg_contents"
+        ).fetchone()
+        assert (min_x, max_x) == pytest.approx((175.001, 175.025))
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("field_type", ["document", *sorted(FIELD_TYPE_KINDS)])
+def test_sink_column_types_follow_the_field_type_kind(field_type):
+    pa = pytest.importorskip("pyarrow")
+    from kapipy.wfs_sinks import _arrow_type, _dbf_field, _gpkg_column_type
+
+    kind = FIELD_TYPE_KINDS.get(field_type, "string")
+    expected = {
+        "integer": (pa.int64(), "N", "INTEGER"),
+        "bigint": (pa.int64(), "N", "INTEGER"),
+        "float32": (pa.float32(), "F", "FLOAT"),
+        "float64": (pa.float64(), "F", "DOUBLE"),
+        "string": (pa.string(), "C", "TEXT"),
+        "boolean": (pa.bool_(), "L", "BOOLEAN"),
+        "date": (pa.string(), "D", "DATE" if field_type == "date" else "DATETIME"),
+    }[kind]
+
+    assert _arrow_type(field_type) == expected[0]
+    assert _dbf_field(field_type, [])[0] == expected[1]
+    assert _gpkg_column_type(field_type, []) == expected[2]
+
+
+@pytest.mark.parametrize(
+    "field_type, expected", [("date", "DATE"), ("datetime", "DATETIME"), ("timestamp", "DATETIME")]
+)
+def test_gpkg_date_column_types(field_type, expected):
+    from kapipy.wfs_sinks import _gpkg_column_type
+
+    assert _gpkg_column_type(field_type, []) == expected
+
+
+def _multipoint(feature):
+    return {**feature, "geometry": {"type": "MultiPoint", "coordinates": [feature["geometry"]["coordinates"]]}}
+
+
+def test_shapefile_sink_promotes_points_mixed_with_multipoints(tmp_path):
+    import shapefile
+    from kapipy.wfs_sinks import _ShapefileCache
+
+    features = make_features(4)
+    features[1] = _multipoint(features[1])
+    with _ShapefileCache(str(tmp_path / "marks.shp")) as cache:
+        cache.add_page({"features": features[:2]})
+        cache.add_page({"features": features[2:]})
+        cache.close()
+
+    with shapefile.Reader(str(tmp_path / "marks.shp")) as reader:
+        assert reader.shapeType == shapefile.MULTIPOINT
+        assert len(reader) == 4
+        for i, shape in enumerate(reader.shapes()):
+            assert len(shape.points) == 1
+            assert tuple(shape.points[0]) == pytest.approx((175.0 + (i + 1) / 1000, -37.0))
+
+
+def test_shapefile_sink_rejects_a_later_page_of_another_shape_type(tmp_path):
+    from kapipy.wfs_sinks import _ShapefileCache
+
+    features = make_features(4)
+    later = [_multipoint(f) for f in features[2:]]
+    with _ShapefileCache(str(tmp_path / "marks.shp")) as cache:
+        cache.add_page({"features": features[:2]})
+        with pytest.raises(ValueError, match="MultiPoint.*POINT shapefile"):
+            cache.add_page({"features": later})
+        assert cache.total_features == 2
+
+
+def test_shapefile_sink_rejects_mixed_geometry_families(tmp_path):
+    from kapipy.wfs_sinks import _ShapefileCache
+
+    features = make_features(2)
+    features[1]["geometry"] = {"type": "LineString", "coordinates": [[175, -37], [176, -38]]}
+    with _ShapefileCache(str(tmp_path / "marks.shp")) as cache:
+        with pytest.raises(ValueError, match="one geometry type"):
+            cache.add_page({"features": features})
+
+
+def test_shapefile_sink_size_limit(tmp_path):
+    from kapipy.wfs_sinks import _ShapefileCache
+
+    with _ShapefileCache(str(tmp_path / "marks.shp")) as cache:
+        cache.max_file_bytes = 1000
+        with pytest.raises(ValueError, match="shapefile limit"):
+            cache.add_page({"features": make_features(100)})
+
+
+def test_geopackage_sink_renames_colliding_columns(tmp_path):
+    import sqlite3
+    from kapipy.wfs_sinks import _GeoPackageCache, _iter_geopackage_features
+
+    features = make_features(3)
+    for feature in features:
+        feature["properties"].update({"fid": "user fid", "geom": "text", "a-b": 1, "a_b": 2})
+    file_path = tmp_path / "marks.gpkg"
+    with _GeoPackageCache(str(file_path), srs_name="EPSG:2193") as cache:
+        cache.add_page({"features": features})
+        cache.close()
+
+    connection = sqlite3.connect(file_path)
+    try:
+        columns = [row[1] for row in connection.execute('PRAGMA table_info("marks")')]
+    finally:
+        connection.close()
+    assert columns == ["fid", "geom", "id", "name", "fid_1", "geom_1", "a_b", "a_b_1"]
+    read_back = list(_iter_geopackage_features(str(file_path)))
+    assert [f["properties"] for f in read_back] == [f["properties"] for f in features]
+    assert read_back[0]["geometry"]["coordinates"] == pytest.approx((175.001, -37.0))
+
+
+@pytest.mark.parametrize(
+    "sink, file_name",
+    [("_ParquetCache", "out.parquet"), ("_ShapefileCache", "out.shp"), ("_GeoPackageCache", "out.gpkg")],
+)
+def test_file_sinks_log_properties_dropped_after_the_first_page(tmp_path, caplog, sink, file_name):
+    if sink == "_ParquetCache":
+        pytest.importorskip("pyarrow")
+    from kapipy import wfs_sinks
+
+    features = make_features(4)
+    for feature in features[2:]:
+        feature["properties"]["late"] = "x"
+    with getattr(wfs_sinks, sink)(str(tmp_path / file_name), srs_name="EPSG:2193") as cache:
+        cache.add_page({"features": features[:2]})
+        cache.add_page({"features": features[2:3]})
+        cache.add_page({"features": features[3:]})
+        cache.close()
+
+    warnings = [r for r in caplog.records if "'late'" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_arrow_renames_geometry_property():
+    pytest.importorskip("pyarrow")
+    from kapipy.wfs_sinks import _pages_to_arrow
+
+    features = make_features(3)
+    for feature in features:
+        feature["properties"]["geometry"] = "text"
+
+    table = _pages_to_arrow([features[:2], features[2:]], None, "EPSG:2193")
+
+    assert table.column_names == ["id", "name", "geometry_1", "geometry"]
+    assert table.column("geometry_1").to_pylist() == ["text"] * 3
+
+
+def test_geopackage_sink_is_readable_by_gdal(wfs_args, tmp_path):
+    pyogrio = pytest.importorskip("pyogrio")
+    server = FakeWFSServer(total=12)
+    file_path = tmp_path / "marks.gpkg"
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        download_wfs_data(
+            **wfs_args, page_count=5, cache_mode="GPKG", temp_file_path=str(file_path)
+        )
+
+    gdf = pyogrio.read_dataframe(file_path)
+    assert gdf["id"].tolist() == list(range(1, 13))
+    assert gdf.crs.to_epsg() == 2193
+    assert gdf.geometry.iloc[0].x == pytest.approx(175.001)
+
+
+def test_columnar_cache_keeps_typed_columns(wfs_args):
+    server = FakeWFSServer(total=25)
+    fields = [
+        {"name": "id", "type": "integer"},
+        {"name": "name", "type": "string"},
+        {"name": "shape", "type": "geometry"},
+    ]
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args, page_count=10, cache_mode="COLUMNAR", fields=fields
+        )
+
+    columnar = result["response"]["columnar"]
+    assert result["response"]["totalFeatures"] == 25
+    assert columnar["attributes"]["id"].dtype == "Int32"
+    assert columnar["attributes"]["name"].tolist()[-1] == "feature 25"
+    assert len(columnar["geometry"]) == 25
+    assert isinstance(columnar["geometry"][0], bytes)
+
+
+def test_columnar_cache_logs_dropped_and_renames_geometry_properties(caplog):
+    from kapipy.wfs_sinks import _ColumnarCache
+
+    features = make_features(3)
+    for feature in features:
+        feature["properties"]["geometry"] = "text"
+    features[2]["properties"]["late"] = 1
+    cache = _ColumnarCache()
+    cache.add_page({"features": features[:2]})
+    cache.add_page({"features": features[2:]})
+    attributes = cache.close()["columnar"]["attributes"]
+
+    assert list(attributes.columns) == ["id", "name", "geometry_1"]
+    assert attributes["geometry_1"].tolist() == ["text"] * 3
+    assert any("'late'" in r.getMessage() for r in caplog.records)
+
+
+def test_columnar_cache_aligns_geometry_after_null_pages():
+    import shapely
+    from kapipy.wfs_sinks import _ColumnarCache
+
+    features = make_features(4)
+    for feature in features[:2]:
+        feature["geometry"] = None
+    cache = _ColumnarCache()
+    cache.add_page({"features": features[:2]})
+    cache.add_page({"features": features[2:]})
+    columnar = cache.close()["columnar"]
+
+    assert len(columnar["attributes"]) == len(columnar["geometry"]) == 4
+    geometries = shapely.from_wkb(columnar["geometry"])
+    assert geometries[0] is None and geometries[1] is None
+    assert geometries[3].x == pytest.approx(175.004)
+
+
+def test_vector_item_query_columnar(vector_item):
+    pytest.importorskip("geopandas")
+    server = FakeWFSServer(total=12)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        response = vector_item.query(out_sr=2193, page_count=5, cache_mode="COLUMNAR")
+
+    assert response.total_features == 12
+    assert response.df["id"].tolist() == list(range(1, 13))
+    assert response.gdf.crs.to_epsg() == 2193
+    assert response.gdf.geometry.iloc[-1].x == pytest.approx(175.012)
+    assert [f["properties"]["id"] for f in response.iter_features()] == list(range(1, 13))
+
+
+def test_vector_item_query_passes_response_options(vector_item):
+    server = FakeWFSServer(total=3)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        response = vector_item.query(out_sr=2193, dtype_backend="pyarrow", keep="latest")
+
+    assert response.dtype_backend == "pyarrow"
+    assert response.keep == "latest"
+    assert server.requested_params
+    for params in server.requested_params:
+        assert "dtype_backend" not in params and "keep" not in params
+
+
+@pytest.mark.parametrize("option", [{"dtype_backend": "pyarrow"}, {"keep": "latest"}])
+def test_iter_pages_rejects_response_options(vector_item, option):
+    with pytest.raises(TypeError, match=next(iter(option))):
+        next(vector_item.iter_pages(out_sr=2193, **option))
+
+
+@pytest.mark.parametrize("memory_limit, expected", [(10**9, "MEMORY"), (1000, "DISK")])
+def test_auto_cache_mode_uses_sample_page(wfs_args, tmp_path, memory_limit, expected):
+    server = FakeWFSServer(total=250)
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=server):
+        result = download_wfs_data(
+            **wfs_args,
+            page_count=100,
+            cache_mode="AUTO",
+            auto_memory_limit=memory_limit,
+            temp_file_path=str(tmp_path / "out.geojson"),
+        )
+
+    assert result["cache_mode"] == expected
+    assert result["response"]["totalFeatures"] == 250
+    # The sample page is requested first, then the result itself
+    assert server.requested_params[0]["count"] == 100
+    assert len(server.requested_params) == 4
+
+
+def test_auto_cache_mode_uses_disk_when_size_is_unknown(wfs_args):
+    features = make_features(200)
+
+    def fetch(url, headers, params, timeout=30, raw=False):
+        start = params["startIndex"]
+        return {"type": "FeatureCollection", "features": features[start : start + params["count"]]}
+
+    with patch("kapipy.wfs_utils._fetch_single_page_data", side_effect=fetch):
+        result = download_wfs_data(**wfs_args, page_count=100, cache_mode="AUTO")
+
+    assert result["cache_mode"] == "DISK"
+    assert result["response"]["totalFeatures"] == 200